@@ -4,95 +4,25 @@ Core control callbacks for the dashboard.
 Handles survey, model, and language selection.
 """
 
-import os
-from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dash import Input, Output, State, html
 from dash.exceptions import PreventUpdate
-import json
 
-from .shared import load_survey_data
+from api.utils.catalog import catalog_surveys, catalog_models, catalog_valid_languages, get_model_label
 from ..state.store import get_state
-from api.config.settings import SURVEY_DIR
 
 def get_available_surveys() -> List[str]:
-    """Get list of available surveys."""
-    print("\n=== Looking for Available Surveys ===")
-    
-    # Use the project root directory and look for 'data' subdirectory
-    project_root = Path(__file__).parent.parent.parent
-    data_dir = project_root / 'data'
-    print(f"Project root path: {project_root}")
-    print(f"Data directory path: {data_dir}")
-    print(f"Data directory exists: {data_dir.exists()}")
-    
-    if not data_dir.exists():
-        print("WARNING: Data directory not found!")
-        return []
-        
-    # List all directories in the data directory
-    print("\nContents of data directory:")
-    try:
-        for item in data_dir.iterdir():
-            print(f"- {item.name} ({'directory' if item.is_dir() else 'file'})")
-        
-        # Find survey directories (any directory in the data folder)
-        surveys = [d.name for d in data_dir.iterdir() 
-                  if d.is_dir()]
-        
-        print(f"\nFound surveys: {surveys}")
-        return surveys
-    except Exception as e:
-        print(f"Error reading data directory: {e}")
-        import traceback
-        print(traceback.format_exc())
-        return []
+    """Get list of surveys with results, from the survey catalog."""
+    return catalog_surveys()
 
 def get_available_models(survey_id: str) -> List[Dict[str, str]]:
-    """Get list of available models for a given survey."""
-    print(f"\n=== Looking for Models in Survey: {survey_id} ===")
+    """Get dropdown options for the models with results for a given survey."""
     if not survey_id:
-        print("No survey_id provided")
-        return []
-        
-    project_root = Path(__file__).parent.parent.parent
-    survey_dir = project_root / 'data' / survey_id
-    print(f"Survey directory path: {survey_dir}")
-    print(f"Directory exists: {survey_dir.exists()}")
-    
-    if not survey_dir.exists():
-        print(f"WARNING: Survey directory not found: {survey_dir}")
-        return []
-        
-    try:
-        # List all directories in the survey directory
-        print("\nContents of survey directory:")
-        for item in survey_dir.iterdir():
-            print(f"- {item.name} ({'directory' if item.is_dir() else 'file'})")
-        
-        # Get directories that match the expected model directory names
-        models = [d.name for d in survey_dir.iterdir() 
-                 if d.is_dir() 
-                 and (d.name == 'data_gpt-3.5-turbo' or d.name == 'data_gpt-4o-2024-08-06')]
-        
-        print(f"Found model directories: {models}")
-        
-        # Create options with proper display names
-        options = [
-            {
-                'label': model_dir.replace('data_gpt-', 'GPT-'),
-                'value': model_dir
-            }
-            for model_dir in sorted(models)
-        ]
-        
-        print(f"Processed model options: {options}")
-        return options
-    except Exception as e:
-        print(f"Error reading survey directory: {e}")
-        import traceback
-        print(traceback.format_exc())
         return []
+    return [
+        {'label': get_model_label(model['model_dir']), 'value': model['model_dir']}
+        for model in catalog_models(survey_id)
+    ]
 
 def register_callbacks(app):
     """Register core control callbacks."""
@@ -169,88 +99,21 @@ def register_callbacks(app):
             print("Missing survey_id or model_id")
             raise PreventUpdate
             
-        try:
-            # Load survey data
-            data, error = load_survey_data(survey_id, model_id)
-            if error:
-                print(f"Error loading survey data: {error}")
-                return [], []
-                
-            if not data:
-                print("No data loaded")
-                return [], []
-                
-            print(f"Loaded {len(data)} questions")
-            
-            try:
-                # Get valid languages from the root quality_metrics in results
-                if isinstance(data, list) and len(data) > 0:
-                    # First try to get from first question's quality_metrics
-                    quality_metrics = data[0].get('quality_metrics', {})
-                    valid_languages = quality_metrics.get('valid_languages', [])
-                    
-                    # If not found, try to get from the results data structure
-                    if not valid_languages and hasattr(data, 'quality_metrics'):
-                        valid_languages = data.quality_metrics.get('valid_languages', [])
-                
-                # If still not found, try loading the results file directly
-                if not valid_languages:
-                    print("Trying to load results files directly...")
-                    project_root = Path(__file__).parent.parent.parent
-                    results_dir = project_root / 'data' / survey_id / model_id
-                    if results_dir.exists():
-                        result_files = [f for f in results_dir.iterdir() 
-                                      if f.name.startswith('results_') and f.name.endswith('.json')]
-                        
-                        # Consolidate valid languages from all results files
-                        all_valid_languages = set()
-                        for result_file in result_files:
-                            print(f"Loading results from: {result_file}")
-                            try:
-                                with open(result_file, 'r', encoding='utf-8') as f:
-                                    results_data = json.load(f)
-                                    file_valid_languages = results_data.get('quality_metrics', {}).get('valid_languages', [])
-                                    if file_valid_languages:
-                                        all_valid_languages.update(file_valid_languages)
-                                        print(f"Added {len(file_valid_languages)} languages from {result_file}")
-                            except Exception as e:
-                                print(f"Error reading {result_file}: {e}")
-                                continue
-                        
-                        valid_languages = sorted(list(all_valid_languages))
-                        print(f"Consolidated {len(valid_languages)} unique languages from all results files")
-                
-                if not valid_languages:
-                    print("No valid languages found in any results files")
-                    return [], []
-                
-                print(f"\nFound {len(valid_languages)} valid languages: {sorted(valid_languages)}")
-                
-                # Create options for valid languages
-                options = [
-                    {'label': lang, 'value': lang}
-                    for lang in sorted(valid_languages)
-                ]
-                
-                # All valid languages are selected by default
-                default_languages = valid_languages
-                
-                print(f"\nAll language options: {options}")
-                print(f"Default selected languages: {default_languages}")
-                
-                return options, default_languages
-                
-            except Exception as e:
-                print(f"Error processing valid languages: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                return [], []
-            
-        except Exception as e:
-            print(f"Error updating language options: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        valid_languages = catalog_valid_languages(survey_id, model_id)
+        if not valid_languages:
+            print("No valid languages found in any results files")
             return [], []
+        
+        print(f"Found {len(valid_languages)} valid languages")
+        
+        # Create options for valid languages
+        options = [
+            {'label': lang, 'value': lang}
+            for lang in sorted(valid_languages)
+        ]
+        
+        # All valid languages are selected by default
+        return options, list(valid_languages)
     
     @app.callback(
         Output('about-modal', 'is_open'),
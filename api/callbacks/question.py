@@ -6,15 +6,14 @@ Handles question selection and display updates.
 
 from typing import Dict, List, Optional, Tuple
 import os
-import json
 
 from dash import Input, Output, State, Dash
 from dash.exceptions import PreventUpdate
 import plotly.graph_objs as go
 
-from .shared import load_survey_data, load_question_metadata, validate_languages
+from .shared import load_question_data, load_question_metadata, validate_languages
 from api.views.question_view import create_question_graph
-from api.config.settings import SURVEY_DIR
+from survey_tools.survey_registry import registry as survey_registry
 
 def register_callbacks(app: Dash) -> None:
     """Register all question view callbacks."""
@@ -36,18 +35,15 @@ def register_callbacks(app: Dash) -> None:
             raise PreventUpdate
             
         try:
-            # Load questions from questions.json
-            questions_file = os.path.join(SURVEY_DIR, survey_id, 'questions.json')
+            # Load questions from the survey registry
+            questions_file = survey_registry.questions_path(survey_id)
             if not os.path.exists(questions_file):
                 print(f"Questions file not found: {questions_file}")
                 return [], None
                 
-            with open(questions_file, 'r', encoding='utf-8') as f:
-                questions_data = json.load(f)
-                
             # Create options from questions list
             options = []
-            for q in questions_data.get('questions', []):
+            for q in survey_registry.questions(survey_id):
                 q_id = q.get('question_id')
                 q_title = q.get('question_title', '')
                 if q_id:
@@ -97,8 +93,8 @@ def register_callbacks(app: Dash) -> None:
         if not all([survey_id, model_id, selected_languages, question_id]):
             raise PreventUpdate
             
-        # Load data
-        data, error = load_survey_data(survey_id, model_id)
+        # Load only the selected question (one shard per file where sharded)
+        data, error = load_question_data(survey_id, model_id, question_id)
         if error:
             print(f"Error loading data: {error}")
             return {}
@@ -3,14 +3,17 @@
 Shared utilities for callbacks.
 """
 
-import json
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
+from survey_tools.survey_registry import registry as survey_registry
+from survey_tools.results_format import load_results_file, load_question_results
+
 def load_survey_data(survey_id: str, model_id: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
     """
     Load survey response data for a given survey and model.
-    Merges data from all results files in the directory.
+    Merges data from all results files in the directory, of either results
+    format (see survey_tools.results_format).
     
     Args:
         survey_id: ID of the survey to load
@@ -44,14 +47,8 @@ def load_survey_data(survey_id: str, model_id: str) -> Tuple[Optional[List[Dict]
         all_data = []
         for file_path in result_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'results' in data:
-                        all_data.extend(data['results'])
-                    elif isinstance(data, list):
-                        all_data.extend(data)
-                    else:
-                        all_data.append(data)
+                results, _ = load_results_file(str(file_path))
+                all_data.extend(results)
             except Exception as e:
                 print(f"Error reading file {file_path}: {e}")
                 continue
@@ -67,6 +64,35 @@ def load_survey_data(survey_id: str, model_id: str) -> Tuple[Optional[List[Dict]
         print(error_msg)  # Debug print
         return None, error_msg
 
+def load_question_data(survey_id: str, model_id: str, question_id: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """
+    Load one question's entries from every results file of a survey and
+    model, reading only the question's shard where a file has been sharded.
+    
+    Returns:
+        Tuple of:
+        - List of question dictionaries (one per results file with the question) or None if error
+        - Error message or None if successful
+    """
+    model_dir = model_id if model_id.startswith('data_') else f'data_{model_id}'
+    data_dir = Path(__file__).parent.parent.parent / 'data' / survey_id / model_dir
+    if not data_dir.exists():
+        return None, f"Data directory not found: {data_dir}"
+
+    entries = []
+    for file_path in sorted(data_dir.glob('results_*.json')):
+        try:
+            entry = load_question_results(str(file_path), question_id)
+        except Exception as e:
+            print(f"Error reading file {file_path}: {e}")
+            continue
+        if entry is not None:
+            entries.append(entry)
+
+    if not entries:
+        return None, f"No results found for question {question_id}"
+    return entries, None
+
 def load_question_metadata(survey_id: str, question_id: Optional[str] = None) -> Tuple[Optional[Dict], Optional[str]]:
     """
     Load metadata for questions.
@@ -81,47 +107,21 @@ def load_question_metadata(survey_id: str, question_id: Optional[str] = None) ->
         - Error message or None if successful
     """
     try:
-        # Load metadata from data/{survey_id}/questions.json
-        metadata_path = Path(__file__).parent.parent.parent / 'data' / survey_id / 'questions.json'
-        print(f"Loading question metadata from: {metadata_path}")  # Debug print
-        
-        if not metadata_path.exists():
-            return None, f"Metadata file not found: {metadata_path}"
-            
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-            
-        print(f"Raw metadata type: {type(metadata)}")  # Debug print
-        print(f"Raw metadata structure: {metadata[:2] if isinstance(metadata, list) else list(metadata.items())[:2]}")  # Debug print
-            
-        if question_id is None:
-            # Return all questions if no specific question requested
-            print(f"Loaded metadata with {len(metadata)} questions")  # Debug print
-            return metadata, None
-            
-        # Find the specific question if requested
-        if isinstance(metadata, dict):
-            question_data = metadata.get(question_id)
-            if not question_data:
-                return None, f"Question {question_id} not found in metadata"
-        else:
-            # If metadata is a list, find question by ID in the list
-            question_data = next(
-                (q for q in metadata if isinstance(q, dict) and str(q.get('id')) == str(question_id)),
-                None
-            )
-            if not question_data:
-                return None, f"Question {question_id} not found in metadata"
-            
-        print(f"Loaded metadata for question {question_id}")  # Debug print
-        return question_data, None
-        
-    except Exception as e:
-        print(f"Error loading question metadata: {e}")  # Debug print
-        import traceback
-        print(traceback.format_exc())
+        survey = survey_registry.get(survey_id)
+    except FileNotFoundError:
+        return None, f"Metadata file not found: {survey_registry.questions_path(survey_id)}"
+    except ValueError as e:
         return None, str(e)
 
+    if question_id is None:
+        # Return all questions if no specific question requested
+        return survey.questions, None
+
+    question_data = survey.by_id.get(question_id)
+    if not question_data:
+        return None, f"Question {question_id} not found in metadata"
+    return question_data, None
+
 def validate_languages(languages: List[str], data: List[Dict]) -> List[str]:
     """
     Validate and filter language codes against available data.
@@ -6,7 +6,7 @@ Callbacks for handling view updates and interactions.
 from dash import Input, Output, State, html, dcc
 from dash.exceptions import PreventUpdate
 
-from .shared import load_survey_data, load_question_metadata, validate_languages
+from .shared import load_survey_data, load_question_data, load_question_metadata, validate_languages
 from api.views.matrix_view import create_matrix_graph
 from api.views.deviation_view import create_deviation_graph
 from api.views.question_view import create_question_graph
@@ -31,8 +31,8 @@ def register_callbacks(app):
         if not all([survey_id, model_id, languages, question_id]):
             raise PreventUpdate
             
-        # Load and process data
-        data, error = load_survey_data(survey_id, model_id)
+        # Load only the selected question (one shard per file where sharded)
+        data, error = load_question_data(survey_id, model_id, question_id)
         if error or not data:
             return {}
             
@@ -9,9 +9,9 @@ from dash.dependencies import Input, Output, State
 from api.config.styles import COLORS, FONTS, LAYOUT, COMPONENT_STYLES
 from .survey_selector import create_survey_selector
 import os
-import json
 from api.utils.formatting import format_timestamp
 from api.config.settings import SURVEY_DIR
+from survey_tools.results_format import load_results_file
 
 def create_controls(app) -> html.Div:
     """Create the controls component."""
@@ -157,12 +157,8 @@ def create_controls_old(app):
         
         for result_file in result_files:
             try:
-                with open(os.path.join(data_dir, result_file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Handle both old and new format
-                questions = data['results'] if isinstance(data, dict) else data
-                quality_metrics = data.get('quality_metrics', {}) if isinstance(data, dict) else {}
+                # Handles every results format
+                questions, quality_metrics = load_results_file(os.path.join(data_dir, result_file))
                 
                 if not isinstance(questions, list):
                     continue
@@ -2,25 +2,17 @@
 Common footer component for graph visualizations.
 """
 
-import os
-import json
-from api.config.settings import SURVEY_DIR
+from survey_tools.survey_registry import registry as survey_registry
 from api.config.styles import COLORS, FONTS
 from dash import html
 from datetime import datetime
 
 def get_survey_info(survey_name):
-    """Get survey information from questions.json"""
-    questions_file = os.path.join(SURVEY_DIR, survey_name, 'questions.json')
-    if os.path.exists(questions_file):
-        with open(questions_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return {
-                'name': data.get('survey', {}).get('name', ''),
-                'description': data.get('survey', {}).get('description', ''),
-                'copyright': data.get('survey', {}).get('copyright', '')
-            }
-    return {}
+    """Get survey information from the survey registry (cached questions.json)"""
+    try:
+        return survey_registry.get(survey_name).info
+    except (FileNotFoundError, ValueError):
+        return {}
 
 def get_language_stats(data, selected_languages):
     """Calculate language statistics"""
@@ -3,12 +3,8 @@ Survey selector component for choosing which survey to analyze.
 """
 
 from dash import html, dcc, Output, Input
-import os
-import glob
-import json
-from datetime import datetime
 from api.config.styles import COLORS, FONTS, COMPONENT_STYLES
-from api.config.settings import SURVEY_DIR
+from api.utils.catalog import catalog_surveys, catalog_models
 
 def get_survey_name(survey_id):
     """Get friendly name for survey."""
@@ -16,23 +12,11 @@ def get_survey_name(survey_id):
     return survey_id
 
 def get_available_surveys():
-    """Get list of available surveys with proper names."""
-    surveys = []
-    for survey_dir in glob.glob(os.path.join(SURVEY_DIR, "*")):
-        if os.path.isdir(survey_dir):
-            survey_id = os.path.basename(survey_dir)
-            # Only add if it has data directories
-            data_dirs = [d for d in os.listdir(survey_dir) 
-                        if os.path.isdir(os.path.join(survey_dir, d)) and d.startswith('data_')]
-            if data_dirs:
-                surveys.append({
-                    'label': survey_id,  # Use the actual directory name as both label and value
-                    'value': survey_id
-                })
-    return sorted(surveys, key=lambda x: x['label'])
+    """Get list of surveys with results, from the survey catalog."""
+    return [{'label': survey_id, 'value': survey_id} for survey_id in sorted(catalog_surveys())]
 
 def get_available_models(survey_name):
-    """Get a list of available models that have data directories for a given survey.
+    """Get a list of available models that have results for a given survey.
     
     Args:
         survey_name (str): Name of the survey to get models for
@@ -40,24 +24,10 @@ def get_available_models(survey_name):
     Returns:
         list: List of models that have results available
     """
-    models = set()
-    survey_dir = os.path.join(SURVEY_DIR, survey_name)
-    
-    if not os.path.exists(survey_dir):
-        print(f"Survey directory does not exist: {survey_dir}")
-        return []
-    
-    # Look for data directories
-    for item in os.listdir(survey_dir):
-        full_path = os.path.join(survey_dir, item)
-        if os.path.isdir(full_path) and item.startswith('data_'):
-            # Keep the full directory name as the value
-            print(f"Found model directory: {item}")
-            models.add(item)
-    
-    model_list = sorted(list(models))
-    print(f"Available models for {survey_name}: {model_list}")
-    return [{'label': model.replace('data_', ''), 'value': model} for model in model_list]
+    return [
+        {'label': model['model'], 'value': model['model_dir']}
+        for model in catalog_models(survey_name)
+    ]
 
 def create_survey_selector(app=None):
     """Create the survey selector component."""
@@ -7,6 +7,8 @@ import json
 import os
 
 from api.data_structures.matrix_data import MatrixData
+from survey_tools.results_format import normalize_results
+from survey_tools.matrix_sidecar import load_matrix_sidecar
 
 def process_result_file(data: List[Dict[str, Any]], source_file: str) -> MatrixData:
     """Process a single result file into MatrixData format.
@@ -52,7 +54,7 @@ def process_result_file(data: List[Dict[str, Any]], source_file: str) -> MatrixD
     return matrix
 
 def load_and_process_file(file_path: str) -> Tuple[Optional[MatrixData], Optional[str]]:
-    """Load and process a result file.
+    """Load and process a result file, from its dense sidecar when it has a current one.
     
     Args:
         file_path: Path to the result file
@@ -61,13 +63,17 @@ def load_and_process_file(file_path: str) -> Tuple[Optional[MatrixData], Optiona
         Tuple of (MatrixData or None, error message or None)
     """
     try:
+        arrays = load_matrix_sidecar(file_path)
+        if arrays is not None:
+            return MatrixData.from_sidecar(arrays, os.path.basename(file_path)), None
+
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
             
-        if not isinstance(data, dict) or 'results' not in data:
+        if not isinstance(data, dict) or ('results' not in data and 'cells' not in data):
             return None, "Invalid data format - missing 'results' key"
             
-        results = data['results']
+        results, _ = normalize_results(data)
         if not isinstance(results, list):
             return None, "Invalid results format - expected list"
             
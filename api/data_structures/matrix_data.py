@@ -2,6 +2,7 @@
 Matrix data structure for handling survey response data from multiple sources.
 """
 
+import json
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 
@@ -9,9 +10,80 @@ class MatrixData:
     def __init__(self):
         self.questions: List[Dict[str, str]] = []  # List of {id: str, title: str}
         self.languages: List[str] = []
-        self.values: Dict[str, Dict[str, float]] = {}  # {lang: {q_id: value}}
+        self._values: Optional[Dict[str, Dict[str, float]]] = {}  # {lang: {q_id: value}}
         self.metadata: Dict[str, Dict[str, Any]] = {}  # {q_id: {scale_min, scale_max, etc}}
-        self.sources: Dict[str, Dict[str, str]] = {}  # {lang: {q_id: source_file}}
+        self._sources: Optional[Dict[str, Dict[str, str]]] = {}  # {lang: {q_id: source_file}}
+        self._dense: Optional[np.ndarray] = None  # languages x questions means, when built from a sidecar
+        self._source_file: Optional[str] = None  # Source of every value in _dense
+        
+    @property
+    def values(self) -> Dict[str, Dict[str, float]]:
+        """{lang: {q_id: value}}, built from the dense array on first use."""
+        if self._values is None:
+            self._materialize()
+        return self._values
+        
+    @values.setter
+    def values(self, values: Dict[str, Dict[str, float]]) -> None:
+        self._values = values
+        
+    @property
+    def sources(self) -> Dict[str, Dict[str, str]]:
+        """{lang: {q_id: source_file}}, built from the dense array on first use."""
+        if self._sources is None:
+            self._materialize()
+        return self._sources
+        
+    @sources.setter
+    def sources(self, sources: Dict[str, Dict[str, str]]) -> None:
+        self._sources = sources
+        
+    def _materialize(self) -> None:
+        """Build the values and sources dicts from the dense mean array."""
+        q_ids = [q['id'] for q in self.questions]
+        values = {lang: {} for lang in self.languages}
+        rows, cols = np.nonzero(~np.isnan(self._dense))
+        for i, j, value in zip(rows.tolist(), cols.tolist(), self._dense[rows, cols].tolist()):
+            values[self.languages[i]][q_ids[j]] = value
+        self._values = values
+        self._sources = {lang: dict.fromkeys(row, self._source_file) for lang, row in values.items()}
+        
+    def _drop_dense(self) -> None:
+        """Keep the dicts and drop the dense array before the data is changed."""
+        if self._dense is not None:
+            self.values  # Build the dicts while the dense array still describes the data
+            self._dense = None
+        
+    @classmethod
+    def from_sidecar(cls, arrays: Dict[str, np.ndarray], source_file: str) -> 'MatrixData':
+        """Build from a results file's matrix sidecar (survey_tools.matrix_sidecar).
+        
+        The dense mean array is kept, so get_matrix and select_languages
+        slice it instead of rebuilding it value by value; values and
+        sources are only built from it if they are used.
+        
+        Args:
+            arrays: Sidecar arrays from load_matrix_sidecar
+            source_file: Name of the results file, for tracking
+        """
+        matrix = cls()
+        q_ids = arrays['question_ids'].tolist()
+        for q_id, title, scale_min, scale_max, category, scale_labels in zip(
+            q_ids, arrays['question_titles'].tolist(), arrays['scale_min'].tolist(), arrays['scale_max'].tolist(),
+            arrays['categories'].tolist(), arrays['scale_labels'].tolist()
+        ):
+            matrix.questions.append({'id': q_id, 'title': title})
+            matrix.metadata[q_id] = {
+                'scale_min': scale_min,
+                'scale_max': scale_max,
+                'scale_labels': json.loads(scale_labels),
+                'category': category
+            }
+        matrix.languages = arrays['languages'].tolist()
+        matrix._dense = arrays['mean'].astype(np.float64)
+        matrix._source_file = source_file
+        matrix._values = matrix._sources = None
+        return matrix
         
     def add_question(self, q_id: str, title: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Add a question to the matrix.
@@ -22,6 +94,7 @@ class MatrixData:
             metadata: Optional metadata like scale_min, scale_max, etc.
         """
         if not any(q['id'] == q_id for q in self.questions):
+            self._drop_dense()
             self.questions.append({'id': q_id, 'title': title})
             if metadata:
                 self.metadata[q_id] = metadata
@@ -33,6 +106,7 @@ class MatrixData:
             lang: Language identifier
         """
         if lang not in self.languages:
+            self._drop_dense()
             self.languages.append(lang)
             self.values[lang] = {}
             self.sources[lang] = {}
@@ -60,6 +134,7 @@ class MatrixData:
                 if not (scale_min <= value <= scale_max):
                     raise ValueError(f"Value {value} out of range [{scale_min}, {scale_max}] for question {q_id}")
         
+        self._drop_dense()
         self.values[lang][q_id] = float(value)
         self.sources[lang][q_id] = source_file
         
@@ -107,6 +182,8 @@ class MatrixData:
         """
         # Create ordered lists of questions and languages
         q_ids = [q['id'] for q in self.questions]
+        if self._dense is not None:
+            return q_ids, self.languages, np.nan_to_num(self._dense, nan=0.0)
         
         # Create the matrix
         matrix = np.full((len(self.languages), len(q_ids)), np.nan)  # Initialize with NaN
@@ -129,6 +206,36 @@ class MatrixData:
                 
         return q_ids, self.languages, matrix
         
+    def select_languages(self, languages: List[str]) -> 'MatrixData':
+        """Copy restricted to the given languages that are present, in that order.
+        
+        Args:
+            languages: Language identifiers to keep
+            
+        Returns:
+            New MatrixData object
+        """
+        selected = MatrixData()
+        if self._dense is not None:
+            row_index = {lang: i for i, lang in enumerate(self.languages)}
+            rows = [row_index[lang] for lang in languages if lang in row_index]
+            selected.questions = list(self.questions)
+            selected.metadata = dict(self.metadata)
+            selected.languages = [self.languages[i] for i in rows]
+            selected._dense = self._dense[rows]
+            selected._source_file = self._source_file
+            selected._values = selected._sources = None
+            return selected
+        
+        for q in self.questions:
+            selected.add_question(q['id'], q['title'], self.metadata.get(q['id']))
+        for lang in languages:
+            if lang in self.languages:
+                selected.add_language(lang)
+                for q_id, value in self.values[lang].items():
+                    selected.set_value(lang, q_id, value, self.sources[lang][q_id])
+        return selected
+        
     def validate(self) -> bool:
         """Validate the data structure.
         
@@ -13,6 +13,8 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 import json
 
+from survey_tools.results_format import load_results_file
+
 
 @dataclass
 class ModelInfo:
@@ -182,14 +184,8 @@ class StateManager:
             all_data = []
             for file_path in result_files:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict) and 'results' in data:
-                            all_data.extend(data['results'])
-                        elif isinstance(data, list):
-                            all_data.extend(data)
-                        else:
-                            all_data.append(data)
+                    results, _ = load_results_file(str(file_path))
+                    all_data.extend(results)
                 except Exception as e:
                     print(f"Error reading file {file_path}: {e}")
                     continue
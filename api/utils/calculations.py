@@ -41,48 +41,138 @@ def get_filtered_languages(data):
             valid_languages.add(lang)
     return sorted(list(valid_languages))
 
-def calculate_summary_stats(matrix_data):
-    """Calculate summary statistics for each column"""
-    summary_stats = []
-    
-    # Calculate mean for each column
-    means = []
-    for col in zip(*matrix_data):
-        valid_values = [x for x in col if x is not None]
-        mean = sum(valid_values) / len(valid_values) if valid_values else None
-        means.append(mean)
-    summary_stats.append(means)
-    
-    # Calculate standard deviation for each column
-    stds = []
-    for col in zip(*matrix_data):
-        valid_values = [x for x in col if x is not None]
-        if valid_values:
-            mean = sum(valid_values) / len(valid_values)
-            variance = sum((x - mean) ** 2 for x in valid_values) / len(valid_values)
-            std = math.sqrt(variance)
-            stds.append(std)
-        else:
-            stds.append(None)
-    summary_stats.append(stds)
-    
-    # Calculate mode for each column
-    modes = []
-    for col in zip(*matrix_data):
-        valid_values = [x for x in col if x is not None]
-        if valid_values:
-            # Count occurrences of each value
-            value_counts = {}
-            for value in valid_values:
-                value_counts[value] = value_counts.get(value, 0) + 1
-            # Find the most common value
-            mode = max(value_counts.items(), key=lambda x: x[1])[0]
-            modes.append(mode)
-        else:
-            modes.append(None)
-    summary_stats.append(modes)
-    
-    return summary_stats
+def cell_sufficient_stats(stats):
+    """Return (n, sum, sum_sq, min, max) for one language_stats entry.
+
+    Results files written before these were stored only carry count, mean
+    and std; sum and sum_sq are then recovered from those (exact up to the
+    rounding of the stored mean and std) and min/max are unknown (None).
+    """
+    n = stats.get('count') or 0
+    if 'sum' in stats and 'sum_sq' in stats:
+        return n, stats['sum'], stats['sum_sq'], stats.get('min'), stats.get('max')
+    mean = stats.get('mean') or 0.0
+    std = stats.get('std')
+    if std is None or math.isnan(std):
+        std = 0.0
+    total = n * mean
+    sum_sq = (n - 1) * std * std + n * mean * mean if n > 0 else 0.0
+    return n, total, sum_sq, None, None
+
+def _squared_deviations(stats, n, total, sum_sq):
+    """Sum of squared deviations from the mean (M2) of one language_stats entry.
+
+    Taken from the stored std, which result processing computes without
+    cancellation; sum_sq is only used when an entry has no std.
+    """
+    std = stats.get('std')
+    if n < 2:
+        return 0.0
+    if std is None or math.isnan(std):
+        return max(sum_sq - total * total / n, 0.0)
+    return (n - 1) * std * std
+
+def merge_cell_stats(stats_list):
+    """Merge language_stats entries for the same cell from several runs.
+
+    Counts and sums add, and the pooled sample std combines each run's
+    squared deviations with Chan et al.'s pairwise update (as
+    survey_tools.accumulators does), so tightly clustered cells keep their
+    precision. Histograms and unbinned counts add bin by bin (None unless
+    every entry has one over the same scale). A single entry is returned
+    with its stored mean and std unchanged.
+    """
+    entries = [stats for stats in stats_list if stats and (stats.get('count') or 0) > 0]
+    n = total = sum_sq = 0
+    mean = m2 = 0.0
+    lows, highs = [], []
+    for stats in entries:
+        count, cell_sum, cell_sum_sq, low, high = cell_sufficient_stats(stats)
+        cell_mean = cell_sum / count
+        delta = cell_mean - mean
+        m2 += _squared_deviations(stats, count, cell_sum, cell_sum_sq) + delta * delta * n * count / (n + count)
+        mean += delta * count / (n + count)
+        n += count
+        total += cell_sum
+        sum_sq += cell_sum_sq
+        lows.append(low)
+        highs.append(high)
+
+    if n == 0:
+        return {'count': 0, 'mean': None, 'std': None, 'sum': 0.0, 'sum_sq': 0.0, 'min': None, 'max': None,
+                'histogram': None, 'unbinned': None}
+
+    histograms = [stats.get('histogram') for stats in entries]
+    histogram = unbinned = None
+    if all(histograms) and len({len(h) for h in histograms}) == 1:
+        histogram = [int(total_count) for total_count in np.sum(histograms, axis=0)]
+        # Results files written before unbinned counts were stored have none
+        unbinned = sum(stats['unbinned'] for stats in entries) if all(
+            'unbinned' in stats for stats in entries) else None
+
+    merged = {
+        'count': n,
+        'sum': total,
+        'sum_sq': sum_sq,
+        'min': min(lows) if None not in lows else None,
+        'max': max(highs) if None not in highs else None,
+        'histogram': histogram,
+        'unbinned': unbinned
+    }
+    if len(entries) == 1:
+        merged['mean'] = entries[0].get('mean')
+        merged['std'] = entries[0].get('std')
+    else:
+        merged['mean'] = total / n
+        merged['std'] = math.sqrt(max(m2, 0.0) / (n - 1)) if n > 1 else float('nan')
+    return merged
+
+def histogram_distribution(histogram, scale_min, unbinned=0):
+    """Distribution statistics of one cell from its response histogram.
+
+    Args:
+        histogram: Counts per scale point, scale_min first (language_stats['histogram'])
+        scale_min: Value of the first bin
+        unbinned: Valid responses with no bin (language_stats['unbinned']),
+            e.g. 5.5; they are reported but not part of the statistics
+
+    Returns:
+        Dict with count (binned responses), unbinned, shares (proportion per
+        scale point), median, mode (lowest of tied modes), skewness and
+        Sarle's bimodality coefficient (above about 0.555 suggests a bimodal
+        distribution). Statistics that need more responses than the cell has
+        are None.
+    """
+    counts = np.asarray(histogram, dtype=float)
+    n = counts.sum()
+    result = {'count': int(n), 'unbinned': int(unbinned or 0), 'shares': None, 'median': None, 'mode': None,
+              'skewness': None, 'bimodality': None}
+    if n == 0:
+        return result
+
+    values = scale_min + np.arange(len(counts))
+    cumulative = np.cumsum(counts)
+    # Median of the expanded responses: mean of the two middle values when n is even
+    lower = values[np.searchsorted(cumulative, (n + 1) // 2)]
+    upper = values[np.searchsorted(cumulative, n // 2 + 1)]
+    result['shares'] = (counts / n).tolist()
+    result['median'] = float((lower + upper) / 2)
+    result['mode'] = int(values[np.argmax(counts)])
+
+    mean = (counts * values).sum() / n
+    deviations = values - mean
+    m2 = (counts * deviations ** 2).sum() / n
+    if m2 > 0 and n > 3:
+        m3 = (counts * deviations ** 3).sum() / n
+        m4 = (counts * deviations ** 4).sum() / n
+        # Bias-corrected sample skewness and excess kurtosis
+        skewness = math.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+        kurtosis = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * (m4 / m2 ** 2 - 3) + 6)
+        result['skewness'] = float(skewness)
+        result['bimodality'] = float(
+            (skewness ** 2 + 1) / (kurtosis + 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+        )
+    return result
 
 def get_scale_labels(question):
     """Convert scale labels from any format to a list of labels."""
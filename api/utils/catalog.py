@@ -0,0 +1,50 @@
+"""
+Survey catalog lookups for the dashboard's survey, model and language selectors.
+"""
+
+from typing import Dict, List, Optional
+
+from survey_tools.catalog import survey_catalog, build_catalog
+
+# Catalog built in memory when data/catalog.json has not been written yet
+_fallback_catalog: Optional[Dict] = None
+
+def get_catalog() -> Dict:
+    """
+    The survey catalog (see survey_tools.catalog): data/catalog.json, cached
+    until it changes, or one built once in memory if result processing has
+    not written it yet.
+    """
+    global _fallback_catalog
+    catalog = survey_catalog.get()
+    if catalog is not None:
+        return catalog
+    if _fallback_catalog is None:
+        print("No survey catalog found - scanning data directory")
+        # Only read, never written, so skip hashing every results file on the request path
+        _fallback_catalog = build_catalog(fingerprint=False)
+    return _fallback_catalog
+
+def get_model_label(model_dir: str) -> str:
+    """Display name of a model directory, e.g. data_gpt-4o -> GPT-4o."""
+    model = model_dir[len('data_'):] if model_dir.startswith('data_') else model_dir
+    return 'GPT-' + model[len('gpt-'):] if model.startswith('gpt-') else model
+
+def catalog_surveys() -> List[str]:
+    """IDs of surveys with results."""
+    return [survey['survey_id'] for survey in get_catalog()['surveys']]
+
+def catalog_models(survey_id: str) -> List[Dict]:
+    """Catalog entries of a survey's models (empty if the survey has no results)."""
+    for survey in get_catalog()['surveys']:
+        if survey['survey_id'] == survey_id:
+            return survey['models']
+    return []
+
+def catalog_valid_languages(survey_id: str, model_id: str) -> List[str]:
+    """Languages valid in any results file of a survey and model."""
+    model_dir = model_id if model_id.startswith('data_') else f'data_{model_id}'
+    for model in catalog_models(survey_id):
+        if model['model_dir'] == model_dir:
+            return model['valid_languages']
+    return []
@@ -29,22 +29,7 @@ def create_matrix_graph(
         survey_name: Name of the survey
     """
     # Filter for selected languages
-    filtered_matrix = MatrixData()
-    for q in matrix_data.questions:
-        filtered_matrix.add_question(q['id'], q['title'], matrix_data.metadata.get(q['id']))
-    
-    for lang in selected_languages:
-        if lang in matrix_data.languages:
-            filtered_matrix.add_language(lang)
-            for q in matrix_data.questions:
-                q_id = q['id']
-                if q_id in matrix_data.values[lang]:
-                    filtered_matrix.set_value(
-                        lang, 
-                        q_id, 
-                        matrix_data.values[lang][q_id],
-                        matrix_data.sources[lang][q_id]
-                    )
+    filtered_matrix = matrix_data.select_languages(selected_languages)
     
     # Get matrix representation
     question_ids, languages, z_array = filtered_matrix.get_matrix()
@@ -5,6 +5,7 @@ Question view showing detailed analysis of a single question across languages.
 import plotly.graph_objects as go
 from api.config.styles import COLORS, GRAPH_COLORS, FONTS, LAYOUT, GRAPH_LAYOUT
 from api.components.graph_footer import create_graph_footer
+from api.utils.calculations import merge_cell_stats, histogram_distribution
 
 def create_question_graph(data, selected_languages, selected_question, show_confidence_intervals=False, show_color_scale=False, show_numbers=False, model_info=None, survey_name=None):
     """Create a visualization for a single question showing mean responses across languages.
@@ -24,38 +25,21 @@ def create_question_graph(data, selected_languages, selected_question, show_conf
 
     # Find the selected question and aggregate stats across all result files
     question = None
-    aggregated_stats = {lang: {'mean': None, 'std': None, 'count': 0} for lang in selected_languages}
+    language_entries = {lang: [] for lang in selected_languages}
     
-    # Process each question entry (from different result files)
+    # Collect each language's stats from every result file
     for q in data:
         if q.get('question_id') == selected_question:
             question = q  # Keep the last question for metadata
             
-            # Update stats for each language
             lang_stats = q.get('language_stats', {})
             for lang in selected_languages:
-                if lang in lang_stats:
-                    stats = lang_stats[lang]
-                    current = aggregated_stats[lang]
-                    
-                    # If we have valid data, update the aggregated stats
-                    if stats.get('mean') is not None and stats.get('count', 0) > 0:
-                        if current['mean'] is None:
-                            # First valid data for this language
-                            current['mean'] = stats['mean']
-                            current['std'] = stats.get('std', 0)
-                            current['count'] = stats.get('count', 0)
-                        else:
-                            # Update mean and count
-                            total_count = current['count'] + stats.get('count', 0)
-                            if total_count > 0:
-                                current['mean'] = (
-                                    (current['mean'] * current['count'] + 
-                                     stats['mean'] * stats.get('count', 0)) / total_count
-                                )
-                                # Take the larger std dev as a conservative estimate
-                                current['std'] = max(current['std'] or 0, stats.get('std', 0))
-                                current['count'] = total_count
+                stats = lang_stats.get(lang)
+                if stats and stats.get('mean') is not None and stats.get('count', 0) > 0:
+                    language_entries[lang].append(stats)
+    
+    # Merge runs exactly from their counts and sufficient statistics
+    aggregated_stats = {lang: merge_cell_stats(entries) for lang, entries in language_entries.items()}
     
     if not question:
         return go.Figure()
@@ -73,7 +57,11 @@ def create_question_graph(data, selected_languages, selected_question, show_conf
                 'language': lang,
                 'mean': stats['mean'],
                 'std': stats['std'],
-                'count': stats['count']
+                'count': stats['count'],
+                # None for results files written before histograms were stored
+                'distribution': histogram_distribution(
+                    stats['histogram'], scale_min, stats['unbinned']
+                ) if stats['histogram'] else None
             })
     
     # Sort languages by mean value
@@ -123,13 +111,21 @@ def create_question_graph(data, selected_languages, selected_question, show_conf
     
     hover_text = []
     for d, color in zip(language_data, colors):
-        hover_text.append(
+        text = (
             f"Language: {d['language']}<br>"
             f"Mean: {d['mean']:.2f}<br>"
             f"Std Dev: {d['std']:.2f}<br>"
             f"±2σ Range: {d['mean']-2*d['std']:.2f} to {d['mean']+2*d['std']:.2f}<br>"
             f"Responses: {d['count']}"
         )
+        distribution = d['distribution']
+        if distribution and distribution['count'] > 0:
+            text += f"<br>Median: {distribution['median']:g}<br>Mode: {distribution['mode']}"
+            if distribution['bimodality'] is not None:
+                text += f"<br>Bimodality: {distribution['bimodality']:.2f}"
+            if distribution['unbinned']:
+                text += f"<br>Off-scale responses: {distribution['unbinned']} (not in median/mode)"
+        hover_text.append(text)
 
     # Create bar chart with consistent color scheme
     fig = go.Figure(data=go.Bar(
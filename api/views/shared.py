@@ -5,6 +5,8 @@ Shared utilities for data processing and visualization.
 from typing import Dict, List, Optional
 import numpy as np
 
+from api.utils.calculations import merge_cell_stats
+
 def consolidate_question_data(data: List[Dict]) -> Dict[str, Dict]:
     """Consolidate question data from multiple result files.
     
@@ -23,7 +25,11 @@ def consolidate_question_data(data: List[Dict]) -> Dict[str, Dict]:
             
         if qid not in consolidated:
             # First time seeing this question, initialize with current data
+            # (own language_stats, so merging never alters the input)
             consolidated[qid] = q.copy()
+            consolidated[qid]['language_stats'] = {
+                lang: stats.copy() for lang, stats in q.get('language_stats', {}).items()
+            }
         else:
             # Update existing question data
             existing = consolidated[qid]
@@ -39,30 +45,9 @@ def consolidate_question_data(data: List[Dict]) -> Dict[str, Dict]:
                     # New language, add its stats
                     existing['language_stats'][lang] = stats.copy()
                 else:
-                    # Update existing language stats
-                    existing_stats = existing['language_stats'][lang]
-                    new_stats = stats
-                    
-                    # Update count and mean
-                    total_count = existing_stats.get('count', 0) + new_stats.get('count', 0)
-                    if total_count > 0:
-                        # Weighted average of means
-                        existing_mean = existing_stats.get('mean', 0)
-                        new_mean = new_stats.get('mean', 0)
-                        existing_count = existing_stats.get('count', 0)
-                        new_count = new_stats.get('count', 0)
-                        
-                        existing_stats['mean'] = (
-                            (existing_mean * existing_count + new_mean * new_count) / total_count
-                        )
-                        
-                        # Take the larger std dev as a conservative estimate
-                        existing_stats['std'] = max(
-                            existing_stats.get('std', 0),
-                            new_stats.get('std', 0)
-                        )
-                        
-                        # Update count
-                        existing_stats['count'] = total_count
+                    # Merge counts and sufficient statistics exactly
+                    existing['language_stats'][lang].update(
+                        merge_cell_stats([existing['language_stats'][lang], stats])
+                    )
     
     return consolidated 
\ No newline at end of file
@@ -19,6 +19,51 @@ MODEL_NAME = os.getenv('OPENAI_MODEL', 'gpt-4o')  # Default to GPT-4 if not spec
 
 API_DELAY = float(os.getenv('API_DELAY', '0'))  # Delay between API calls in seconds
 
+# Hedged requests: duplicate a survey call that is still outstanding after the
+# observed latency percentile and keep whichever copy answers first
+HEDGE_REQUESTS = os.getenv('HEDGE_REQUESTS', 'false').lower() == 'true'
+HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '95'))
+HEDGE_MAX_FRACTION = float(os.getenv('HEDGE_MAX_FRACTION', '0.05'))  # Max share of calls hedged
+HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '20'))  # Latencies observed before hedging
+
+# Survey response mode: 'default' leaves completions uncapped; 'latency' caps
+# output tokens by scale width and adds stop sequences
+RESPONSE_MODE = os.getenv('RESPONSE_MODE', 'default')
+STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'false').lower() == 'true'  # Latency mode only
+LATENCY_MAX_TOKENS = int(os.getenv('LATENCY_MAX_TOKENS', '20'))  # Cap when the scale is unknown
+# Extra tokens over the scale width, for answers with a short prefix ("Respuesta: 7")
+# or a restated scale ("On a scale of 1 to 10, I'd say 7")
+LATENCY_TOKEN_HEADROOM = int(os.getenv('LATENCY_TOKEN_HEADROOM', '16'))
+
+MAX_WORKERS = int(os.getenv('MAX_WORKERS', '8'))  # Concurrent survey calls in pooled runs
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '16'))  # Translated prompts buffered ahead of survey workers
+
+# Translation memory: reuse stored translations of unchanged prompts across runs
+USE_TRANSLATION_MEMORY = os.getenv('USE_TRANSLATION_MEMORY', 'true').lower() == 'true'
+TRANSLATION_MEMORY_FILE = os.getenv('TRANSLATION_MEMORY_FILE', 'data/translation_memory.json')
+
+# Local similarity pre-check before LLM translation verification: back-translations
+# at or above the high threshold are scored 5 and at or below the low threshold 1,
+# without an API call; only the band in between goes to the LLM judge. Opt-in, so
+# verification scores only change when it is enabled
+SIMILARITY_PRECHECK = os.getenv('SIMILARITY_PRECHECK', 'false').lower() == 'true'
+SIMILARITY_HIGH_THRESHOLD = float(os.getenv('SIMILARITY_HIGH_THRESHOLD', '0.9'))
+SIMILARITY_LOW_THRESHOLD = float(os.getenv('SIMILARITY_LOW_THRESHOLD', '0.2'))
+
+# Fused verification: one structured call returns both the back-translation and its 1-5 score
+FUSED_VERIFICATION = os.getenv('FUSED_VERIFICATION', 'false').lower() == 'true'
+
+# Translation quality gate, applied per language before any survey calls: languages
+# whose average verification score is below survey_tools/config.VERIFICATION_THRESHOLD
+# are 'retranslate'd (failing questions, stricter instruction) and excluded if still
+# failing, or 'exclude'd directly; 'off' surveys every language. Opt-in, so no
+# language is dropped from a run unless the gate is asked for
+QUALITY_GATE = os.getenv('QUALITY_GATE', 'off')
+RETRANSLATION_MODEL = os.getenv('RETRANSLATION_MODEL')  # Defaults to MODEL_NAME
+
+# Batch translation: translate all of a language's questions in one request per direction
+BATCH_TRANSLATION = os.getenv('BATCH_TRANSLATION', 'false').lower() == 'true'
+
 # Default settings (can be overridden in survey config)
 DEFAULT_LANGUAGES = ['English']  # Default to English only
 DEFAULT_NUM_TRIALS = 1  # Default to single trial
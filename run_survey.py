@@ -5,26 +5,27 @@ Main entry point for running surveys and processing results.
 """
 
 import os
-import json
 import argparse
 from datetime import datetime
 import sys
 from survey_tools.survey_runner import run_survey
-from survey_tools.result_processor import process_results
+from survey_tools.result_processor import process_results, process_experiment_results, process_survey_results_parallel, find_data_files as find_model_data_files
+from survey_tools.experiment import load_experiment_grid, build_variants, run_experiment
+from survey_tools.translation_memory import get_translation_memory
+from survey_tools.translator import TRANSLATION_INSTRUCTION_VERSION, active_instruction_version
+from survey_tools.translation_bundle import build_translation_bundle, write_translation_bundle, load_translation_bundle
+from survey_tools.telemetry import telemetry
+from survey_tools.survey_registry import registry as survey_registry
+from survey_tools.raw_store import reparse_data_file
+from survey_tools.response_store import convert_data_csv
+from survey_tools.response_parser import PARSER_VERSION, PARSERS
+import survey_tools.config as processing_config
 import config
 import openai
-import glob
 
 def get_available_surveys():
     """Get list of available surveys."""
-    surveys = []
-    survey_dir = "data"
-    if os.path.exists(survey_dir):
-        for item in os.listdir(survey_dir):
-            if os.path.isdir(os.path.join(survey_dir, item)):
-                if os.path.exists(os.path.join(survey_dir, item, "questions.json")):
-                    surveys.append(item)
-    return sorted(surveys)
+    return survey_registry.list_surveys()
 
 def select_survey():
     """Interactive menu to select a survey."""
@@ -75,13 +76,12 @@ def select_trials(recommended_trials):
 
 def load_survey_data(survey_id):
     """Load survey questions and configuration."""
-    questions_file = os.path.join("data", survey_id, "questions.json")
+    questions_file = survey_registry.questions_path(survey_id)
     if not os.path.exists(questions_file):
         raise FileNotFoundError(f"Survey questions not found: {questions_file}")
     
-    with open(questions_file, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-        return json_data["questions"], json_data["survey"]["metadata"]
+    survey = survey_registry.get(survey_id)
+    return survey.questions, survey.metadata
 
 def find_latest_results(survey_id):
     """Find the most recent results file for a given survey."""
@@ -98,16 +98,47 @@ def find_latest_results(survey_id):
     latest_file = sorted(result_files)[-1]
     return os.path.join(data_dir, latest_file)
 
-def confirm_survey_run(survey_id, languages, trials, questions):
-    """Display survey details and get user confirmation."""
+def confirm_survey_run(survey_id, languages, trials, questions, translation_bundle=None,
+                       instruction_version=TRANSLATION_INSTRUCTION_VERSION):
+    """
+    Display survey details and get user confirmation. Stored translations
+    are looked up under instruction_version, the memory key of the active
+    translation mode.
+    """
     num_questions = len(questions)
     non_english = len([lang for lang in languages if lang.lower() != 'english'])
     
+    # Translations already in the translation memory or a bundle need no API calls
+    memory = get_translation_memory()
+    stored = 0
+    if translation_bundle is not None:
+        stored = non_english * num_questions
+    elif memory is not None:
+        stored = sum(
+            1 for lang in languages if lang.lower() != 'english' for q in questions
+            if memory.get(q['prompt_text'], lang, config.MODEL_NAME, instruction_version)
+        )
+    to_translate = non_english * num_questions - stored
+    
     # API call calculations
     survey_calls = len(languages) * num_questions * trials
-    forward_translation_calls = non_english * num_questions  # One per non-English question
-    back_translation_calls = non_english * num_questions    # One per non-English question
-    verification_calls = non_english * num_questions        # One per non-English question
+    if config.BATCH_TRANSLATION:
+        # One forward and one back request per language with anything left to translate
+        batch_languages = min(non_english, to_translate)
+        if memory is not None and to_translate:
+            batch_languages = sum(
+                1 for lang in languages if lang.lower() != 'english'
+                and any(not memory.get(q['prompt_text'], lang, config.MODEL_NAME, instruction_version)
+                        for q in questions)
+            )
+        forward_translation_calls = batch_languages
+        back_translation_calls = batch_languages
+    else:
+        forward_translation_calls = to_translate  # One per non-English question not yet stored
+        back_translation_calls = to_translate    # One per non-English question not yet stored
+    verification_calls = to_translate        # One per non-English question not yet stored
+    if config.FUSED_VERIFICATION and not config.BATCH_TRANSLATION:
+        verification_calls = 0  # Returned by the back-translation call
     total_api_calls = survey_calls + forward_translation_calls + back_translation_calls + verification_calls
     
     print("\nSurvey Configuration:")
@@ -134,9 +165,19 @@ def confirm_survey_run(survey_id, languages, trials, questions):
     print("-" * 50)
     print(f"Survey responses: {survey_calls} ({trials} trials × {num_questions} questions × {len(languages)} languages)")
     if non_english > 0:
-        print(f"Forward translations: {forward_translation_calls} (1 call × {num_questions} questions × {non_english} non-English)")
-        print(f"Back translations: {back_translation_calls} (1 call × {num_questions} questions × {non_english} non-English)")
-        print(f"Translation verification: {verification_calls} (1 call × {num_questions} questions × {non_english} non-English)")
+        if stored:
+            source = 'translation bundle' if translation_bundle is not None else 'translation memory'
+            print(f"Stored translations reused: {stored} of {non_english * num_questions} ({source})")
+        if config.BATCH_TRANSLATION:
+            print(f"Forward translations: {forward_translation_calls} (1 batch call × {forward_translation_calls} languages)")
+            print(f"Back translations: {back_translation_calls} (1 batch call × {back_translation_calls} languages)")
+        else:
+            print(f"Forward translations: {forward_translation_calls} (1 call × {to_translate} untranslated questions)")
+            print(f"Back translations: {back_translation_calls} (1 call × {to_translate} untranslated questions)")
+        if verification_calls or not to_translate:
+            print(f"Translation verification: {verification_calls} (1 call × {to_translate} untranslated questions)")
+        else:
+            print("Translation verification: 0 (fused into back translations)")
         print(f"Total API calls: {total_api_calls}")
         print(f"\nNote: All API calls will use the OpenAI {config.MODEL_NAME or 'gpt-4'} model")
     
@@ -278,9 +319,8 @@ def find_all_data_files(survey_id):
     for item in os.listdir(survey_dir):
         if item.startswith('data_') and os.path.isdir(os.path.join(survey_dir, item)):
             model_dir = os.path.join(survey_dir, item)
-            # Find CSV files in this model directory
-            csv_files = glob.glob(os.path.join(model_dir, "data_*.csv"))
-            for file in csv_files:
+            # Find data files (CSV or converted) in this model directory
+            for file in find_model_data_files(model_dir):
                 all_files.append({
                     'path': file,
                     'model': item[5:],  # Remove 'data_' prefix
@@ -289,8 +329,142 @@ def find_all_data_files(survey_id):
     
     return all_files
 
+def reparse_survey_data(survey_id, questions, parser_version, data_file=None):
+    """Rebuild Response columns from stored raw completions, offline."""
+    if data_file:
+        data_files = [data_file]
+    else:
+        all_files = [f['path'] for f in find_all_data_files(survey_id)]
+        data_files = [path for path in all_files if path.endswith('.csv')]
+        converted = [path for path in all_files if not path.endswith('.csv')]
+        if converted:
+            print(f"Skipping {len(converted)} converted run(s) without a data CSV:")
+            for path in converted:
+                print(f"  {os.path.basename(path)}")
+
+    print(f"\nReparsing {len(data_files)} data file(s) with parser v{parser_version}...")
+    for path in data_files:
+        try:
+            stats = reparse_data_file(path, questions, parser_version)
+        except FileNotFoundError as e:
+            print(f"Skipping {os.path.basename(path)}: {e}")
+            continue
+        print(f"{os.path.basename(path)}: {stats['reparsed']} rows reparsed, "
+              f"{stats['changed']} changed, {stats['missing']} without raw text")
+
+    print("\nRun with --skip-survey to rebuild results from the reparsed data.")
+
+def convert_survey_data(survey_id, remove_csv, data_file=None):
+    """Convert data CSVs to normalised prompts and responses files."""
+    if data_file:
+        data_files = [data_file]
+    else:
+        data_files = sorted(f['path'] for f in find_all_data_files(survey_id) if f['path'].endswith('.csv'))
+
+    print(f"\nConverting {len(data_files)} data file(s)...")
+    for path in data_files:
+        before = os.path.getsize(path)
+        try:
+            responses_path, prompts_path = convert_data_csv(path, remove_csv=remove_csv)
+        except ValueError as e:
+            print(f"Skipping {os.path.basename(path)}: {e}")
+            continue
+        after = os.path.getsize(responses_path) + os.path.getsize(prompts_path)
+        print(f"{os.path.basename(path)}: {before:,} -> {after:,} bytes ({before / after:.0f}x smaller)")
+
+    if not remove_csv:
+        print("\nThe CSVs were kept; add --remove-csv to delete them once converted.")
+
+def process_survey_command(survey_id, args):
+    """Process all data files of a survey in parallel, without prompts."""
+    summary = process_survey_results_parallel(
+        survey_id, model_names=args.models, max_workers=args.workers, force=args.force,
+        statistics_workers=args.statistics_workers
+    )
+    print(f"\nProcessed {len(summary['processed'])} file(s), "
+          f"skipped {summary['skipped']} already current, {len(summary['errors'])} error(s)")
+    if summary['errors']:
+        print("\nErrors:")
+        for data_file, message in summary['errors']:
+            print(f"  {data_file}: {message}")
+        sys.exit(1)
+
+def translate_survey_command(survey_id, questions, survey_config, args):
+    """Translate a survey ahead of time and write a translation bundle."""
+    languages = args.languages or select_languages(survey_config.get('default_languages', ['English']))
+    non_english = [lang for lang in languages if lang.lower() != 'english']
+    if not non_english:
+        print("Nothing to translate: only English selected.")
+        return
+
+    print(f"\nTranslating {len(questions)} questions into {len(non_english)} language(s) "
+          f"with up to {config.MAX_WORKERS} concurrent translations...")
+    bundle = build_translation_bundle(survey_id, questions, non_english)
+    bundle_file = write_translation_bundle(bundle, f"data/{survey_id}")
+
+    scores = [
+        entry['verification_score'] for entries in bundle['translations'].values()
+        for entry in entries.values()
+    ]
+    unverified = sum(1 for score in scores if score is None)
+    print(f"\nTranslation bundle written to: {bundle_file}")
+    print(f"  {len(scores)} translations, {unverified} without a verification score")
+    telemetry_lines = telemetry.summary()
+    if telemetry_lines:
+        print("Run telemetry:")
+        for line in telemetry_lines:
+            print(f"  {line}")
+    print(f"\nRun the survey with --translation-bundle \"{bundle_file}\" to use it.")
+
+def run_experiment_command(survey_id, questions, survey_config, args):
+    """Run a parameter-sweep experiment and write per-variant results."""
+    if not args.grid:
+        print("Error: the experiment command requires --grid")
+        sys.exit(1)
+    grid = load_experiment_grid(args.grid)
+    variants = build_variants(grid)
+
+    trials = args.trials or select_trials(survey_config.get('recommended_trials', 10))
+    languages = args.languages or select_languages(survey_config.get('default_languages', ['English']))
+
+    survey_calls = len(variants) * len(languages) * len(questions) * trials
+    non_english = len([lang for lang in languages if lang.lower() != 'english'])
+    print(f"\nExperiment: {len(variants)} variants × {len(languages)} languages × "
+          f"{len(questions)} questions × {trials} trials = {survey_calls} survey calls")
+    translation_bundle = load_translation_bundle(args.translation_bundle) if args.translation_bundle else None
+    if translation_bundle is not None:
+        print(f"Translations come from bundle {args.translation_bundle}: no translation calls")
+    elif config.BATCH_TRANSLATION:
+        print(f"Translations are shared across variants: up to {non_english * (2 + len(questions))} translation calls (batch)")
+    else:
+        print(f"Translations are shared across variants: up to {3 * non_english * len(questions)} translation calls")
+    while True:
+        response = input("\nProceed with experiment? (yes/no): ").lower().strip()
+        if response in ['y', 'yes']:
+            break
+        elif response in ['n', 'no']:
+            print("\nExperiment cancelled by user.")
+            sys.exit(0)
+        print("Please answer 'yes' or 'no'")
+
+    data_file = run_experiment(
+        survey_id, questions, grid, trials, languages,
+        translation_settings=survey_config.get('translation_settings', {}),
+        translation_bundle=translation_bundle
+    )
+    print(f"\nExperiment complete. Data saved to: {data_file}")
+    for results_file in process_experiment_results(data_file, survey_id):
+        print(f"Created: {results_file}")
+
 def main():
     parser = argparse.ArgumentParser(description='Run WALLS survey and process results')
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'reparse', 'experiment', 'translate', 'process', 'convert'],
+                       help='"run" (default) runs and/or processes a survey; '
+                            '"reparse" rebuilds Response columns from stored raw completions; '
+                            '"experiment" runs a parameter grid (see --grid); '
+                            '"translate" writes a translation bundle for later runs; '
+                            '"process" processes all data files in parallel without prompts; '
+                            '"convert" stores data CSVs as prompts and responses tables')
     parser.add_argument('--survey-id', help='ID of the survey to run (e.g., wvs)')
     parser.add_argument('--skip-survey', action='store_true', 
                        help='Skip running survey and only process existing results')
@@ -301,6 +475,42 @@ def main():
     parser.add_argument('--model', help='OpenAI model to use (e.g., gpt-4, gpt-3.5-turbo)')
     parser.add_argument('--data-file', help='Specific data file to process (optional)')
     parser.add_argument('--model-dir', help='Specific model directory to process (e.g., data_gpt-4o-2024-08-06)')
+    parser.add_argument('--models', nargs='+',
+                       help='Models to process with the process command (default: all model directories)')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for the process command (default: CPU count)')
+    parser.add_argument('--statistics-workers', type=int, default=1,
+                       help='Worker processes aggregating each data file, for very large files on a multi-core '
+                            'machine; files are then processed one at a time (default: 1)')
+    parser.add_argument('--force', action='store_true',
+                       help='Reprocess data files even if their results are already current')
+    parser.add_argument('--remove-csv', action='store_true',
+                       help='With the convert command, delete each data CSV once converted '
+                            '(converted runs without their CSV cannot be reparsed)')
+    parser.add_argument('--results-format', type=int, choices=[1, 2],
+                       help='Results file format: 1 (indented, default) or 2 (compact table)')
+    parser.add_argument('--shard-results', action='store_true',
+                       help='Write format 2 results plus one shard file per question')
+    parser.add_argument('--hedge', action='store_true',
+                       help='Duplicate survey calls still outstanding after the observed p95 latency')
+    parser.add_argument('--response-mode', choices=['default', 'latency'],
+                       help='Use "latency" to cap output tokens by scale width and add stop sequences')
+    parser.add_argument('--stream', action='store_true',
+                       help='In latency mode, stream responses and stop at the first complete number')
+    parser.add_argument('--parser-version', type=int, choices=sorted(PARSERS), default=PARSER_VERSION,
+                       help='Response parser version used by the reparse command')
+    parser.add_argument('--grid', help='Experiment grid JSON file (models, temperatures, system_prompts)')
+    parser.add_argument('--refresh-translations', action='store_true',
+                       help='Discard stored translations for this survey and translate again')
+    parser.add_argument('--fused-verification', action='store_true',
+                       help='Back-translate and score each translation in one structured call')
+    parser.add_argument('--translation-bundle',
+                       help='Translation bundle JSON written by the translate command; skips translation calls')
+    parser.add_argument('--quality-gate', choices=['off', 'exclude', 'retranslate'],
+                       help='Before surveying, retranslate or exclude languages whose average '
+                            'verification score is below the threshold (default: off, or QUALITY_GATE)')
+    parser.add_argument('--batch-translation', action='store_true',
+                       help='Translate each language\'s whole questionnaire in one request per direction')
     args = parser.parse_args()
 
     # Get survey ID from command line or menu
@@ -317,6 +527,43 @@ def main():
 
     # Load survey data
     questions, survey_config = load_survey_data(survey_id)
+    if args.batch_translation:
+        config.BATCH_TRANSLATION = True
+    if args.fused_verification:
+        config.FUSED_VERIFICATION = True
+    if args.quality_gate:
+        config.QUALITY_GATE = args.quality_gate
+    if args.hedge:
+        config.HEDGE_REQUESTS = True
+    if args.response_mode:
+        config.RESPONSE_MODE = args.response_mode
+    if args.stream:
+        config.STREAM_RESPONSES = True
+    if args.results_format:
+        processing_config.RESULTS_FORMAT = args.results_format
+    if args.shard_results:
+        processing_config.RESULTS_FORMAT = 2
+        processing_config.SHARD_RESULTS = True
+
+    if args.command == 'reparse':
+        reparse_survey_data(survey_id, questions, args.parser_version, args.data_file)
+        return
+
+    if args.command == 'process':
+        process_survey_command(survey_id, args)
+        return
+
+    if args.command == 'convert':
+        convert_survey_data(survey_id, args.remove_csv, args.data_file)
+        return
+
+    if args.command == 'translate':
+        translate_survey_command(survey_id, questions, survey_config, args)
+        return
+
+    if args.command == 'experiment':
+        run_experiment_command(survey_id, questions, survey_config, args)
+        return
     
     if not args.skip_survey:
         # Get model from command line or menu
@@ -339,8 +586,16 @@ def main():
             default_languages = survey_config.get('default_languages', ['English'])
             languages = select_languages(default_languages)
         
+        memory = get_translation_memory()
+        if memory is not None and args.refresh_translations:
+            removed = sum(memory.invalidate(source=q['prompt_text']) for q in questions)
+            memory.save()
+            print(f"\nDiscarded {removed} stored translation(s) for this survey.")
+        
         # Get user confirmation
-        if not confirm_survey_run(survey_id, languages, trials, questions):
+        translation_bundle = load_translation_bundle(args.translation_bundle) if args.translation_bundle else None
+        if not confirm_survey_run(survey_id, languages, trials, questions, translation_bundle,
+                                  active_instruction_version()):
             print("\nSurvey cancelled by user.")
             sys.exit(0)
         
@@ -352,7 +607,8 @@ def main():
             num_trials=trials,
             languages=languages,
             translation_settings=survey_config.get('translation_settings', {}),
-            model=model  # Pass model to run_survey
+            model=model,  # Pass model to run_survey
+            translation_bundle=translation_bundle
         )
         print(f"\nSurvey complete. Results saved to: {results_file}")
     else:
@@ -382,7 +638,8 @@ def main():
 
             if response == 'y':
                 print(f"\nProcessing {file_info['filename']}...")
-                process_results(file_info['path'], survey_id)
+                process_results(file_info['path'], survey_id, force=args.force,
+                                statistics_workers=args.statistics_workers)
             else:
                 print(f"Skipping {file_info['filename']}...")
 
@@ -0,0 +1,244 @@
+"""
+Mergeable per-cell accumulators for result processing.
+
+A data CSV reduces to a few numbers per (Language, Question_ID) cell: the
+count, sum, sum of squares, minimum and maximum of its valid responses, the
+sum of squared deviations from the cell mean (M2), a histogram of the
+response values, plus each language's verification score sum and count.
+Those fold chunk by chunk, so statistics can be computed from a file of any
+size while holding only one chunk and the (small) cell table in memory, and
+can be split across worker processes by hash-partitioning the cells
+(accumulate_csv_parallel).
+
+Responses are small integers, so the sums, and so the means, are exact in
+float64. M2 is taken per chunk with the two-pass arithmetic of Series.var
+and partial M2s are combined with Chan et al.'s pairwise update rather than
+from the sum of squares, which cancels. A cell that lies within one chunk
+therefore gets the same std as the in-memory path bit for bit; a cell
+spread over several chunks agrees to within a few units in the last place.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import STREAMING_CHUNK_ROWS
+
+# Columns of a data CSV that statistics are computed from
+STATISTICS_COLUMNS = ['Language', 'Question_ID', 'Response', 'LLM_Verification_Score']
+
+CELL_COLUMNS = ['n', 'sum', 'sum_sq', 'min', 'max', 'm2']
+
+
+def _empty_cells() -> pd.DataFrame:
+    index = pd.MultiIndex.from_arrays([[], []], names=['Language', 'Question_ID'])
+    return pd.DataFrame({column: pd.Series(dtype=float) for column in CELL_COLUMNS}, index=index)
+
+
+def _squared_deviations(values: pd.Series) -> float:
+    """Sum of squared deviations from the mean, computed as Series.var does."""
+    values = values.to_numpy(dtype=np.float64)
+    mean = values.sum(dtype=np.float64) / len(values)
+    return ((mean - values) ** 2).sum(dtype=np.float64)
+
+
+def _merge_cells(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cell table of two cell tables' responses together. M2 of a cell on both
+    sides uses Chan et al.'s update; a cell on one side is kept as it is.
+    """
+    index = left.index.append(right.index[~right.index.isin(left.index)])
+    left, right = left.reindex(index), right.reindex(index)
+    n_left, n_right = left['n'].fillna(0), right['n'].fillna(0)
+    n = n_left + n_right
+    delta = right['sum'] / n_right - left['sum'] / n_left
+    m2 = left['m2'] + right['m2'] + delta * delta * (n_left * n_right / n)
+    return pd.DataFrame({
+        'n': n,
+        'sum': left['sum'].fillna(0) + right['sum'].fillna(0),
+        'sum_sq': left['sum_sq'].fillna(0) + right['sum_sq'].fillna(0),
+        'min': np.fmin(left['min'], right['min']),
+        'max': np.fmax(left['max'], right['max']),
+        'm2': m2.where(n_left > 0, right['m2']).where(n_right > 0, left['m2'])
+    }, index=index)
+
+
+def _empty_histograms() -> pd.Series:
+    index = pd.MultiIndex.from_arrays([[], [], []], names=['Language', 'Question_ID', 'Response'])
+    return pd.Series(dtype=float, index=index, name='count')
+
+
+def _empty_verification() -> pd.DataFrame:
+    return pd.DataFrame({'count': pd.Series(dtype=float), 'sum': pd.Series(dtype=float)},
+                        index=pd.Index([], name='Language'))
+
+
+class CellAccumulator:
+    """Sufficient statistics of valid responses per (Language, Question_ID) cell."""
+
+    def __init__(self, scale_mins: Dict[str, float]):
+        self.scale_mins = scale_mins
+        self.cells = _empty_cells()
+        self.histograms = _empty_histograms()
+        self.verification = _empty_verification()
+        # Languages in order of first appearance, as df['Language'].unique()
+        self.languages: List[str] = []
+        self._seen = set()
+        self.rows = 0
+
+    def note_languages(self, languages: Iterable) -> None:
+        """Record languages in order of first appearance."""
+        for language in languages:
+            if language not in self._seen:
+                self._seen.add(language)
+                self.languages.append(language)
+
+    def add_chunk(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a chunk of raw rows in. Response and LLM_Verification_Score are
+        coerced to numbers; a response is valid if it is at or above its
+        question's scale_min.
+        """
+        response = pd.to_numeric(chunk['Response'], errors='coerce')
+        score = pd.to_numeric(chunk['LLM_Verification_Score'], errors='coerce')
+        self.rows += len(chunk)
+        self.note_languages(chunk['Language'].unique())
+
+        valid = response.notna() & (response >= chunk['Question_ID'].map(self.scale_mins))
+        values = response[valid]
+        frame = pd.DataFrame({
+            'Language': chunk['Language'][valid],
+            'Question_ID': chunk['Question_ID'][valid],
+            'value': values,
+            'value_sq': values * values
+        })
+        partial = frame.groupby(['Language', 'Question_ID'], sort=False).agg(
+            n=('value', 'count'),
+            sum=('value', 'sum'),
+            sum_sq=('value_sq', 'sum'),
+            min=('value', 'min'),
+            max=('value', 'max'),
+            m2=('value', _squared_deviations)
+        ).astype(float)
+        histograms = frame.groupby(['Language', 'Question_ID', 'value'], sort=False).size().astype(float)
+        histograms.index = histograms.index.set_names('Response', level='value')
+        verification = score.groupby(chunk['Language'], sort=False).agg(['count', 'sum']).astype(float)
+
+        self._combine(partial, histograms, verification)
+
+    def merge(self, other: 'CellAccumulator') -> 'CellAccumulator':
+        """Fold another accumulator (e.g. from a later chunk or a worker) into this one."""
+        self.note_languages(other.languages)
+        self.rows += other.rows
+        self._combine(other.cells, other.histograms, other.verification)
+        return self
+
+    def _combine(self, cells: pd.DataFrame, histograms: pd.Series, verification: pd.DataFrame) -> None:
+        if len(cells):
+            self.cells = _merge_cells(self.cells, cells) if len(self.cells) else cells
+        if len(histograms):
+            combined = pd.concat([self.histograms, histograms]) if len(self.histograms) else histograms
+            self.histograms = combined.groupby(level=['Language', 'Question_ID', 'Response'], sort=False).sum()
+        if len(verification):
+            combined = pd.concat([self.verification, verification]) if len(self.verification) else verification
+            self.verification = combined.groupby(level='Language', sort=False).sum()
+
+    def cell_stats(self) -> pd.DataFrame:
+        """
+        Count, mean, sample std and the sufficient statistics per (Language,
+        Question_ID) cell. Std is NaN for single-response cells, as with
+        Series.std.
+        """
+        n = self.cells['n']
+        mean = self.cells['sum'] / n
+        variance = self.cells['m2'] / (n - 1)
+        return pd.DataFrame({
+            'count': n.astype(int),
+            'mean': mean,
+            'std': np.sqrt(variance.where(n > 1)),
+            'sum': self.cells['sum'],
+            'sum_sq': self.cells['sum_sq'],
+            'min': self.cells['min'],
+            'max': self.cells['max']
+        })
+
+    def verification_means(self) -> pd.Series:
+        """Mean verification score per language (NaN if it has no scores)."""
+        counts = self.verification['count']
+        return (self.verification['sum'] / counts).where(counts > 0)
+
+
+def accumulate_csv(data_file: str, scale_mins: Dict[str, float],
+                   chunk_rows: Optional[int] = None) -> CellAccumulator:
+    """
+    Read a data CSV in chunks of `chunk_rows` rows, loading only the
+    statistics columns, and fold every chunk into one accumulator.
+    """
+    accumulator = CellAccumulator(scale_mins)
+    reader = pd.read_csv(data_file, usecols=STATISTICS_COLUMNS,
+                         chunksize=chunk_rows or STREAMING_CHUNK_ROWS)
+    for chunk in reader:
+        accumulator.add_chunk(chunk)
+    return accumulator
+
+
+def partition_rows(chunk: pd.DataFrame, partitions: int) -> np.ndarray:
+    """
+    Partition number of every row, from a hash of its (Language, Question_ID)
+    cell, so all rows of a cell land in the same partition.
+    """
+    hashes = pd.util.hash_pandas_object(chunk[['Language', 'Question_ID']], index=False)
+    return (hashes.to_numpy() % np.uint64(partitions)).astype(np.int64)
+
+
+_worker_scale_mins: Dict[str, float] = {}
+
+
+def _init_partition_worker(scale_mins: Dict[str, float]) -> None:
+    global _worker_scale_mins
+    _worker_scale_mins = scale_mins
+
+
+def _accumulate_partition(rows: pd.DataFrame) -> CellAccumulator:
+    accumulator = CellAccumulator(_worker_scale_mins)
+    accumulator.add_chunk(rows.astype({'Language': str, 'Question_ID': str}))
+    return accumulator
+
+
+def accumulate_csv_parallel(data_file: str, scale_mins: Dict[str, float], workers: int,
+                            chunk_rows: Optional[int] = None) -> CellAccumulator:
+    """
+    accumulate_csv with the aggregation spread over `workers` processes.
+    Each chunk read here is split into `workers` partitions by cell hash and
+    the partitions are aggregated in the pool. Every partition keeps its own
+    running accumulator, so the partial results merged at the end cover
+    disjoint cells and the result equals accumulate_csv's. At most two
+    chunks' worth of partitions are in flight at a time.
+
+    The cell columns are read as categoricals, which keeps parsing and
+    shipping rows to the workers cheap; workers convert them back.
+    """
+    result = CellAccumulator(scale_mins)
+    partials = [CellAccumulator(scale_mins) for _ in range(workers)]
+    in_flight = deque()
+    reader = pd.read_csv(data_file, usecols=STATISTICS_COLUMNS,
+                         dtype={'Language': 'category', 'Question_ID': 'category'},
+                         chunksize=chunk_rows or STREAMING_CHUNK_ROWS)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_partition_worker,
+                             initargs=(scale_mins,)) as executor:
+        for chunk in reader:
+            result.note_languages(chunk['Language'].unique())
+            for partition, rows in chunk.groupby(partition_rows(chunk, workers), sort=False):
+                in_flight.append((partition, executor.submit(_accumulate_partition, rows)))
+            while len(in_flight) > 2 * workers:
+                partition, future = in_flight.popleft()
+                partials[partition].merge(future.result())
+        for partition, future in in_flight:
+            partials[partition].merge(future.result())
+
+    for partial in partials:
+        result.merge(partial)
+    return result
@@ -0,0 +1,328 @@
+"""
+Result-processing benchmark on a synthetic survey data CSV.
+
+Generates a data CSV shaped like a real run (default 5M rows over the World
+Values Survey questions), then times result processing on it and checks the
+output against the reference implementation it replaced.
+
+    python -m survey_tools.benchmark --rows 5000000
+    python -m survey_tools.benchmark --rows 200000 --reference   # also time the old loops
+
+With --latency it instead times survey calls in the default and latency
+response modes (with and without streaming) against a stand-in client that
+replays typical completions at a fixed per-token delay, and checks every
+mode parses the same answers.
+
+    python -m survey_tools.benchmark --latency --calls 40
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
+from .result_processor import (
+    evaluate_language_quality, summarize_responses, summarize_data_file, QUALITY_THRESHOLDS
+)
+from .survey_registry import registry as survey_registry
+from .telemetry import telemetry
+
+DEFAULT_SURVEY = "World Values Survey"
+
+
+def make_synthetic_data(path: str, rows: int, questions: list, num_languages: int = 60,
+                        seed: int = 0) -> None:
+    """
+    Write a synthetic data CSV with `rows` rows spread over `num_languages`
+    languages and all `questions`. Responses are mostly in range, with some
+    missing and out-of-range values; verification scores are 4-5 or missing,
+    so every language passes the quality thresholds.
+    """
+    rng = np.random.default_rng(seed)
+    languages = ["English"] + [f"Language_{i:02d}" for i in range(1, num_languages)]
+    question_ids = np.array([q["question_id"] for q in questions])
+    scale_min = np.array([float(q["scale_min"]) for q in questions])
+    scale_max = np.array([float(q["scale_max"]) for q in questions])
+
+    lang_index = rng.integers(0, len(languages), rows)
+    q_index = rng.integers(0, len(question_ids), rows)
+    responses = rng.integers(scale_min[q_index], scale_max[q_index] + 1).astype(float)
+    responses[rng.random(rows) < 0.02] = np.nan
+    responses[rng.random(rows) < 0.01] = 0.0  # Below every scale_min
+    scores = rng.integers(4, 6, rows).astype(float)
+    scores[(rng.random(rows) < 0.05) | (lang_index == 0)] = np.nan
+
+    pd.DataFrame({
+        "Language": np.array(languages)[lang_index],
+        "Question_ID": question_ids[q_index],
+        "Trial_Number": rng.integers(1, 11, rows),
+        "Response": responses,
+        "LLM_Verification_Score": scores
+    }).to_csv(path, index=False)
+
+
+def reference_language_quality(df: pd.DataFrame, total_questions: int,
+                               questions_data: list) -> Dict[str, Dict[str, Any]]:
+    """The per-language, per-question loop evaluate_language_quality replaced."""
+    language_quality = {}
+    scale_mins = {q['question_id']: int(q['scale_min']) for q in questions_data}
+    for language in df['Language'].unique():
+        lang_data = df[df['Language'] == language]
+        valid_responses_per_question = {}
+        for qid in scale_mins:
+            q_data = lang_data[lang_data['Question_ID'] == qid]
+            valid_count = q_data[(q_data['Response'].notna()) & (q_data['Response'] >= scale_mins[qid])].shape[0]
+            valid_responses_per_question[qid] = valid_count > 0
+        questions_with_valid_responses = sum(valid_responses_per_question.values())
+        if language != 'English':
+            avg_verification = lang_data['LLM_Verification_Score'].mean()
+            if pd.isna(avg_verification):
+                avg_verification = 0.0
+        else:
+            avg_verification = 5.0
+        response_stds = []
+        for qid in scale_mins:
+            q_data = lang_data[lang_data['Question_ID'] == qid]
+            valid_responses = q_data[(q_data['Response'].notna()) & (q_data['Response'] >= scale_mins[qid])]['Response']
+            if len(valid_responses) > 0:
+                response_stds.append(valid_responses.std())
+        response_std = np.mean(response_stds) if response_stds else 0.0
+        language_quality[language] = {
+            'questions_answered': int(questions_with_valid_responses),
+            'total_questions': total_questions,
+            'coverage_ratio': questions_with_valid_responses / total_questions,
+            'avg_verification_score': avg_verification,
+            'avg_response_std': response_std if not pd.isna(response_std) else 0.0,
+            'passes_threshold': (
+                (language == 'English' and questions_with_valid_responses > 0) or
+                (
+                    questions_with_valid_responses == total_questions and
+                    avg_verification >= QUALITY_THRESHOLDS['min_llm_verification'] and
+                    (response_std <= QUALITY_THRESHOLDS['max_std_dev'] if not pd.isna(response_std) else True)
+                )
+            )
+        }
+    return language_quality
+
+
+def reference_question_results(df: pd.DataFrame, questions_data: list, language_quality: dict,
+                               valid_languages: list) -> list:
+    """The nested question/language loop summarize_responses replaced."""
+    valid_responses = df[(df['Language'].isin(valid_languages)) & (df['Response'].notna())]
+    questions_lookup = {q['question_id']: q for q in questions_data}
+    results = []
+    for question_id, group in valid_responses.groupby('Question_ID'):
+        if question_id not in questions_lookup:
+            continue
+        q_data = questions_lookup[question_id]
+        lang_stats_dict = {}
+        for lang, lang_group in group.groupby('Language'):
+            valid = lang_group['Response'][(lang_group['Response'].notna()) & (lang_group['Response'] >= q_data['scale_min'])]
+            if len(valid) >= QUALITY_THRESHOLDS['min_responses_per_question']:
+                lang_stats_dict[lang] = {
+                    'count': int(len(valid)),
+                    'mean': float(valid.mean()),
+                    'std': float(valid.std()),
+                    'sum': float(valid.sum()),
+                    'sum_sq': float((valid * valid).sum()),
+                    'min': float(valid.min()),
+                    'max': float(valid.max()),
+                    'histogram': [
+                        int((valid == value).sum())
+                        for value in range(int(q_data['scale_min']), int(q_data['scale_max']) + 1)
+                    ],
+                    'unbinned': int((~valid.isin(range(int(q_data['scale_min']),
+                                                       int(q_data['scale_max']) + 1))).sum()),
+                    'quality_metrics': language_quality[lang]
+                }
+        if lang_stats_dict:
+            all_means = [stats['mean'] for stats in lang_stats_dict.values()]
+            results.append({
+                'question_id': question_id,
+                'title': q_data['question_title'],
+                'category': q_data['category'],
+                'scale_min': int(q_data['scale_min']),
+                'scale_max': int(q_data['scale_max']),
+                'scale_labels': q_data['scale_labels'],
+                'num_languages': len(lang_stats_dict),
+                'total_responses': sum(stats['count'] for stats in lang_stats_dict.values()),
+                'overall_mean': float(np.mean(all_means)),
+                'language_stats': lang_stats_dict,
+                'prompt_text': q_data['prompt_text']
+            })
+    return results
+
+
+def _timed(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"  {label}: {time.perf_counter() - started:.2f}s")
+    return result
+
+
+# Completions replayed by the stand-in client, each with the scale it answers
+LATENCY_COMPLETIONS = [
+    ("7", 1, 10),
+    ("On a scale of 1 to 10, I'd say 7.\n\nI value individual effort but also fairness.", 1, 10),
+    ("Respuesta: 7", 1, 10),
+    ("3\n\nThis reflects a moderate level of trust.", 1, 4),
+    ("8 out of 10. Democracy matters a great deal to me.", 1, 10),
+]
+# Roughly how the API tokenises: a word, up to three digits or one punctuation mark
+_TOKEN_PATTERN = re.compile(r"\s*(?:\d{1,3}|[^\W\d]+|[^\w\s])")
+
+
+class _StandInCompletions:
+    """
+    Replays completions like the chat completions API: one token per
+    `token_delay` seconds after `first_token_delay`, honouring max_tokens
+    and stop sequences, streamed or not.
+    """
+
+    def __init__(self, first_token_delay: float, token_delay: float):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.completion = ""
+
+    def _tokens(self, params: dict) -> List[str]:
+        text = self.completion
+        for stop in params.get("stop") or []:
+            text = text.split(stop)[0]
+        return _TOKEN_PATTERN.findall(text)[:params.get("max_tokens") or None]
+
+    def create(self, stream: bool = False, **params):
+        tokens = self._tokens(params)
+        finish_reason = "length" if len(tokens) == params.get("max_tokens") else "stop"
+        if not stream:
+            time.sleep(self.first_token_delay + self.token_delay * len(tokens))
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="".join(tokens)),
+                                         finish_reason=finish_reason)],
+                usage=SimpleNamespace(completion_tokens=len(tokens))
+            )
+        return _StandInStream(tokens, finish_reason, self.first_token_delay, self.token_delay)
+
+
+class _StandInStream:
+    def __init__(self, tokens, finish_reason, first_token_delay, token_delay):
+        self.tokens, self.finish_reason = tokens, finish_reason
+        self.first_token_delay, self.token_delay = first_token_delay, token_delay
+
+    def __iter__(self):
+        time.sleep(self.first_token_delay)
+        for i, token in enumerate(self.tokens):
+            time.sleep(self.token_delay)
+            last = i == len(self.tokens) - 1
+            yield SimpleNamespace(choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=token),
+                finish_reason=self.finish_reason if last else None
+            )])
+
+    def close(self):
+        pass
+
+
+def benchmark_latency(calls: int, first_token_delay: float, token_delay: float) -> None:
+    """Time call_openai per response mode against the stand-in client."""
+    import config
+    from . import survey_runner
+
+    completions = _StandInCompletions(first_token_delay, token_delay)
+    survey_runner.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    modes = [("default", "default", False), ("latency", "latency", False), ("latency+stream", "latency", True)]
+    answers = {}
+    for label, response_mode, stream in modes:
+        config.RESPONSE_MODE, config.STREAM_RESPONSES = response_mode, stream
+        telemetry.reset()
+        latencies, parsed = [], []
+        for i in range(calls):
+            completions.completion, scale_min, scale_max = LATENCY_COMPLETIONS[i % len(LATENCY_COMPLETIONS)]
+            started = time.perf_counter()
+            parsed.append(survey_runner.call_openai("Question", scale_min=scale_min, scale_max=scale_max))
+            latencies.append(time.perf_counter() - started)
+        answers[label] = parsed
+        # Tokens billed per call, or chunks read before early stop when streaming
+        size_name = "completion_chunks" if stream else "completion_tokens"
+        sizes = telemetry.samples.get(size_name) or [np.nan]
+        print(f"  {label}: mean {np.mean(latencies) * 1000:.0f} ms, "
+              f"p95 {np.percentile(latencies, 95) * 1000:.0f} ms per call, "
+              f"{np.mean(sizes):.1f} {size_name.split('_')[1]} per call")
+    print(f"  same answers in every mode: {all(a == answers['default'] for a in answers.values())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result processing on synthetic data")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Rows in the synthetic CSV")
+    parser.add_argument("--languages", type=int, default=60, help="Number of synthetic languages")
+    parser.add_argument("--survey-id", default=DEFAULT_SURVEY, help="Survey whose questions are used")
+    parser.add_argument("--reference", action="store_true",
+                        help="Also run the replaced implementations and check outputs match")
+    parser.add_argument("--statistics-workers", type=int, default=1,
+                        help="Also time the streaming path aggregated by this many worker processes")
+    parser.add_argument("--keep", help="Write the synthetic CSV here instead of a temporary file")
+    parser.add_argument("--latency", action="store_true",
+                        help="Benchmark survey call response modes instead of result processing")
+    parser.add_argument("--calls", type=int, default=40, help="Survey calls per response mode (--latency)")
+    parser.add_argument("--token-delay", type=float, default=0.02,
+                        help="Stand-in seconds per completion token (--latency)")
+    parser.add_argument("--first-token-delay", type=float, default=0.15,
+                        help="Stand-in seconds before the first token (--latency)")
+    args = parser.parse_args()
+
+    if args.latency:
+        print(f"Survey calls per response mode: {args.calls} "
+              f"(first token {args.first_token_delay * 1000:.0f} ms, then {args.token_delay * 1000:.0f} ms per token)")
+        benchmark_latency(args.calls, args.first_token_delay, args.token_delay)
+        return
+
+    questions = survey_registry.questions(args.survey_id)
+    path = args.keep or os.path.join(tempfile.mkdtemp(), "data_synthetic.csv")
+    print(f"Generating {args.rows:,} rows ({args.languages} languages x {len(questions)} questions)...")
+    _timed("generate", make_synthetic_data, path, args.rows, questions, args.languages)
+
+    df = _timed("read_csv", pd.read_csv, path)
+    df['Response'] = pd.to_numeric(df['Response'], errors='coerce')
+    df['LLM_Verification_Score'] = pd.to_numeric(df['LLM_Verification_Score'], errors='coerce')
+
+    print("evaluate_language_quality:")
+    quality = _timed("grouped", evaluate_language_quality, df, len(questions), questions)
+    if args.reference:
+        expected = _timed("reference loop", reference_language_quality, df, len(questions), questions)
+        print(f"  identical: {repr(quality) == repr(expected)}")
+
+    print("summarize_responses (quality + per-cell statistics):")
+    results, quality, valid_languages = _timed("grouped", summarize_responses, df, questions)
+    if args.reference:
+        expected = _timed("reference loop", reference_question_results, df, questions, quality, valid_languages)
+        print(f"  identical: {repr(results) == repr(expected)}")
+
+    print("summarize_data_file (chunked streaming read, statistics columns only):")
+    streamed, _, streamed_languages = _timed("streaming", summarize_data_file, path, questions, True)
+    same_cells = (
+        streamed_languages == valid_languages and
+        [(r['question_id'], {lang: s['count'] for lang, s in r['language_stats'].items()}) for r in streamed] ==
+        [(r['question_id'], {lang: s['count'] for lang, s in r['language_stats'].items()}) for r in results]
+    )
+    max_std_diff = max(
+        (abs(s['std'] - r['language_stats'][lang]['std'])
+         for q, r in zip(streamed, results) for lang, s in q['language_stats'].items()),
+        default=0.0
+    )
+    print(f"  same cells and counts: {same_cells}, max std difference: {max_std_diff:.2e}")
+    if args.statistics_workers > 1:
+        parallel = _timed(f"{args.statistics_workers} workers ({os.cpu_count()} CPUs)", summarize_data_file,
+                          path, questions, True, args.statistics_workers)
+        print(f"  identical to streaming: {repr(parallel[0]) == repr(streamed)}")
+
+    if not args.keep:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
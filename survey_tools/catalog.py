@@ -0,0 +1,174 @@
+"""
+Survey catalog.
+
+data/catalog.json lists every survey, its models (data_<model> directories)
+and their results files, with each file's timestamp, valid languages,
+question count and fingerprint (size, sha256). Result processing
+refreshes it after writing results, re-reading only files whose content
+changed, and the dashboard fills its survey, model and language selectors
+from this one file instead of walking data/ and opening every results file.
+Fingerprints leave out mtime, so a fresh checkout or copy of unchanged files
+does not rewrite the catalog. Used by the pipeline and the dashboard alike,
+so it depends only on the standard library.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from .survey_registry import DEFAULT_SURVEY_DIR, registry as survey_registry
+from .processing_manifest import file_sha256
+from .results_format import RESULTS_FORMAT_VERSION, normalize_results, shard_directory
+
+CATALOG_FILENAME = "catalog.json"
+# 2: fingerprints are size and sha256 only (no mtime)
+CATALOG_VERSION = 2
+
+
+def catalog_path(data_dir: str = DEFAULT_SURVEY_DIR) -> str:
+    return os.path.join(data_dir, CATALOG_FILENAME)
+
+
+def _results_entry(path: str, previous: Optional[Dict], fingerprint: bool = True) -> Dict:
+    """
+    Catalog entry of one results file, reused from `previous` if the file's
+    size and content hash are unchanged. Without `fingerprint` the file is
+    not hashed and the entry's sha256 is None.
+    """
+    size = os.path.getsize(path)
+    sha256 = file_sha256(path) if fingerprint else None
+    if previous and sha256 is not None and previous.get("size") == size and previous.get("sha256") == sha256:
+        return previous
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    results, quality_metrics = normalize_results(data)
+    name = os.path.basename(path)
+    return {
+        "file": name,
+        "timestamp": name[len("results_"):-len(".json")],
+        "format": RESULTS_FORMAT_VERSION if isinstance(data, dict) and "format_version" in data else 1,
+        "questions": len(results),
+        "total_questions": quality_metrics.get("total_questions", len(results)),
+        "valid_languages": sorted(quality_metrics.get("valid_languages", [])),
+        "sharded": os.path.isdir(shard_directory(path)),
+        "sidecar": os.path.exists(os.path.splitext(path)[0] + ".npz"),
+        "size": size,
+        "sha256": sha256
+    }
+
+
+def build_catalog(data_dir: str = DEFAULT_SURVEY_DIR, previous: Optional[Dict] = None,
+                  fingerprint: bool = True) -> Dict:
+    """
+    Catalog of every survey under `data_dir` with at least one model
+    directory holding results files. Entries of unchanged files are taken
+    from `previous`. With fingerprint=False files are not hashed (for a
+    catalog that is only used in memory, not written).
+    """
+    previous_files = {}
+    for survey in (previous or {}).get("surveys", []):
+        for model in survey.get("models", []):
+            for entry in model.get("results", []):
+                previous_files[(survey["survey_id"], model["model_dir"], entry["file"])] = entry
+
+    surveys = []
+    for survey_id in sorted(os.listdir(data_dir)) if os.path.isdir(data_dir) else []:
+        survey_dir = os.path.join(data_dir, survey_id)
+        if not os.path.isdir(survey_dir):
+            continue
+        models = []
+        for model_dir in sorted(os.listdir(survey_dir)):
+            model_path = os.path.join(survey_dir, model_dir)
+            if not (model_dir.startswith("data_") and os.path.isdir(model_path)):
+                continue
+            files = sorted(
+                name for name in os.listdir(model_path)
+                if name.startswith("results_") and name.endswith(".json")
+            )
+            if not files:
+                continue
+            results = [
+                _results_entry(os.path.join(model_path, name), previous_files.get((survey_id, model_dir, name)),
+                               fingerprint)
+                for name in files
+            ]
+            models.append({
+                "model_dir": model_dir,
+                "model": model_dir[len("data_"):],
+                "latest": max(entry["timestamp"] for entry in results),
+                "valid_languages": sorted({lang for entry in results for lang in entry["valid_languages"]}),
+                "results": results
+            })
+        if not models:
+            continue
+        try:
+            definition = survey_registry.get(survey_id) if data_dir == survey_registry.survey_dir else None
+        except (OSError, ValueError):
+            definition = None
+        surveys.append({
+            "survey_id": survey_id,
+            "name": definition.info["name"] if definition else "",
+            "question_count": len(definition.questions) if definition else None,
+            "models": models
+        })
+    return {"catalog_version": CATALOG_VERSION, "surveys": surveys}
+
+
+def update_catalog(data_dir: str = DEFAULT_SURVEY_DIR) -> str:
+    """Rebuild data/catalog.json, writing it (atomically) only if it changed."""
+    path = catalog_path(data_dir)
+    previous = None
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            previous = None
+        if previous and previous.get("catalog_version") != CATALOG_VERSION:
+            previous = None
+
+    catalog = build_catalog(data_dir, previous)
+    if previous is not None and previous.get("surveys") == catalog["surveys"]:
+        return path
+    catalog["generated"] = datetime.now().isoformat(timespec="seconds")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+class SurveyCatalog:
+    """Cached view of data/catalog.json, re-read only when the file changes."""
+
+    def __init__(self, data_dir: str = DEFAULT_SURVEY_DIR):
+        self.path = catalog_path(data_dir)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._catalog: Optional[Dict] = None
+
+    def get(self) -> Optional[Dict]:
+        """The catalog, or None if there is none (or it is unreadable)."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        with self._lock:
+            if self._catalog is not None and self._mtime == mtime:
+                return self._catalog
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if catalog.get("catalog_version") != CATALOG_VERSION:
+            return None
+        with self._lock:
+            self._catalog, self._mtime = catalog, mtime
+        return catalog
+
+
+# Shared instance for the dashboard
+survey_catalog = SurveyCatalog()
@@ -16,6 +16,17 @@ SURVEYS_DIR = f"data/{SURVEY_NAME}"
 DATA_DIR = f"data/{SURVEY_NAME}"
 PROCESSED_DIR = "processed"
 
+# Result processing: data files at least this large are read in chunks of
+# STREAMING_CHUNK_ROWS rows (statistics columns only) instead of all at once
+STREAMING_MIN_FILE_BYTES = 256 * 1024 * 1024
+STREAMING_CHUNK_ROWS = 500_000
+
+# Results file format written by result processing: 1 (indented, one entry
+# per question) or 2 (compact table, see results_format), optionally with one
+# shard file per question
+RESULTS_FORMAT = 1
+SHARD_RESULTS = False
+
 # Response validation
 MIN_RESPONSE_LENGTH = 1
 MAX_RESPONSE_LENGTH = 1000
@@ -0,0 +1,297 @@
+"""
+Parameter-sweep experiments.
+
+Runs a survey over a grid of (model, temperature, system prompt variant)
+in a single worker pool. Each (language, question) is translated once and
+shared by every variant; languages are translated in their own pool and a
+language's survey calls start as soon as its translations are ready. Each
+row is tagged with its variant so the result processor can write
+per-variant results files.
+
+A grid file is JSON, for example:
+
+    {
+      "models": ["gpt-4o", "gpt-3.5-turbo"],
+      "temperatures": [0, 0.7, 1.0],
+      "system_prompts": {
+        "default": null,
+        "neutral": "Answer the survey question with a single number on the scale given."
+      }
+    }
+
+A null system prompt uses the runner's default SYSTEM_PROMPT.
+"""
+
+import datetime
+import itertools
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+import config
+from .translator import translate_questions
+from .survey_runner import call_openai, SYSTEM_PROMPT
+from .hedging import HedgePolicy
+from .telemetry import telemetry
+from .translation_memory import get_translation_memory
+from .response_parser import PARSER_VERSION
+from .raw_store import write_raw_completions
+from .translation_bundle import bundle_translations
+from .quality_gate import apply_quality_gate
+
+
+def load_experiment_grid(grid_file):
+    """Load and validate an experiment grid definition."""
+    with open(grid_file, "r", encoding="utf-8") as f:
+        grid = json.load(f)
+
+    models = grid.get("models") or [config.MODEL_NAME]
+    temperatures = grid.get("temperatures") or [0.7]
+    system_prompts = grid.get("system_prompts") or {"default": None}
+    if not isinstance(system_prompts, dict):
+        raise ValueError("'system_prompts' must map variant names to prompts")
+
+    return {"models": models, "temperatures": temperatures, "system_prompts": system_prompts}
+
+
+def build_variants(grid):
+    """
+    Expand a grid into a list of variant dicts with filesystem-safe IDs.
+    Variants whose names only differ in characters replaced by "_" (e.g.
+    prompts "a b" and "a/b") get a numeric suffix, so IDs stay unique.
+    """
+    variants = []
+    seen = set()
+    for model, temperature, prompt_name in itertools.product(
+        grid["models"], grid["temperatures"], grid["system_prompts"]
+    ):
+        base_id = re.sub(r"[^\w.-]", "_", f"{model}__t{temperature:g}__{prompt_name}")
+        variant_id, suffix = base_id, 1
+        while variant_id in seen:
+            suffix += 1
+            variant_id = f"{base_id}_{suffix}"
+        seen.add(variant_id)
+        variants.append({
+            "id": variant_id,
+            "model": model,
+            "temperature": float(temperature),
+            "system_prompt_name": prompt_name,
+            "system_prompt": grid["system_prompts"][prompt_name] or SYSTEM_PROMPT
+        })
+    return variants
+
+
+def translate_language(questions, language, use_translation=True, bundled=None):
+    """
+    Translate one language's questions once for all variants, or take them
+    from bundle_translations output.
+    Returns:
+        Dict mapping question_id to (translated_prompt, back_translation,
+        verification_score) strings, or None if the quality gate excludes
+        the language.
+    """
+    if language.lower() == "english" or not use_translation:
+        return {q["question_id"]: (q["prompt_text"], "[N/A - English]", "N/A") for q in questions}
+    if bundled is not None:
+        language_translations = {q["question_id"]: bundled[(language, q["question_id"])] for q in questions}
+    else:
+        language_translations = translate_questions(questions, language)
+    language_translations, passed = apply_quality_gate(
+        language, questions, language_translations, allow_retranslate=bundled is None
+    )
+    if not passed:
+        return None
+    return {
+        question_id: (translated, back_translation, str(score) if score is not None else "N/A")
+        for question_id, (translated, back_translation, score) in language_translations.items()
+    }
+
+
+def run_experiment(survey_id, questions, grid, num_trials, languages, translation_settings=None,
+                   translation_bundle=None):
+    """
+    Run all grid variants for a survey in one scheduled pool.
+    Args:
+        survey_id: ID of the survey (used for the output directory)
+        questions: Survey questions from questions.json
+        grid: Grid definition from load_experiment_grid
+        num_trials: Number of trials per (variant, language, question)
+        languages: Languages to survey
+        translation_settings: Survey translation settings
+        translation_bundle: Pre-built translation bundle (optional)
+    Returns:
+        Path to the experiment data CSV.
+    """
+    use_translation = (translation_settings or {}).get("use_translation", config.USE_TRANSLATION)
+    variants = build_variants(grid)
+    total_calls = len(variants) * len(languages) * len(questions) * num_trials
+
+    print(f"Experiment grid: {len(variants)} variants")
+    for variant in variants:
+        print(f"  {variant['id']}")
+    print(f"--- Total Estimated API Calls for Responses: {total_calls} ---")
+
+    # Fail before any calls if the bundle doesn't cover the experiment
+    bundled = None
+    if translation_bundle is not None and use_translation:
+        bundled = bundle_translations(translation_bundle, questions, languages)
+
+    # One policy per model: latencies differ too much between models to share a percentile
+    hedge_policies = {}
+    if config.HEDGE_REQUESTS:
+        hedge_policies = {
+            model: HedgePolicy(
+                percentile=config.HEDGE_PERCENTILE,
+                max_hedge_fraction=config.HEDGE_MAX_FRACTION,
+                min_samples=config.HEDGE_MIN_SAMPLES,
+                max_workers=2 * config.MAX_WORKERS
+            )
+            for model in {variant["model"] for variant in variants}
+        }
+
+    # Work items are interleaved across variants so every variant progresses together
+    work = [
+        (variant, language, q, trial)
+        for language in languages
+        for q in questions
+        for trial in range(1, num_trials + 1)
+        for variant in variants
+    ]
+    work_by_language = {language: [] for language in languages}
+    for index, (_, language, _, _) in enumerate(work):
+        work_by_language[language].append(index)
+    translations = {}
+
+    def run_item(variant, language, q, trial):
+        translated, _, _ = translations[(language, q["question_id"])]
+        number, text, finish_reason = call_openai(
+            translated, variant["model"], hedge_policy=hedge_policies.get(variant["model"]),
+            scale_min=q.get("scale_min"), scale_max=q.get("scale_max"),
+            return_raw=True, temperature=variant["temperature"],
+            system_prompt=variant["system_prompt"]
+        )
+        time.sleep(config.API_DELAY)
+        return number, text, finish_reason
+
+    print(f"\nTranslating prompts (shared by all variants) while running survey calls "
+          f"with {config.MAX_WORKERS} workers...")
+    outcomes = [None] * len(work)
+    excluded = []
+    completed = 0
+    error = None
+    with ThreadPoolExecutor(max_workers=config.MAX_WORKERS, thread_name_prefix="translate") as translators, \
+            ThreadPoolExecutor(max_workers=config.MAX_WORKERS, thread_name_prefix="survey") as executor:
+        pending = {
+            translators.submit(translate_language, questions, language, use_translation, bundled): language
+            for language in languages
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Stop starting work on the first error; finished calls are saved below
+                    if error is None:
+                        error = e
+                        for other in pending:
+                            other.cancel()
+                    continue
+                if isinstance(key, str):  # A language's translations
+                    if result is None:
+                        excluded.append(key)
+                        continue
+                    for question_id, translation in result.items():
+                        translations[(key, question_id)] = translation
+                    if error is None:
+                        for index in work_by_language[key]:
+                            pending[executor.submit(run_item, *work[index])] = index
+                    continue
+                outcomes[key] = result
+                completed += 1
+                if completed % 100 == 0:
+                    print(f"  {completed} calls done")
+
+    for hedge_policy in hedge_policies.values():
+        hedge_policy.shutdown()
+    results, raw_completions = experiment_rows(work, outcomes, translations)
+    if error is not None:
+        # Keep the grid calls that finished before the failure, then re-raise
+        if results:
+            output_filename = save_experiment_file(survey_id, results, raw_completions)
+            print(f"Experiment stopped on an error; saved {len(results)} completed calls to {output_filename}")
+        raise error
+    print(f"  {completed} survey calls done")
+    if excluded:
+        skipped = len(excluded) * len(variants) * len(questions) * num_trials
+        telemetry.increment("quality_gate_skipped_calls", skipped)
+        print(f"Quality gate excluded {', '.join(excluded)}: skipped {skipped} of {total_calls} survey calls")
+
+    memory = get_translation_memory()
+    if memory is not None:
+        memory.save()
+    telemetry_lines = telemetry.summary()
+    if telemetry_lines:
+        print("Run telemetry:")
+        for line in telemetry_lines:
+            print(f"  {line}")
+
+    return save_experiment_file(survey_id, results, raw_completions)
+
+
+def experiment_rows(work, outcomes, translations):
+    """
+    Build the data rows and raw completions of the finished work items;
+    items without an outcome (excluded or not run) are left out.
+    """
+    results = []
+    raw_completions = []
+    for (variant, language, q, trial), outcome in zip(work, outcomes):
+        if outcome is None:  # Language excluded by the quality gate, or not run
+            continue
+        number, text, finish_reason = outcome
+        translated, back_translation, score = translations[(language, q["question_id"])]
+        is_english = language.lower() == "english"
+        results.append({
+            "Variant": variant["id"],
+            "Model": variant["model"],
+            "Temperature": variant["temperature"],
+            "System_Prompt": variant["system_prompt_name"],
+            "Language": language,
+            "Question_ID": q["question_id"],
+            "Trial_Number": trial,
+            "Response": number,
+            "Original_Prompt": q["prompt_text"],
+            "Translated_Prompt": "[N/A - English]" if is_english else translated,
+            "Back_Translation": back_translation,
+            "LLM_Verification_Score": score,
+            "Parser_Version": PARSER_VERSION
+        })
+        raw_completions.append({
+            "variant": variant["id"],
+            "language": language,
+            "question_id": q["question_id"],
+            "trial": trial,
+            "text": text,
+            "finish_reason": finish_reason
+        })
+    return results, raw_completions
+
+
+def save_experiment_file(survey_id, results, raw_completions):
+    """Write experiment rows to a timestamped CSV with its raw completions sidecar."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = os.path.join("data", survey_id, "experiments")
+    os.makedirs(output_dir, exist_ok=True)
+    output_filename = os.path.join(output_dir, f"experiment_{timestamp}.csv")
+    pd.DataFrame(results).to_csv(output_filename, index=False)
+    write_raw_completions(output_filename, raw_completions)
+
+    return output_filename
@@ -0,0 +1,118 @@
+"""
+Hedged requests for survey API calls.
+
+A small fraction of chat completions take many times the median latency.
+When hedging is enabled, a request that is still outstanding after the
+observed p95 latency is duplicated and whichever copy answers first wins.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional, TypeVar
+
+from .telemetry import telemetry
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """Decides when to hedge a request and runs the primary/hedge race.
+
+    Args:
+        percentile: Latency percentile after which a hedge is issued
+        max_hedge_fraction: Maximum share of calls that may be hedged (0.05 = 5%)
+        min_samples: Number of observed latencies required before hedging starts
+        window: Number of recent latencies used to estimate the percentile
+        max_workers: Size of the thread pool running primaries and hedges.
+            A losing request that cannot be cancelled keeps its thread until
+            it returns, so this should be at least twice the number of
+            threads calling run(), or hedges queue behind abandoned calls.
+    """
+
+    def __init__(self, percentile: float = 95, max_hedge_fraction: float = 0.05,
+                 min_samples: int = 20, window: int = 500, max_workers: int = 8):
+        self.percentile = percentile
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="hedge")
+
+    def record_latency(self, seconds: float) -> None:
+        """Add an observed request latency to the rolling window."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Current hedge delay in seconds, or None until enough samples exist."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def _acquire_hedge(self) -> bool:
+        """Reserve a hedge if the traffic budget allows it."""
+        with self._lock:
+            if self._hedges + 1 > self.max_hedge_fraction * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    def run(self, request: Callable[[threading.Event], T]) -> T:
+        """Run `request`, hedging it once if it outlives the hedge delay.
+
+        `request` receives a threading.Event that is set once the race is
+        decided, so a streaming request can close its connection early.
+        The losing request is cancelled if it has not started yet; otherwise
+        it is signalled through the event and its result discarded.
+        Exceptions from one copy are only raised if the other copy fails too.
+        """
+        with self._lock:
+            self._calls += 1
+
+        delay = self.hedge_delay()
+        start = time.monotonic()
+        decided = threading.Event()
+        primary = self._executor.submit(request, decided)
+
+        def record_primary(future):
+            # Record the primary's latency even if a hedge wins, so slow
+            # requests keep informing the percentile estimate
+            if not future.cancelled() and future.exception() is None:
+                self.record_latency(time.monotonic() - start)
+
+        primary.add_done_callback(record_primary)
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._acquire_hedge():
+            return primary.result()
+
+        telemetry.increment("hedged_calls")
+        hedge = self._executor.submit(request, decided)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                decided.set()
+                for other in pending:
+                    other.cancel()
+                if future is hedge:
+                    telemetry.increment("hedge_wins")
+                return future.result()
+        raise error
+
+    def shutdown(self) -> None:
+        """Release the worker threads without waiting for abandoned requests."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,103 @@
+"""
+Dense matrix sidecars for results files.
+
+Next to each results_<timestamp>.json the processor writes
+results_<timestamp>.npz: languages x questions float32 arrays of the
+per-cell mean and std, an int32 array of counts (0 where a language has no
+reported cell), and the language, question ID and question title index
+vectors plus each question's scale, category and scale labels (as JSON
+text, since their shape varies between surveys). Views that need a whole matrix load it
+with one np.load and select languages by fancy indexing instead of walking
+the nested results dicts. Languages are in order of first appearance, as
+when the matrix is built from the results JSON.
+
+A sidecar records the size and sha256 of the results file it was written
+for and is only used while they still match, so a copied or restored
+results file never serves another file's means.
+
+The archive is uncompressed so loading is a plain read; np.load cannot
+memory-map arrays inside an .npz, so each array is read in full (a few
+kilobytes per run).
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .processing_manifest import file_sha256
+
+# 2: adds categories and scale_labels
+# 3: languages in first-appearance order; results file size and sha256
+SIDECAR_VERSION = 3
+
+
+def sidecar_path(results_file: str) -> str:
+    """Sidecar file of a results JSON file."""
+    return os.path.splitext(results_file)[0] + ".npz"
+
+
+def write_matrix_sidecar(results_file: str, results: List[Dict]) -> str:
+    """Write the dense sidecar for a results list and return its path."""
+    question_ids = [q["question_id"] for q in results]
+    # Languages with a mean, in the order the results JSON lists them
+    languages = list(dict.fromkeys(
+        lang for q in results for lang, stats in q["language_stats"].items() if stats.get("mean") is not None
+    ))
+    lang_index = {lang: i for i, lang in enumerate(languages)}
+
+    shape = (len(languages), len(question_ids))
+    mean = np.full(shape, np.nan, dtype=np.float32)
+    std = np.full(shape, np.nan, dtype=np.float32)
+    count = np.zeros(shape, dtype=np.int32)
+    for j, q in enumerate(results):
+        for lang, stats in q["language_stats"].items():
+            if lang not in lang_index:
+                continue
+            i = lang_index[lang]
+            mean[i, j] = stats["mean"]
+            std[i, j] = stats["std"]
+            count[i, j] = stats["count"]
+
+    path = sidecar_path(results_file)
+    tmp_path = path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        sidecar_version=np.array(SIDECAR_VERSION),
+        results_size=np.array(os.path.getsize(results_file), dtype=np.int64),
+        results_sha256=np.array(file_sha256(results_file)),
+        languages=np.array(languages, dtype=np.str_),
+        question_ids=np.array(question_ids, dtype=np.str_),
+        question_titles=np.array([q.get("title") or "" for q in results], dtype=np.str_),
+        scale_min=np.array([q["scale_min"] for q in results], dtype=np.int32),
+        scale_max=np.array([q["scale_max"] for q in results], dtype=np.int32),
+        categories=np.array([q.get("category") or "" for q in results], dtype=np.str_),
+        scale_labels=np.array([json.dumps(q.get("scale_labels") or {}, ensure_ascii=False) for q in results],
+                              dtype=np.str_),
+        mean=mean,
+        std=std,
+        count=count
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_matrix_sidecar(results_file: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Arrays of a results file's sidecar, or None if it has none, it has an
+    unknown version, or it was written for different results file contents.
+    """
+    path = sidecar_path(results_file)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    if int(arrays.get("sidecar_version", -1)) != SIDECAR_VERSION:
+        return None
+    # Size first, so most stale sidecars are rejected without hashing
+    if (int(arrays["results_size"]) != os.path.getsize(results_file)
+            or str(arrays["results_sha256"]) != file_sha256(results_file)):
+        return None
+    return arrays
+
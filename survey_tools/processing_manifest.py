@@ -0,0 +1,103 @@
+"""
+Processing manifest for incremental result processing.
+
+Each model directory keeps a processing_manifest.json recording, per data
+CSV, the file's size, mtime and content hash, the processor version, the
+quality thresholds and a hash of the survey's questions. A data file whose
+recorded fingerprint and settings still match, and whose results file still
+exists, does not need processing again.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+MANIFEST_FILENAME = "processing_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_hash(settings: Dict) -> str:
+    """Stable hash of JSON-serialisable processing settings."""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ProcessingManifest:
+    """Per-directory record of which data files have current results."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_FILENAME)
+        self.files: Dict[str, Dict] = {}
+        self._dirty = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("manifest_version") == MANIFEST_VERSION:
+                    self.files = manifest.get("files", {})
+            except (json.JSONDecodeError, OSError):
+                # A damaged manifest only costs a full reprocess
+                self.files = {}
+
+    def is_current(self, data_file: str, processor_version: int, settings: Dict) -> bool:
+        """
+        True if `data_file` was processed with the same version and settings,
+        is unchanged, and its results file exists. Size and mtime are checked
+        first; the content hash is only computed when they differ (e.g. after
+        a copy or touch), and a matching hash refreshes the stored stat.
+        """
+        entry = self.files.get(os.path.basename(data_file))
+        if entry is None:
+            return False
+        if entry.get("processor_version") != processor_version:
+            return False
+        if entry.get("settings_hash") != settings_hash(settings):
+            return False
+        if not os.path.exists(os.path.join(self.directory, entry.get("results_file", ""))):
+            return False
+
+        stat = os.stat(data_file)
+        if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+            return True
+        if entry.get("size") != stat.st_size or entry.get("sha256") != file_sha256(data_file):
+            return False
+        entry["mtime"] = stat.st_mtime
+        self._dirty = True
+        return True
+
+    def record(self, data_file: str, results_file: str, processor_version: int,
+               settings: Dict, sha256: Optional[str] = None) -> None:
+        """Record that `data_file` has been processed into `results_file`."""
+        stat = os.stat(data_file)
+        self.files[os.path.basename(data_file)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": sha256 or file_sha256(data_file),
+            "results_file": os.path.basename(results_file),
+            "processor_version": processor_version,
+            "settings_hash": settings_hash(settings),
+            "settings": settings,
+            "processed": datetime.now().isoformat(timespec="seconds")
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything changed."""
+        if not self._dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"manifest_version": MANIFEST_VERSION, "files": self.files}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,69 @@
+"""
+Translation quality gate.
+
+Result processing drops non-English languages whose average verification
+score is below the threshold, but only after their survey calls are spent.
+The gate applies the same test per language as soon as its translations are
+ready, so failing languages are retranslated or excluded before surveying.
+"""
+
+import config
+from .config import VERIFICATION_THRESHOLD
+from .translator import translate_prompt
+from .telemetry import telemetry
+
+
+def average_verification_score(translations):
+    """
+    Mean verification score of a language's translations, matching
+    evaluate_language_quality: missing scores are ignored and a language
+    with no scores at all averages 0.0.
+    """
+    scores = [score for _, _, score in translations.values() if score is not None]
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+def apply_quality_gate(language, questions, translations, allow_retranslate=True):
+    """
+    Check a language's translations against VERIFICATION_THRESHOLD.
+    Args:
+        language: Target language
+        questions: Survey questions
+        translations: question_id -> (translated, back_translation, score)
+        allow_retranslate: Whether failing questions may be translated again
+                           (False when translations come from a bundle)
+    Returns:
+        (translations, passed): translations possibly updated by retranslation,
+        and whether the language should be surveyed.
+    """
+    if config.QUALITY_GATE == "off":
+        return translations, True
+
+    average = average_verification_score(translations)
+    if average >= VERIFICATION_THRESHOLD:
+        return translations, True
+    print(f"\n  Quality gate: {language} average verification {average:.2f} "
+          f"is below {VERIFICATION_THRESHOLD:.1f}")
+
+    if config.QUALITY_GATE == "retranslate" and allow_retranslate:
+        translations = dict(translations)
+        failing = [
+            q for q in questions
+            if translations[q["question_id"]][2] is None
+            or translations[q["question_id"]][2] < VERIFICATION_THRESHOLD
+        ]
+        print(f"  Retranslating {len(failing)} question(s) with the strict instruction...")
+        for q in failing:
+            retranslated = translate_prompt(q["prompt_text"], language, strict=True)
+            previous_score = translations[q["question_id"]][2]
+            if retranslated[2] is not None and (previous_score is None or retranslated[2] > previous_score):
+                translations[q["question_id"]] = retranslated
+        telemetry.increment("quality_gate_retranslations", len(failing))
+        average = average_verification_score(translations)
+        if average >= VERIFICATION_THRESHOLD:
+            print(f"  Quality gate: {language} passes after retranslation ({average:.2f})")
+            return translations, True
+
+    print(f"  Quality gate: excluding {language} ({average:.2f} < {VERIFICATION_THRESHOLD:.1f})")
+    telemetry.increment("quality_gate_excluded_languages")
+    return translations, False
@@ -0,0 +1,107 @@
+"""
+Raw completion storage and offline re-parsing.
+
+Every survey call's raw completion text and finish reason are stored in a
+gzip-compressed JSON-lines sidecar next to the data CSV, one record per CSV
+row. `reparse_data_file` rebuilds the CSV's Response column from that text
+with any parser version, without calling the API again.
+"""
+
+import gzip
+import json
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .response_parser import parse_response, PARSER_VERSION
+
+RAW_SIDECAR_SUFFIX = ".raw.jsonl.gz"
+
+
+def sidecar_path(data_file: str) -> str:
+    """Path of the raw completion sidecar for a data CSV."""
+    base, _ = os.path.splitext(data_file)
+    return base + RAW_SIDECAR_SUFFIX
+
+
+def write_raw_completions(data_file: str, records: List[Dict]) -> str:
+    """
+    Write raw completion records for a data CSV.
+    Args:
+        data_file: Path of the CSV the records belong to
+        records: One dict per CSV row, in row order, with at least
+                 'text' and 'finish_reason'
+    Returns:
+        Path of the sidecar file.
+    """
+    path = sidecar_path(data_file)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for row, record in enumerate(records):
+            f.write(json.dumps({"row": row, **record}, ensure_ascii=False) + "\n")
+    return path
+
+
+def read_raw_completions(data_file: str) -> Dict[int, Dict]:
+    """Load the sidecar for a data CSV as {row: record}; empty if missing."""
+    path = sidecar_path(data_file)
+    if not os.path.exists(path):
+        return {}
+    records = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[record["row"]] = record
+    return records
+
+
+def reparse_data_file(data_file: str, questions: List[Dict],
+                      parser_version: Optional[int] = None) -> Dict[str, int]:
+    """
+    Rebuild the Response column of a data CSV from its stored raw completions.
+    Rows without a stored completion keep their existing Response.
+    Args:
+        data_file: Path to the data CSV
+        questions: Survey questions (for scale_min/scale_max per question)
+        parser_version: Parser version to apply (defaults to the current one)
+    Returns:
+        Counts of rows reparsed, changed and missing raw text.
+    """
+    parser_version = parser_version or PARSER_VERSION
+    records = read_raw_completions(data_file)
+    if not records:
+        raise FileNotFoundError(f"No raw completions stored for {data_file}")
+
+    scales = {q["question_id"]: (q.get("scale_min"), q.get("scale_max")) for q in questions}
+
+    # Read everything as text so untouched columns are written back unchanged
+    df = pd.read_csv(data_file, dtype=str, keep_default_na=False)
+
+    responses = df["Response"].tolist()
+    if "Parser_Version" in df.columns:
+        versions = df["Parser_Version"].tolist()
+    else:
+        versions = [""] * len(df)
+    stats = {"reparsed": 0, "changed": 0, "missing": 0}
+    for row, question_id in enumerate(df["Question_ID"]):
+        record = records.get(row)
+        if record is None or record.get("question_id", question_id) != question_id:
+            stats["missing"] += 1
+            continue
+        scale_min, scale_max = scales.get(question_id, (None, None))
+        value = parse_response(record.get("text"), scale_min, scale_max, version=parser_version)
+        new_response = "" if value is None else repr(value)
+        if new_response != responses[row]:
+            stats["changed"] += 1
+        responses[row] = new_response
+        versions[row] = str(parser_version)
+        stats["reparsed"] += 1
+
+    df["Response"] = responses
+    df["Parser_Version"] = versions
+
+    tmp_file = data_file + ".tmp"
+    df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, data_file)
+    return stats
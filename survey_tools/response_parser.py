@@ -0,0 +1,233 @@
+"""
+Numeric response parsing for survey completions.
+Parsers are versioned so stored raw completions can be re-parsed later.
+"""
+
+import re
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Version used for new survey runs and by default when re-parsing
+PARSER_VERSION = 2
+
+NUMBER_PATTERN = re.compile(r"[-+]?\d*\.\d+|\d+")
+
+# --- Parser v2 tables, built once at import ---
+
+# Every Unicode decimal digit in the BMP (Arabic-Indic, Persian, Devanagari,
+# Bengali, Thai, fullwidth, ...) mapped to its ASCII digit
+_DIGIT_TABLE = {
+    cp: str(unicodedata.decimal(chr(cp)))
+    for cp in range(0x10000)
+    if unicodedata.category(chr(cp)) == "Nd"
+}
+_DIGIT_TABLE.update({
+    ord("\u066b"): ".",  # Arabic decimal separator
+    ord("\uff0e"): ".",  # Fullwidth full stop
+    ord("\uff0f"): "/",  # Fullwidth solidus
+    ord("\uff0d"): "-",  # Fullwidth hyphen-minus
+    ord("\u2212"): "-",  # Minus sign
+    ord("\uff0b"): "+",  # Fullwidth plus
+})
+
+_CJK_DIGITS = {"零": 0, "〇": 0, "一": 1, "二": 2, "两": 2, "兩": 2, "三": 3, "四": 4,
+               "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+# CJK numeral runs, skipping common words that merely contain 一 ("generally", "some", ...)
+# and 十分 before another ideograph, the intensifier "very" (十分同意) rather
+# than "ten points" (十分。)
+_CJK_NUMBER_PATTERN = re.compile(
+    r"(?:[零〇二两兩三四五六七八九百]|十(?!分[\u4e00-\u9fff])|一(?![般些样樣定直致点點切起]))+"
+)
+
+# A sign only counts when it is not a range dash ("1-10")
+_SIGNED_NUMBER_PATTERN = re.compile(r"(?:(?<![\w.])[-+])?(?:\d*\.\d+|\d+)")
+
+# "7 out of 10", "7/10", "7 sur 10", "7 von 10", "7 de 10", "7 из 10", ...
+# The words must be whole words ("7 de 10", not "7 desde10")
+_OUT_OF_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(?:/|\b(?:out\s+of|of|sur|von|de|su|op|из|dari|trên)\b)\s*(\d+)",
+    re.IGNORECASE
+)
+
+# A scale endpoint followed by its label ("1. Never justifiable", "10 = always",
+# "1 (never)"): a restated anchor rather than the answer
+_ANCHOR_LABEL_PATTERN = re.compile(r"\s*(?:[.):=]|-\s|\()\s*[^\W\d_]")
+
+# Maximum text between the two endpoints of a restated scale ("1 to 10", "1-10")
+_MAX_RANGE_GAP = 16
+
+
+def parse_v1(text: str, scale_min=None, scale_max=None) -> Optional[float]:
+    """Original parser: the first decimal or integer found in the text."""
+    match = NUMBER_PATTERN.search(text)
+    if match:
+        return float(match.group())
+    return None
+
+
+def _cjk_to_int(numeral: str) -> int:
+    """Convert a CJK numeral such as 七, 十, 十二 or 二十 to an integer."""
+    total, current = 0, 0
+    for char in numeral:
+        if char in _CJK_DIGITS:
+            current = _CJK_DIGITS[char]
+        elif char == "十":
+            total += (current or 1) * 10
+            current = 0
+        elif char == "百":
+            total += (current or 1) * 100
+            current = 0
+    return total + current
+
+
+def normalize_digits(text: str) -> str:
+    """Map Unicode digits to ASCII and, if no digits remain, CJK numerals too."""
+    text = text.translate(_DIGIT_TABLE)
+    if not any(char.isdigit() for char in text):
+        text = _CJK_NUMBER_PATTERN.sub(lambda m: str(_cjk_to_int(m.group())), text)
+    return text
+
+
+def _has_unicode_digits(text: str) -> bool:
+    """True if the text has digits of any script (so CJK numerals are not read)."""
+    return any(char.isdigit() for char in text.translate(_DIGIT_TABLE))
+
+
+def _find_numbers(text: str) -> List[Tuple[float, int, int]]:
+    """All numbers in normalised text as (value, start, end)."""
+    return [(float(m.group()), m.start(), m.end()) for m in _SIGNED_NUMBER_PATTERN.finditer(text)]
+
+
+def _restated_scale(numbers: List[Tuple[float, int, int]], scale_min: float, scale_max: float) -> set:
+    """Indices of numbers that restate the scale's endpoints ("1 to 10", "1-10")."""
+    skipped = set()
+    for i in range(len(numbers) - 1):
+        (low, _, low_end), (high, high_start, _) = numbers[i], numbers[i + 1]
+        if low == scale_min and high == scale_max and high_start - low_end <= _MAX_RANGE_GAP:
+            skipped.update((i, i + 1))
+    return skipped
+
+
+def _anchor_labels(text: str, numbers: List[Tuple[float, int, int]],
+                   scale_min: float, scale_max: float) -> set:
+    """Indices of scale endpoints followed by their label ("1. Never justifiable")."""
+    return {
+        i for i, (value, _, end) in enumerate(numbers)
+        if value in (scale_min, scale_max) and _ANCHOR_LABEL_PATTERN.match(text, end)
+    }
+
+
+def _scale_candidates(text: str, numbers: List[Tuple[float, int, int]],
+                      scale_min: float, scale_max: float) -> List[int]:
+    """
+    Indices of the numbers that may be the answer, in order: restated scales
+    are dropped, and labelled endpoints only count if nothing else is left.
+    """
+    skipped = _restated_scale(numbers, scale_min, scale_max)
+    remaining = [i for i in range(len(numbers)) if i not in skipped]
+    labelled = _anchor_labels(text, numbers, scale_min, scale_max)
+    unlabelled = [i for i in remaining if i not in labelled and scale_min <= numbers[i][0] <= scale_max]
+    return [i for i in remaining if i not in labelled] if unlabelled else remaining
+
+
+def parse_v2(text: str, scale_min=None, scale_max=None) -> Optional[float]:
+    """
+    Multilingual, scale-aware parser.
+    Normalises Unicode and CJK digits, understands "N out of M" forms and
+    ignores restatements of the scale itself ("on a scale of 1 to 10") and
+    restated endpoint labels ("1. Never justifiable... I pick 3") when a
+    later in-range number answers. Out-of-range CJK numerals give no answer.
+    Without a scale it returns the first number, like v1.
+    """
+    cjk = not _has_unicode_digits(text)
+    text = normalize_digits(text)
+    numbers = _find_numbers(text)
+    if not numbers:
+        return None
+    if scale_min is None or scale_max is None:
+        return numbers[0][0]
+    scale_min, scale_max = float(scale_min), float(scale_max)
+
+    for match in _OUT_OF_PATTERN.finditer(text):
+        numerator, denominator = float(match.group(1)), float(match.group(2))
+        if denominator == scale_max and scale_min <= numerator <= scale_max:
+            return numerator
+
+    candidates = _scale_candidates(text, numbers, scale_min, scale_max)
+    if not candidates:
+        return None
+    for i in candidates:
+        if scale_min <= numbers[i][0] <= scale_max:
+            return numbers[i][0]
+    # Out-of-range answers are kept so result processing can filter them,
+    # except CJK numerals, where they are far more often words than answers
+    return None if cjk else numbers[candidates[0]][0]
+
+
+def settled_answer(text: str, scale_min=None, scale_max=None) -> Optional[float]:
+    """
+    The answer parse_v2 gives for a streamed prefix, once more text can no
+    longer change it; None while it is undecided. A trailing number that may
+    still grow ("1", "7.") does not count yet, out-of-range numbers and
+    labelled endpoints ("1. Never justifiable") never settle, and a number
+    equal to scale_min only settles once it is followed by more text than a
+    restated scale ("1 to 10") would need, so "On a scale of 1 to 10, I'd
+    say 7" settles on 7, not 1.
+    """
+    text = normalize_digits(text)
+    numbers = _find_numbers(text)
+    if numbers:
+        _, start, end = numbers[-1]
+        rest = text[end:]
+        if not rest or (rest == "." and "." not in text[start:end]):
+            numbers = numbers[:-1]
+    if not numbers:
+        return None
+    if scale_min is None or scale_max is None:
+        return numbers[0][0]
+    scale_min, scale_max = float(scale_min), float(scale_max)
+
+    complete = text[:numbers[-1][2]]
+    for match in _OUT_OF_PATTERN.finditer(complete):
+        numerator, denominator = float(match.group(1)), float(match.group(2))
+        if denominator == scale_max and scale_min <= numerator <= scale_max:
+            return numerator
+
+    skipped = _restated_scale(numbers, scale_min, scale_max)
+    labelled = _anchor_labels(text, numbers, scale_min, scale_max)
+    for i, (value, _, end) in enumerate(numbers):
+        if i in skipped or not scale_min <= value <= scale_max:
+            continue
+        if i in labelled:
+            # A later number may still replace a labelled endpoint
+            return None
+        if value == scale_min and i == len(numbers) - 1 and len(text) - end <= _MAX_RANGE_GAP:
+            return None
+        return value
+    return None
+
+
+PARSERS: Dict[int, Callable[..., Optional[float]]] = {
+    1: parse_v1,
+    2: parse_v2,
+}
+
+
+def parse_response(text: Optional[str], scale_min=None, scale_max=None,
+                   version: Optional[int] = None) -> Optional[float]:
+    """
+    Extract the numeric answer from a completion.
+    Args:
+        text: Raw completion text
+        scale_min: Lower end of the question's scale, if known
+        scale_max: Upper end of the question's scale, if known
+        version: Parser version (defaults to PARSER_VERSION)
+    Returns:
+        The parsed number, or None if no answer could be found.
+    """
+    if not text:
+        return None
+    version = version or PARSER_VERSION
+    if version not in PARSERS:
+        raise ValueError(f"Unknown parser version: {version}")
+    return PARSERS[version](text, scale_min, scale_max)
@@ -0,0 +1,217 @@
+"""
+Normalised storage for survey responses.
+
+A data CSV repeats the English prompt, its translation and back-translation
+on every trial row. The normalised form of data_<timestamp>.csv is two files:
+
+- data_<timestamp>.prompts.json.gz: gzip-compressed JSON of the prompt
+  texts, the English prompt once per question_id and the translation and
+  back-translation once per (language, question_id), as
+  {question_id: original_prompt} and
+  {language: {question_id: {translated_prompt, back_translation}}}
+- data_<timestamp>.responses.npz: one narrow numeric row per trial - language
+  code, question code, trial number, response, verification score and parser
+  version - with the language and question ID vocabularies the codes index
+
+Responses and scores are stored as numbers, the way the processor reads
+them: anything that is not a number (e.g. "N/A" or an empty response) is
+stored as NaN. Float columns are stored as float32 when that is lossless.
+The raw completions sidecar (see raw_store) is named after the run, so it is
+shared by both forms.
+"""
+
+import gzip
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+RESPONSE_STORE_VERSION = 1
+RESPONSES_SUFFIX = ".responses.npz"
+PROMPTS_SUFFIX = ".prompts.json.gz"
+
+# Data CSV columns held in the prompts table per (language, question_id), and
+# their keys there; Original_Prompt is held once per question_id
+PROMPT_COLUMNS = {
+    "Translated_Prompt": "translated_prompt",
+    "Back_Translation": "back_translation"
+}
+# Column order of a data CSV (see survey_runner)
+DATA_COLUMNS = ["Language", "Question_ID", "Trial_Number", "Response", "Original_Prompt",
+                "Translated_Prompt", "Back_Translation", "LLM_Verification_Score", "Parser_Version"]
+
+
+def store_paths(data_file: str) -> Tuple[str, str]:
+    """(responses, prompts) paths of the normalised form of a data file."""
+    base = data_file
+    for suffix in (RESPONSES_SUFFIX, PROMPTS_SUFFIX, ".csv"):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+            break
+    return base + RESPONSES_SUFFIX, base + PROMPTS_SUFFIX
+
+
+def is_response_store(data_file: str) -> bool:
+    return data_file.endswith(RESPONSES_SUFFIX)
+
+
+def _float_column(values: pd.Series) -> np.ndarray:
+    """Numeric column as float32 if that round-trips exactly, else float64."""
+    column = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    narrow = column.astype(np.float32)
+    return narrow if np.array_equal(narrow.astype(np.float64), column, equal_nan=True) else column
+
+
+def _codes(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """(vocabulary in first-appearance order, int16 codes) of a string column."""
+    codes, vocabulary = pd.factorize(values, sort=False)
+    if len(vocabulary) > np.iinfo(np.int16).max:
+        raise ValueError(f"Too many distinct {values.name} values to encode: {len(vocabulary)}")
+    return np.array(vocabulary, dtype=np.str_), codes.astype(np.int16)
+
+
+def prompts_table(df: pd.DataFrame) -> Dict:
+    """
+    Prompt texts of a data CSV read as text: {"original_prompts": {...},
+    "translations": {...}} (see the module docstring). Raises ValueError if
+    a question's or a cell's trials do not share the same prompts.
+    """
+    table: Dict = {}
+    if "Original_Prompt" in df.columns:
+        originals = df[["Question_ID", "Original_Prompt"]].drop_duplicates()
+        if originals["Question_ID"].duplicated().any():
+            question_id = originals.loc[originals["Question_ID"].duplicated(), "Question_ID"].iloc[0]
+            raise ValueError(f"Trials of {question_id} have different original prompts")
+        table["original_prompts"] = dict(zip(originals["Question_ID"], originals["Original_Prompt"]))
+
+    columns = [column for column in PROMPT_COLUMNS if column in df.columns]
+    cells = df[["Language", "Question_ID"] + columns].drop_duplicates()
+    duplicated = cells.duplicated(["Language", "Question_ID"], keep=False)
+    if duplicated.any():
+        language, question_id = cells[duplicated].iloc[0][["Language", "Question_ID"]]
+        raise ValueError(f"Trials of {language} {question_id} have different prompt texts")
+    translations: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for row in cells.to_dict("records"):
+        translations.setdefault(row["Language"], {})[row["Question_ID"]] = {
+            PROMPT_COLUMNS[column]: row[column] for column in columns
+        }
+    table["translations"] = translations
+    return table
+
+
+def write_response_store(data_file: str, df: pd.DataFrame) -> Tuple[str, str]:
+    """
+    Write the normalised form of a data CSV's rows (read with dtype=str and
+    keep_default_na=False) next to `data_file`. Returns the two paths.
+    """
+    unknown = [column for column in df.columns if column not in DATA_COLUMNS]
+    if unknown:
+        raise ValueError(f"Cannot normalise columns {unknown} (only survey data files are supported)")
+
+    prompts = prompts_table(df)
+    languages, language_codes = _codes(df["Language"])
+    question_ids, question_codes = _codes(df["Question_ID"])
+    arrays = {
+        "store_version": np.array(RESPONSE_STORE_VERSION),
+        "columns": np.array([column for column in DATA_COLUMNS if column in df.columns], dtype=np.str_),
+        "languages": languages,
+        "question_ids": question_ids,
+        "language": language_codes,
+        "question": question_codes,
+        "trial": pd.to_numeric(df["Trial_Number"]).to_numpy(dtype=np.int32),
+        "response": _float_column(df["Response"]),
+        "score": _float_column(df["LLM_Verification_Score"])
+    }
+    if "Parser_Version" in df.columns:
+        versions = pd.to_numeric(df["Parser_Version"], errors="coerce")
+        arrays["parser_version"] = versions.fillna(-1).to_numpy(dtype=np.int16)
+
+    responses_path, prompts_path = store_paths(data_file)
+    tmp_path = responses_path + ".tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, responses_path)
+    tmp_path = prompts_path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump({"store_version": RESPONSE_STORE_VERSION, **prompts}, f, ensure_ascii=False)
+    os.replace(tmp_path, prompts_path)
+    return responses_path, prompts_path
+
+
+def read_response_store(data_file: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Rows of a normalised data file as a DataFrame with the data CSV's column
+    names, in the original row order. With `columns`, only those columns are
+    built, and the prompts table is only read if a prompt column is asked for.
+    """
+    responses_path, prompts_path = store_paths(data_file)
+    with np.load(responses_path, allow_pickle=False) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    if int(arrays["store_version"]) != RESPONSE_STORE_VERSION:
+        raise ValueError(f"Unsupported response store version in {responses_path}")
+
+    stored = arrays["columns"].tolist()
+    wanted = [column for column in stored if columns is None or column in columns]
+    languages = arrays["languages"].astype(object)[arrays["language"]]
+    question_ids = arrays["question_ids"].astype(object)[arrays["question"]]
+    df = pd.DataFrame(index=pd.RangeIndex(len(languages)))
+    prompts = None
+    for column in wanted:
+        if column == "Language":
+            df[column] = languages
+        elif column == "Question_ID":
+            df[column] = question_ids
+        elif column == "Trial_Number":
+            df[column] = arrays["trial"].astype(np.int64)
+        elif column == "Response":
+            df[column] = arrays["response"].astype(np.float64)
+        elif column == "LLM_Verification_Score":
+            df[column] = arrays["score"].astype(np.float64)
+        elif column == "Parser_Version":
+            versions = arrays["parser_version"]
+            df[column] = pd.Series(versions, dtype="Int64").mask(versions < 0)
+        else:
+            if prompts is None:
+                with gzip.open(prompts_path, "rt", encoding="utf-8") as f:
+                    prompts = json.load(f)
+            if column == "Original_Prompt":
+                originals = prompts["original_prompts"]
+                df[column] = [originals[question_id] for question_id in question_ids]
+                continue
+            key = PROMPT_COLUMNS[column]
+            texts = {
+                (language, question_id): cell.get(key)
+                for language, by_question in prompts["translations"].items()
+                for question_id, cell in by_question.items()
+            }
+            df[column] = [texts[cell] for cell in zip(languages, question_ids)]
+    return df
+
+
+def convert_data_csv(data_file: str, remove_csv: bool = False) -> Tuple[str, str]:
+    """
+    Convert a data CSV to its normalised form and check that reading it back
+    reproduces the CSV's prompts exactly and its numeric columns as the
+    processor reads them. The CSV is deleted afterwards if `remove_csv` is set.
+    Returns the (responses, prompts) paths.
+    """
+    df = pd.read_csv(data_file, dtype=str, keep_default_na=False)
+    paths = write_response_store(data_file, df)
+
+    restored = read_response_store(paths[0])
+    for column in df.columns:
+        if column in PROMPT_COLUMNS or column in ("Language", "Question_ID", "Original_Prompt"):
+            same = restored[column].tolist() == df[column].tolist()
+        else:
+            expected = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+            same = np.array_equal(restored[column].to_numpy(dtype=np.float64, na_value=np.nan),
+                                  expected, equal_nan=True)
+        if not same:
+            for path in paths:
+                os.remove(path)
+            raise ValueError(f"Normalised {column} column of {data_file} does not match the CSV")
+
+    if remove_csv:
+        os.remove(data_file)
+    return paths
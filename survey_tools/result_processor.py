@@ -5,7 +5,18 @@ import json
 import glob
 from datetime import datetime
 import logging
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Tuple
+
+from .survey_registry import registry as survey_registry
+from .processing_manifest import ProcessingManifest, settings_hash, file_sha256
+from .accumulators import CellAccumulator, STATISTICS_COLUMNS, accumulate_csv, accumulate_csv_parallel
+from .config import STREAMING_MIN_FILE_BYTES, STREAMING_CHUNK_ROWS
+from . import config as processing_config
+from .results_format import write_compact_results, remove_question_shards
+from .matrix_sidecar import write_matrix_sidecar
+from .catalog import update_catalog
+from .response_store import RESPONSES_SUFFIX, is_response_store, read_response_store, store_paths
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +38,16 @@ class NumpyJSONEncoder(json.JSONEncoder):
             return bool(obj)
         return super().default(obj)
 
+# Bump when the results format or statistics change, so the processing
+# manifest treats existing results files as stale
+# 2: language_stats carry sum, sum_sq, min and max of the valid responses
+# 3: language_stats carry a response histogram over scale_min..scale_max
+# 4: results files get a dense .npz matrix sidecar
+# 5: language_stats count the valid responses the histogram has no bin for
+# 6: matrix sidecars carry categories and scale labels
+# 7: matrix sidecars keep the results' language order and fingerprint the results file
+PROCESSOR_VERSION = 7
+
 # Quality thresholds
 QUALITY_THRESHOLDS = {
     'min_llm_verification': 4.0,  # Minimum LLM verification score
@@ -35,64 +56,58 @@ QUALITY_THRESHOLDS = {
     'max_std_dev': 3.0,  # Maximum allowed standard deviation for responses
 }
 
-def evaluate_language_quality(df: pd.DataFrame, total_questions: int) -> Dict[str, Dict[str, Any]]:
+def valid_response_mask(df: pd.DataFrame, scale_mins: Dict[str, int]) -> pd.Series:
+    """Rows with a numeric Response at or above their question's scale_min."""
+    row_mins = df['Question_ID'].map(scale_mins)
+    return df['Response'].notna() & (df['Response'] >= row_mins)
+
+def compute_cell_stats(df: pd.DataFrame, questions_lookup: Dict[str, dict],
+                       languages: list) -> pd.DataFrame:
     """
-    Evaluate the quality of translations for each language.
-    
-    Args:
-        df: DataFrame with survey responses
-        total_questions: Total number of unique questions in the survey
-    
-    Returns:
-        Dictionary with language quality metrics
+    Count, mean, std and the sufficient statistics (sum, sum of squares, min,
+    max) of valid responses per (Question_ID, Language) cell, sorted by
+    question then language. Only the given languages and known questions
+    are included. Mean and std are taken with Series.mean/std on each cell
+    (not groupby.mean/std) so values match the per-cell computation bit for
+    bit.
+    """
+    scale_mins = {qid: q['scale_min'] for qid, q in questions_lookup.items()}
+    valid = df[df['Language'].isin(languages) & valid_response_mask(df, scale_mins)]
+    valid = valid.assign(Response_sq=valid['Response'] * valid['Response'])
+    grouped = valid.groupby(['Question_ID', 'Language'], sort=True)
+    return grouped.agg(
+        count=('Response', 'count'),
+        mean=('Response', lambda s: s.mean()),
+        std=('Response', lambda s: s.std()),
+        sum=('Response', 'sum'),
+        sum_sq=('Response_sq', 'sum'),
+        min=('Response', 'min'),
+        max=('Response', 'max')
+    )
+
+def language_quality_from_cells(languages, cell_counts: np.ndarray, cell_stds: np.ndarray,
+                                verification_means: pd.Series, total_questions: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Language quality metrics from per-cell valid-response counts and std devs
+    (rows: languages, columns: questions in questions.json order) and each
+    language's mean verification score.
     """
     language_quality = {}
-    
-    # Get scale_min for each question from questions data - use survey_dir from outer scope
-    questions_file = os.path.join("data", "World Values Survey", "questions.json")
-    with open(questions_file, "r") as f:
-        questions_data = json.load(f)["questions"]
-    scale_mins = {q['question_id']: int(q['scale_min']) for q in questions_data}
-    
-    for language in df['Language'].unique():
-        lang_data = df[df['Language'] == language]
-        
-        # Calculate quality metrics
-        # Check for valid responses (not NaN and >= scale_min) per question
-        valid_responses_per_question = {}
-        for qid in scale_mins:
-            q_data = lang_data[lang_data['Question_ID'] == qid]
-            min_scale = scale_mins[qid]
-            valid_count = q_data[
-                (q_data['Response'].notna()) & 
-                (q_data['Response'] >= min_scale)
-            ].shape[0]
-            valid_responses_per_question[qid] = valid_count > 0
+    for i, language in enumerate(languages):
+        answered = cell_counts[i] > 0
+        questions_with_valid_responses = int(answered.sum())
         
-        questions_with_valid_responses = sum(valid_responses_per_question.values())
-        
-        # For non-English, we care about verification scores
         if language != 'English':
-            avg_verification = lang_data['LLM_Verification_Score'].mean()
+            avg_verification = verification_means.get(language, np.nan)
             if pd.isna(avg_verification):
                 avg_verification = 0.0
         else:
             # For English, set verification score to maximum (5.0)
             avg_verification = 5.0  # Perfect verification score for reference language
             
-        # Calculate std dev only for valid responses
-        response_stds = []
-        for qid in scale_mins:
-            q_data = lang_data[lang_data['Question_ID'] == qid]
-            min_scale = scale_mins[qid]
-            valid_responses = q_data[
-                (q_data['Response'].notna()) & 
-                (q_data['Response'] >= min_scale)
-            ]['Response']
-            if len(valid_responses) > 0:
-                response_stds.append(valid_responses.std())
-        
-        response_std = np.mean(response_stds) if response_stds else 0.0
+        # Mean of per-question std devs, over questions with valid responses
+        response_stds = cell_stds[i][answered]
+        response_std = np.mean(response_stds) if len(response_stds) else 0.0
         
         # Compute coverage ratio based on questions with valid responses
         coverage_ratio = questions_with_valid_responses / total_questions
@@ -123,13 +138,48 @@ def evaluate_language_quality(df: pd.DataFrame, total_questions: int) -> Dict[st
     
     return language_quality
 
-def process_results(results_file, survey_id):
+def evaluate_language_quality(df: pd.DataFrame, total_questions: int,
+                              questions_data: Optional[list] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluate the quality of translations for each language.
+    
+    Args:
+        df: DataFrame with survey responses
+        total_questions: Total number of unique questions in the survey
+        questions_data: Question definitions (defaults to the World Values Survey's)
+    
+    Returns:
+        Dictionary with language quality metrics
+    """
+    # Get scale_min for each question from questions data
+    if questions_data is None:
+        questions_data = survey_registry.questions("World Values Survey")
+    scale_mins = {q['question_id']: int(q['scale_min']) for q in questions_data}
+    question_ids = list(scale_mins)
+    languages = df['Language'].unique()
+    
+    # One grouped pass over valid responses (not NaN and >= scale_min) per
+    # (language, question). Series.std per group keeps results bit-identical
+    # to the per-question loop this replaces
+    valid = df[valid_response_mask(df, scale_mins)]
+    grouped = valid.groupby(['Language', 'Question_ID'], sort=False)['Response']
+    cell_counts = grouped.count().unstack('Question_ID').reindex(index=languages, columns=question_ids).fillna(0).to_numpy()
+    cell_stds = grouped.agg(lambda s: s.std()).unstack('Question_ID').reindex(index=languages, columns=question_ids).to_numpy()
+    
+    # For non-English, we care about verification scores
+    verification_means = df.groupby('Language', sort=False)['LLM_Verification_Score'].agg(lambda s: s.mean())
+    
+    return language_quality_from_cells(languages, cell_counts, cell_stds, verification_means, total_questions)
+
+def process_results(results_file, survey_id, force=False, statistics_workers=1):
     """
     Legacy function to process survey results.
     This function is maintained for backward compatibility.
     Args:
         results_file: Path to the results CSV file
         survey_id: ID of the survey to process
+        force: Reprocess even if the processing manifest says results are current
+        statistics_workers: Worker processes aggregating the file (see summarize_data_file)
     """
     # Extract model name from results file path if present
     path_parts = results_file.split(os.sep)
@@ -140,15 +190,425 @@ def process_results(results_file, survey_id):
             break
     
     print(f"Processing file: {results_file}")  # Add explicit print for clarity
-    return process_survey_results(survey_id, model_name, specific_file=results_file)
+    return process_survey_results(survey_id, model_name, specific_file=results_file, force=force,
+                                  statistics_workers=statistics_workers)
+
+def log_language_quality(language_quality: Dict[str, Dict[str, Any]]) -> list:
+    """Log per-language quality metrics and return the languages that pass."""
+    valid_languages = [lang for lang, metrics in language_quality.items() 
+                     if metrics['passes_threshold']]
+
+    logger.info(f"Languages passing quality thresholds: {valid_languages}")
+    logger.info("Language quality metrics:")
+    for lang, metrics in language_quality.items():
+        logger.info(f"{lang}: {'PASS' if metrics['passes_threshold'] else 'FAIL'} - "
+                   f"Coverage: {metrics['coverage_ratio']:.2f}, "
+                   f"Verification: {metrics['avg_verification_score']:.2f}")
+    return valid_languages
+
+def compute_cell_histograms(df: pd.DataFrame, questions_lookup: Dict[str, dict],
+                            languages: list) -> pd.Series:
+    """
+    Number of valid responses per (Question_ID, Language, Response) value,
+    for the given languages and known questions.
+    """
+    scale_mins = {qid: q['scale_min'] for qid, q in questions_lookup.items()}
+    valid = df[df['Language'].isin(languages) & valid_response_mask(df, scale_mins)]
+    return valid.groupby(['Question_ID', 'Language', 'Response'], sort=False).size()
+
+def histogram_lists(value_counts: pd.Series, questions_lookup: Dict[str, dict]) -> Tuple[Dict[tuple, list],
+                                                                                       Dict[tuple, int]]:
+    """
+    Per-cell histograms as integer lists over scale_min..scale_max, from
+    counts indexed by (Question_ID, Language, Response). Off-scale and
+    non-integer responses count towards a cell's statistics but have no bin;
+    they are counted per cell instead.
+    Returns:
+        Tuple of (histograms, unbinned counts), both keyed by (question_id, language)
+    """
+    histograms, unbinned = {}, {}
+    for (question_id, language, value), count in value_counts.items():
+        q_data = questions_lookup.get(question_id)
+        if q_data is None:
+            continue
+        scale_min, scale_max = int(q_data['scale_min']), int(q_data['scale_max'])
+        histogram = histograms.get((question_id, language))
+        if histogram is None:
+            histogram = histograms[(question_id, language)] = [0] * (scale_max - scale_min + 1)
+        if float(value).is_integer() and scale_min <= value <= scale_max:
+            histogram[int(value) - scale_min] += int(count)
+        else:
+            unbinned[(question_id, language)] = unbinned.get((question_id, language), 0) + int(count)
+    return histograms, unbinned
+
+def assemble_question_results(cell_stats: pd.DataFrame, questions_lookup: Dict[str, dict],
+                              language_quality: dict, histograms: Dict[tuple, list],
+                              unbinned: Dict[tuple, int]) -> list:
+    """
+    Results entries from a (Question_ID, Language) cell statistics table
+    holding only the cells to report, by question with languages in sorted
+    order. `histograms` and `unbinned` map (question_id, language) to the
+    cell's response histogram and its count of responses without a bin (see
+    histogram_lists).
+    """
+    results = []
+    for question_id, cells in cell_stats.groupby(level='Question_ID', sort=True):
+        q_data = questions_lookup[question_id]
+        lang_stats_dict = {
+            lang: {
+                'count': int(count),
+                'mean': float(mean),
+                'std': float(std),
+                # Sufficient statistics, so runs can be merged exactly
+                'sum': float(total),
+                'sum_sq': float(sum_sq),
+                'min': float(low),
+                'max': float(high),
+                # Valid responses per scale point, scale_min first
+                'histogram': histograms.get(
+                    (question_id, lang),
+                    [0] * (int(q_data['scale_max']) - int(q_data['scale_min']) + 1)
+                ),
+                # Valid responses off the scale points (e.g. 5.5), not in the histogram
+                'unbinned': unbinned.get((question_id, lang), 0),
+                'quality_metrics': language_quality[lang]
+            }
+            for lang, count, mean, std, total, sum_sq, low, high in zip(
+                cells.index.get_level_values('Language'), cells['count'], cells['mean'], cells['std'],
+                cells['sum'], cells['sum_sq'], cells['min'], cells['max']
+            )
+        }
+        all_means = [stats['mean'] for stats in lang_stats_dict.values()]
+        total_responses = sum(stats['count'] for stats in lang_stats_dict.values())
+
+        results.append({
+            'question_id': question_id,
+            'title': q_data['question_title'],
+            'category': q_data['category'],
+            'scale_min': int(q_data['scale_min']),
+            'scale_max': int(q_data['scale_max']),
+            'scale_labels': q_data['scale_labels'],
+            'num_languages': len(lang_stats_dict),
+            'total_responses': total_responses,
+            'overall_mean': float(np.mean(all_means)),
+            'language_stats': lang_stats_dict,
+            'prompt_text': q_data['prompt_text']
+        })
+    return results
+
+def summarize_responses(df: pd.DataFrame, questions_data: list):
+    """
+    Evaluate language quality and compute per-question statistics for one
+    set of survey responses.
+    Args:
+        df: DataFrame of raw survey rows (as read from a data CSV)
+        questions_data: List of question definitions from questions.json
+    Returns:
+        Tuple of (results list, language quality dict, valid languages list)
+    """
+    # Convert Response and LLM_Verification_Score to numeric
+    df['Response'] = pd.to_numeric(df['Response'], errors='coerce')
+    df['LLM_Verification_Score'] = pd.to_numeric(df['LLM_Verification_Score'], errors='coerce')
+
+    # Evaluate language quality
+    total_questions = len(questions_data)
+    language_quality = evaluate_language_quality(df, total_questions, questions_data)
+    valid_languages = log_language_quality(language_quality)
+
+    # Create question lookup dict
+    questions_lookup = {q['question_id']: q for q in questions_data}
+
+    # Per-cell statistics in one grouped pass over valid responses
+    # (passing language, not NaN and >= scale_min)
+    cell_stats = compute_cell_stats(df, questions_lookup, valid_languages)
+    cell_stats = cell_stats[cell_stats['count'] >= QUALITY_THRESHOLDS['min_responses_per_question']]
+    histograms, unbinned = histogram_lists(compute_cell_histograms(df, questions_lookup, valid_languages),
+                                           questions_lookup)
+
+    results = assemble_question_results(cell_stats, questions_lookup, language_quality, histograms, unbinned)
+    return results, language_quality, valid_languages
+
+def summarize_accumulated(accumulator: CellAccumulator, questions_data: list):
+    """
+    summarize_responses for a data file already folded into per-cell
+    accumulators (see accumulate_csv). Counts and means match the in-memory
+    path exactly, and so do std devs of cells read in one chunk (see
+    accumulators for cells spread over several).
+    Returns:
+        Tuple of (results list, language quality dict, valid languages list)
+    """
+    total_questions = len(questions_data)
+    question_ids = [q['question_id'] for q in questions_data]
+    stats = accumulator.cell_stats()
+    languages = accumulator.languages
+
+    by_language = stats.unstack('Question_ID').reindex(index=languages)
+    cell_counts = by_language['count'].reindex(columns=question_ids).fillna(0).to_numpy()
+    cell_stds = by_language['std'].reindex(columns=question_ids).to_numpy()
+    language_quality = language_quality_from_cells(
+        languages, cell_counts, cell_stds, accumulator.verification_means(), total_questions
+    )
+    valid_languages = log_language_quality(language_quality)
+
+    questions_lookup = {q['question_id']: q for q in questions_data}
+    cell_stats = stats[
+        stats.index.get_level_values('Language').isin(valid_languages) &
+        stats.index.get_level_values('Question_ID').isin(question_ids)
+    ].swaplevel().sort_index()
+    cell_stats = cell_stats[cell_stats['count'] >= QUALITY_THRESHOLDS['min_responses_per_question']]
+    value_counts = accumulator.histograms.reorder_levels(['Question_ID', 'Language', 'Response'])
+    value_counts = value_counts[value_counts.index.get_level_values('Language').isin(valid_languages)]
+    histograms, unbinned = histogram_lists(value_counts, questions_lookup)
+
+    results = assemble_question_results(cell_stats, questions_lookup, language_quality, histograms, unbinned)
+    return results, language_quality, valid_languages
+
+def summarize_data_file(data_file: str, questions_data: list, streaming: Optional[bool] = None,
+                        statistics_workers: int = 1):
+    """
+    Read a data CSV and summarize it. Files of STREAMING_MIN_FILE_BYTES or
+    more (or any file, if `streaming` is set) are read in chunks of only the
+    statistics columns, so memory stays bounded by the chunk size rather
+    than the file size. With `statistics_workers` > 1 the file is always
+    streamed and the chunks are aggregated by that many worker processes,
+    each owning a hash partition of the (Language, Question_ID) cells.
+    A normalised data file (see response_store) is already narrow and is
+    always read whole, statistics columns only.
+    Returns:
+        Tuple of (results list, language quality dict, valid languages list)
+    """
+    if is_response_store(data_file):
+        return summarize_responses(read_data_file(data_file, STATISTICS_COLUMNS), questions_data)
+    if statistics_workers > 1:
+        streaming = True
+    elif streaming is None:
+        streaming = os.path.getsize(data_file) >= STREAMING_MIN_FILE_BYTES
+    if not streaming:
+        return summarize_responses(read_data_file(data_file), questions_data)
+
+    scale_mins = {q['question_id']: q['scale_min'] for q in questions_data}
+    if statistics_workers > 1:
+        logger.info(f"Streaming {os.path.basename(data_file)} in chunks of {STREAMING_CHUNK_ROWS:,} rows "
+                    f"across {statistics_workers} worker processes")
+        accumulator = accumulate_csv_parallel(data_file, scale_mins, statistics_workers)
+    else:
+        logger.info(f"Streaming {os.path.basename(data_file)} in chunks of {STREAMING_CHUNK_ROWS:,} rows")
+        accumulator = accumulate_csv(data_file, scale_mins)
+    return summarize_accumulated(accumulator, questions_data)
+
+def write_results_file(results_filename: str, results: list, language_quality: dict,
+                       valid_languages: list, timestamp: str, total_questions: int,
+                       source_file: str, extra_metrics: dict = None) -> None:
+    """
+    Write a results JSON file in the format read by the dashboard:
+    processing_config.RESULTS_FORMAT 1 (indented) or 2 (compact, sharded
+    per question if SHARD_RESULTS is set; see results_format), followed by
+    its dense matrix sidecar (see matrix_sidecar).
+    """
+    quality_metrics = {
+        'thresholds': QUALITY_THRESHOLDS,
+        'language_quality': language_quality,
+        'timestamp': timestamp,
+        'total_questions': total_questions,
+        'valid_languages': valid_languages,
+        'source_file': source_file
+    }
+    if extra_metrics:
+        quality_metrics.update(extra_metrics)
+    if processing_config.RESULTS_FORMAT == 2:
+        # Round-trip through the encoder so the compact writer sees plain types
+        results, quality_metrics = json.loads(json.dumps([results, quality_metrics], cls=NumpyJSONEncoder))
+        write_compact_results(results_filename, results, quality_metrics,
+                              shard_questions=processing_config.SHARD_RESULTS)
+    else:
+        remove_question_shards(results_filename)
+        with open(results_filename, 'w', encoding='utf-8') as f:
+            json.dump({
+                'results': results,
+                'quality_metrics': quality_metrics
+            }, f, indent=2, ensure_ascii=False, cls=NumpyJSONEncoder)
+    write_matrix_sidecar(results_filename, results)
 
-def process_survey_results(survey_id: str, model_name: str = None, specific_file: str = None) -> str:
+def read_data_file(data_file: str, columns: list = None) -> pd.DataFrame:
+    """
+    Rows of a data file, either a data CSV or a normalised
+    data_<timestamp>.responses.npz (see response_store), optionally only
+    some columns.
+    """
+    if is_response_store(data_file):
+        return read_response_store(data_file, columns)
+    return pd.read_csv(data_file, usecols=columns)
+
+def find_data_files(data_dir: str) -> list:
+    """
+    Data files of a model directory, one per run: the normalised form where
+    a run has been converted, otherwise its CSV.
+    """
+    stores = glob.glob(os.path.join(data_dir, f"data_*{RESPONSES_SUFFIX}"))
+    converted = {store_paths(path)[0] for path in stores}
+    csv_files = [
+        path for path in glob.glob(os.path.join(data_dir, "data_*.csv"))
+        if store_paths(path)[0] not in converted
+    ]
+    return sorted(stores + csv_files)
+
+def results_timestamp(data_file: str) -> str:
+    """Timestamp part of a data_<date>_<time>.csv (or .responses.npz) file name."""
+    parts = os.path.basename(data_file).split('_')
+    return parts[1] + '_' + parts[2].split('.')[0]
+
+def process_data_file(data_file: str, survey_id: str, results_filename: str,
+                      statistics_workers: int = 1) -> dict:
+    """
+    Process one data CSV into a results file. Self-contained so it can run in
+    a worker process.
+    Returns:
+        Summary dict with the results file, counts, valid languages and the
+        data file's content hash (for the processing manifest).
+    """
+    questions_data = survey_registry.questions(survey_id)
+    results, language_quality, valid_languages = summarize_data_file(
+        data_file, questions_data, statistics_workers=statistics_workers
+    )
+    write_results_file(results_filename, results, language_quality, valid_languages,
+                       results_timestamp(data_file), len(questions_data), os.path.basename(data_file))
+    return {
+        'results_file': results_filename,
+        'questions': len(results),
+        'responses': sum(q['total_responses'] for q in results),
+        'valid_languages': sorted(valid_languages),
+        'sha256': file_sha256(data_file)
+    }
+
+def _init_worker(results_format: int, shard_results: bool) -> None:
+    """
+    Process pool initializer: keep per-file logging out of the shared
+    console and use the parent's results format.
+    """
+    logging.getLogger(__name__).setLevel(logging.WARNING)
+    processing_config.RESULTS_FORMAT = results_format
+    processing_config.SHARD_RESULTS = shard_results
+
+def process_survey_results_parallel(survey_id: str, model_names: list = None, max_workers: int = None,
+                                    force: bool = False, statistics_workers: int = 1) -> dict:
+    """
+    Process every data file of a survey (optionally only some models) with
+    one worker process per file, up to `max_workers` (default: CPU count).
+    Files with current results in the processing manifest are skipped unless
+    `force` is set. Output is identical to process_survey_results; manifests
+    are updated by this (parent) process only.
+
+    With `statistics_workers` > 1, files are instead processed one at a time
+    in this process, each aggregated by that many worker processes - the
+    better split when a few files are very large.
+    Returns:
+        Dict with 'processed' (summaries), 'skipped' (count) and 'errors'
+        (list of (data_file, message)).
+    """
+    survey_dir = f"data/{survey_id}"
+    if model_names:
+        model_dirs = [f"data_{name}" for name in model_names]
+    else:
+        model_dirs = sorted(
+            item for item in os.listdir(survey_dir)
+            if item.startswith('data_') and os.path.isdir(os.path.join(survey_dir, item))
+        )
+    settings = processing_settings(survey_registry.questions(survey_id), statistics_workers)
+
+    jobs, manifests, skipped = [], {}, 0
+    for model_dir in model_dirs:
+        data_dir = os.path.join(survey_dir, model_dir)
+        manifest = manifests[data_dir] = ProcessingManifest(data_dir)
+        for data_file in find_data_files(data_dir):
+            if not force and manifest.is_current(data_file, PROCESSOR_VERSION, settings):
+                skipped += 1
+                continue
+            results_filename = os.path.join(data_dir, f"results_{results_timestamp(data_file)}.json")
+            jobs.append((data_file, results_filename, manifest))
+
+    print(f"{len(jobs)} data file(s) to process, {skipped} already current")
+    processed, errors = [], []
+
+    def finish(done, data_file, manifest, summary=None, error=None):
+        if error is not None:
+            errors.append((data_file, f"{type(error).__name__}: {error}"))
+            print(f"  [{done}/{len(jobs)}] FAILED {data_file}: {error}")
+            return
+        manifest.record(data_file, summary['results_file'], PROCESSOR_VERSION, settings,
+                        sha256=summary['sha256'])
+        processed.append(summary)
+        print(f"  [{done}/{len(jobs)}] {data_file} -> {os.path.basename(summary['results_file'])} "
+              f"({summary['questions']} questions, {summary['responses']} responses)")
+
+    if jobs and statistics_workers > 1:
+        # The aggregation pool is the only pool, so files run in this process
+        print(f"Processing one file at a time, {statistics_workers} worker process(es) per file...")
+        for done, (data_file, results_filename, manifest) in enumerate(jobs, 1):
+            try:
+                summary = process_data_file(data_file, survey_id, results_filename, statistics_workers)
+            except Exception as e:
+                finish(done, data_file, manifest, error=e)
+                continue
+            finish(done, data_file, manifest, summary)
+    elif jobs:
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        print(f"Processing with {workers} worker process(es)...")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(processing_config.RESULTS_FORMAT,
+                                           processing_config.SHARD_RESULTS)) as executor:
+            futures = {
+                executor.submit(process_data_file, data_file, survey_id, results_filename): (data_file, manifest)
+                for data_file, results_filename, manifest in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                data_file, manifest = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    finish(done, data_file, manifest, error=e)
+                    continue
+                finish(done, data_file, manifest, summary)
+
+    for manifest in manifests.values():
+        manifest.save()
+    refresh_catalog()
+    return {'processed': processed, 'skipped': skipped, 'errors': errors}
+
+def refresh_catalog() -> None:
+    """Update data/catalog.json after processing; a failure here does not fail the run."""
+    try:
+        logger.info(f"Updated survey catalog: {update_catalog()}")
+    except Exception as e:
+        logger.error(f"Error updating survey catalog: {e}")
+
+def processing_settings(questions_data: list, statistics_workers: int = 1) -> dict:
+    """Settings that affect results output, recorded in the processing manifest."""
+    settings = {
+        'thresholds': QUALITY_THRESHOLDS,
+        'questions_hash': settings_hash(questions_data)
+    }
+    # statistics_workers > 1 always streams, and std devs of cells spread over
+    # several chunks can differ from the in-memory ones in the last place
+    if statistics_workers > 1:
+        settings['streaming'] = True
+    # Only recorded when not the default, so format 1 manifests stay current
+    if processing_config.RESULTS_FORMAT != 1:
+        settings['results_format'] = processing_config.RESULTS_FORMAT
+        settings['shard_results'] = processing_config.SHARD_RESULTS
+    return settings
+
+def process_survey_results(survey_id: str, model_name: str = None, specific_file: str = None,
+                           force: bool = False, statistics_workers: int = 1) -> str:
     """
     Process survey results and create summary files for dashboard.
+    Files whose results are already current according to the directory's
+    processing manifest are skipped unless `force` is set.
     Args:
         survey_id: ID of the survey to process
         model_name: Name of the model used for the survey
         specific_file: Optional specific data file to process. If None, processes all files.
+        force: Reprocess files even if their results are current
+        statistics_workers: Worker processes aggregating each file (see summarize_data_file)
     """
     survey_dir = f"data/{survey_id}"
     model_dir = f"data_{model_name}" if model_name else "data"
@@ -158,7 +618,7 @@ def process_survey_results(survey_id: str, model_name: str = None, specific_file
     if specific_file:
         data_files = [specific_file] if os.path.exists(specific_file) else []
     else:
-        data_files = sorted(glob.glob(os.path.join(data_dir, "data_*.csv")))
+        data_files = find_data_files(data_dir)
     
     if not data_files:
         logger.error(f"No data files found in {data_dir}")
@@ -168,122 +628,86 @@ def process_survey_results(survey_id: str, model_name: str = None, specific_file
     for file in data_files:
         logger.info(f"Will process: {os.path.basename(file)}")
     
+    settings = processing_settings(survey_registry.questions(survey_id), statistics_workers)
+    manifest = ProcessingManifest(data_dir)
+    
     results_files = []
     for data_file in data_files:
-        logger.info(f"\nProcessing results from: {data_file}")
-        
-        # Load questions data
-        questions_file = os.path.join(survey_dir, "questions.json")
-        with open(questions_file, "r") as f:
-            questions_data = json.load(f)["questions"]
-        
-        # Read and process the results
-        df = pd.read_csv(data_file)
-        
-        # Convert Response and LLM_Verification_Score to numeric
-        df['Response'] = pd.to_numeric(df['Response'], errors='coerce')
-        df['LLM_Verification_Score'] = pd.to_numeric(df['LLM_Verification_Score'], errors='coerce')
-        
-        # Evaluate language quality
-        total_questions = len(questions_data)
-        language_quality = evaluate_language_quality(df, total_questions)
-        
-        # Filter for languages that pass quality thresholds
-        valid_languages = [lang for lang, metrics in language_quality.items() 
-                         if metrics['passes_threshold']]
-        
-        logger.info(f"Languages passing quality thresholds: {valid_languages}")
-        logger.info("Language quality metrics:")
-        for lang, metrics in language_quality.items():
-            logger.info(f"{lang}: {'PASS' if metrics['passes_threshold'] else 'FAIL'} - "
-                       f"Coverage: {metrics['coverage_ratio']:.2f}, "
-                       f"Verification: {metrics['avg_verification_score']:.2f}")
-        
-        # Filter valid responses - simplified filtering
-        valid_responses = df[
-            (df['Language'].isin(valid_languages)) &
-            (df['Response'].notna())
-        ]
-        
-        # Create question lookup dict
-        questions_lookup = {q['question_id']: q for q in questions_data}
-        
-        # Calculate statistics by question
-        results = []
-        for question_id, group in valid_responses.groupby('Question_ID'):
-            if question_id in questions_lookup:
-                q_data = questions_lookup[question_id]
-                
-                # Calculate statistics by language
-                lang_stats_dict = {}
-                for lang, lang_group in group.groupby('Language'):
-                    # Filter for valid responses (not NaN and >= scale_min)
-                    valid_responses = lang_group['Response'][
-                        (lang_group['Response'].notna()) & 
-                        (lang_group['Response'] >= q_data['scale_min'])
-                    ]
-                    
-                    if len(valid_responses) >= QUALITY_THRESHOLDS['min_responses_per_question']:
-                        lang_stats_dict[lang] = {
-                            'count': int(len(valid_responses)),
-                            'mean': float(valid_responses.mean()),
-                            'std': float(valid_responses.std()),
-                            'quality_metrics': language_quality[lang]
-                        }
-                
-                # Only add questions that have valid responses
-                if lang_stats_dict:
-                    all_means = [stats['mean'] for stats in lang_stats_dict.values()]
-                    total_responses = sum(stats['count'] for stats in lang_stats_dict.values())
-                    
-                    results.append({
-                        'question_id': question_id,
-                        'title': q_data['question_title'],
-                        'category': q_data['category'],
-                        'scale_min': int(q_data['scale_min']),
-                        'scale_max': int(q_data['scale_max']),
-                        'scale_labels': q_data['scale_labels'],
-                        'num_languages': len(lang_stats_dict),
-                        'total_responses': total_responses,
-                        'overall_mean': float(np.mean(all_means)),
-                        'language_stats': lang_stats_dict,
-                        'prompt_text': q_data['prompt_text']
-                    })
-        
-        # Get timestamp from data file
-        timestamp = os.path.basename(data_file).split('_')[1] + '_' + os.path.basename(data_file).split('_')[2].split('.')[0]
-        
-        # Save results with quality metrics
+        timestamp = results_timestamp(data_file)
         results_filename = os.path.join(data_dir, f"results_{timestamp}.json")
-        try:
-            with open(results_filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'results': results,
-                    'quality_metrics': {
-                        'thresholds': QUALITY_THRESHOLDS,
-                        'language_quality': language_quality,
-                        'timestamp': timestamp,
-                        'total_questions': total_questions,
-                        'valid_languages': valid_languages,
-                        'source_file': os.path.basename(data_file)
-                    }
-                }, f, indent=2, ensure_ascii=False, cls=NumpyJSONEncoder)
-            
+
+        if not force and manifest.is_current(data_file, PROCESSOR_VERSION, settings):
+            logger.info(f"Up to date, skipping: {os.path.basename(data_file)}")
             results_files.append(results_filename)
-            logger.info(f"Created results file: {results_filename}")
-            
+            continue
+
+        logger.info(f"\nProcessing results from: {data_file}")
+        try:
+            summary = process_data_file(data_file, survey_id, results_filename, statistics_workers)
         except Exception as e:
-            logger.error(f"Error saving results file: {e}")
+            logger.error(f"Error processing {data_file}: {e}")
             import traceback
             traceback.print_exc()
             continue
-        
-        logger.info(f"Total questions processed: {len(results)}")
-        logger.info(f"Total valid responses: {sum(q['total_responses'] for q in results)}")
-        logger.info(f"Valid languages: {sorted(valid_languages)}")
+        manifest.record(data_file, results_filename, PROCESSOR_VERSION, settings, sha256=summary['sha256'])
+        manifest.save()
+        results_files.append(results_filename)
+        logger.info(f"Created results file: {results_filename}")
+        logger.info(f"Total questions processed: {summary['questions']}")
+        logger.info(f"Total valid responses: {summary['responses']}")
+        logger.info(f"Valid languages: {summary['valid_languages']}")
     
+    manifest.save()
+    refresh_catalog()
     return results_files[-1] if results_files else None
 
+def process_experiment_results(data_file: str, survey_id: str) -> list:
+    """
+    Process an experiment grid data file into one results file per variant.
+    Results are written to a directory named after the data file, e.g.
+    experiments/experiment_<timestamp>/results_<variant>.json.
+    Args:
+        data_file: Path to the experiment CSV (rows tagged with a Variant column)
+        survey_id: ID of the survey the experiment ran
+    Returns:
+        List of results file paths.
+    """
+    questions_data = survey_registry.questions(survey_id)
+    
+    df = pd.read_csv(data_file)
+    if 'Variant' not in df.columns:
+        raise ValueError(f"{data_file} has no Variant column - not an experiment data file")
+    
+    base_name = os.path.splitext(os.path.basename(data_file))[0]
+    timestamp = base_name.split('_', 1)[1]
+    output_dir = os.path.join(os.path.dirname(data_file), base_name)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    results_files = []
+    for variant, variant_df in df.groupby('Variant', sort=True):
+        logger.info(f"\nProcessing variant: {variant}")
+        first_row = variant_df.iloc[0]
+        results, language_quality, valid_languages = summarize_responses(
+            variant_df.copy(), questions_data
+        )
+        results_filename = os.path.join(output_dir, f"results_{variant}.json")
+        write_results_file(
+            results_filename, results, language_quality, valid_languages,
+            timestamp, len(questions_data), os.path.basename(data_file),
+            extra_metrics={
+                'variant': {
+                    'id': variant,
+                    'model': first_row['Model'],
+                    'temperature': float(first_row['Temperature']),
+                    'system_prompt': first_row['System_Prompt']
+                }
+            }
+        )
+        results_files.append(results_filename)
+        logger.info(f"Created results file: {results_filename}")
+    
+    return results_files
+
 def get_friendly_model_name(model_name):
     """Convert model name to friendly display name"""
     if not model_name:
@@ -0,0 +1,151 @@
+"""
+Results file formats.
+
+Format 1 (the default) is the original results_<timestamp>.json: a list of
+per-question entries, each language's stats embedding that language's full
+quality metrics, written with indent=2.
+
+Format 2 stores the same information once: question metadata keyed by
+question_id, language quality once in quality_metrics, and the per-cell
+statistics as rows of a compact table, written without indentation. It can
+also be sharded: results_<timestamp>_questions/<question_id>.json then holds
+one question's metadata, cells and the quality metrics of its languages, so
+a view of a single question reads only that shard.
+
+Readers go through load_results_file / load_question_results, which accept
+both formats and return the format 1 shape. Used by the processor and the
+dashboard alike, so it depends only on the standard library.
+"""
+
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+RESULTS_FORMAT_VERSION = 2
+
+# Per-cell statistics stored in a format 2 cell row, after question_id and language
+CELL_FIELDS = ["count", "mean", "std", "sum", "sum_sq", "min", "max", "histogram", "unbinned"]
+CELL_COLUMNS = ["question_id", "language"] + CELL_FIELDS
+
+# Per-question fields, in the order of a format 1 entry (language_stats goes
+# before prompt_text)
+QUESTION_FIELDS = ["title", "category", "scale_min", "scale_max", "scale_labels",
+                   "num_languages", "total_responses", "overall_mean", "prompt_text"]
+
+
+def shard_directory(results_file: str) -> str:
+    """Directory holding the per-question shards of a results file."""
+    return os.path.splitext(results_file)[0] + "_questions"
+
+
+def remove_question_shards(results_file: str) -> None:
+    """Delete a results file's shards, so a rewritten file is never shadowed by stale ones."""
+    directory = shard_directory(results_file)
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+
+
+def compact_results(results: List[Dict], quality_metrics: Dict) -> Dict:
+    """Format 2 representation of a results list and its quality metrics."""
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "quality_metrics": quality_metrics,
+        "questions": {
+            q["question_id"]: {field: q.get(field) for field in QUESTION_FIELDS}
+            for q in results
+        },
+        "cell_columns": CELL_COLUMNS,
+        "cells": [
+            [q["question_id"], lang] + [stats.get(field) for field in CELL_FIELDS]
+            for q in results
+            for lang, stats in q["language_stats"].items()
+        ]
+    }
+
+
+def question_shard(compact: Dict, question_id: str) -> Dict:
+    """One question's part of a format 2 results dict."""
+    cells = [row for row in compact["cells"] if row[0] == question_id]
+    language_quality = compact["quality_metrics"].get("language_quality", {})
+    quality_metrics = {
+        key: value for key, value in compact["quality_metrics"].items() if key != "language_quality"
+    }
+    quality_metrics["language_quality"] = {row[1]: language_quality.get(row[1], {}) for row in cells}
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "quality_metrics": quality_metrics,
+        "questions": {question_id: compact["questions"][question_id]},
+        "cell_columns": compact["cell_columns"],
+        "cells": cells
+    }
+
+
+def _dump_compact(data: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_compact_results(results_file: str, results: List[Dict], quality_metrics: Dict,
+                          shard_questions: bool = False) -> None:
+    """Write a format 2 results file and, optionally, one shard per question."""
+    compact = compact_results(results, quality_metrics)
+    _dump_compact(compact, results_file)
+    remove_question_shards(results_file)
+    if shard_questions:
+        directory = shard_directory(results_file)
+        os.makedirs(directory, exist_ok=True)
+        for question_id in compact["questions"]:
+            _dump_compact(question_shard(compact, question_id), os.path.join(directory, f"{question_id}.json"))
+
+
+def expand_results(data: Dict) -> List[Dict]:
+    """Format 1 per-question entries from a format 2 dict, in question order."""
+    columns = data["cell_columns"]
+    language_quality = data["quality_metrics"].get("language_quality", {})
+    cells_by_question: Dict[str, List[Dict]] = {}
+    for row in data["cells"]:
+        cell = dict(zip(columns, row))
+        cells_by_question.setdefault(cell["question_id"], []).append(cell)
+
+    results = []
+    for question_id, question in data["questions"].items():
+        language_stats = {}
+        for cell in cells_by_question.get(question_id, []):
+            stats = {field: cell[field] for field in CELL_FIELDS if field in cell}
+            stats["quality_metrics"] = language_quality.get(cell["language"], {})
+            language_stats[cell["language"]] = stats
+        entry = {"question_id": question_id}
+        for field in QUESTION_FIELDS:
+            if field == "prompt_text":
+                entry["language_stats"] = language_stats
+            entry[field] = question.get(field)
+        results.append(entry)
+    return results
+
+
+def normalize_results(data) -> Tuple[List[Dict], Dict]:
+    """(results, quality_metrics) in the format 1 shape from any results file content."""
+    if isinstance(data, dict) and data.get("format_version") == RESULTS_FORMAT_VERSION:
+        return expand_results(data), data.get("quality_metrics", {})
+    if isinstance(data, dict) and "results" in data:
+        return data["results"], data.get("quality_metrics", {})
+    if isinstance(data, list):
+        return data, {}
+    return [data], {}
+
+
+def load_results_file(path: str) -> Tuple[List[Dict], Dict]:
+    """Read a results file of either format as (results, quality_metrics)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return normalize_results(json.load(f))
+
+
+def load_question_results(path: str, question_id: str) -> Optional[Dict]:
+    """
+    One question's format 1 entry from a results file, read from its shard
+    when the file has been sharded. None if the file has no such question.
+    """
+    shard = os.path.join(shard_directory(path), f"{question_id}.json")
+    results, _ = load_results_file(shard if os.path.exists(shard) else path)
+    return next((q for q in results if q.get("question_id") == question_id), None)
@@ -0,0 +1,106 @@
+"""
+Local lexical similarity between an original prompt and its back-translation.
+
+Used as a pre-check before the LLM verification call: near-identical
+back-translations are scored without an API call, very dissimilar ones are
+flagged immediately, and only the ambiguous middle band goes to the LLM judge.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Optional, Set, Tuple
+
+from .response_parser import normalize_digits
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+# English negation words; back-translations are compared with the English original
+_NEGATION_WORDS = frozenset({"not", "no", "never", "none", "nobody", "nothing", "neither",
+                             "nor", "nowhere", "cannot", "without"})
+
+# Scores assigned without an LLM call, on the verifier's 1-5 scale
+AUTO_PASS_SCORE = 5
+AUTO_FLAG_SCORE = 1
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, NFKC-normalise, map digits to ASCII and collapse punctuation/whitespace."""
+    text = normalize_digits(unicodedata.normalize("NFKC", text)).lower()
+    return " ".join(_TOKEN_PATTERN.findall(text))
+
+
+def _char_ngrams(text: str, n: int = 3) -> Counter:
+    padded = f" {text} "
+    return Counter(padded[i:i + n] for i in range(max(len(padded) - n + 1, 1)))
+
+
+def _dice(a: Counter, b: Counter) -> float:
+    """Multiset Dice coefficient of two counters (1.0 when both are empty)."""
+    total = sum(a.values()) + sum(b.values())
+    if not total:
+        return 1.0
+    return 2 * sum((a & b).values()) / total
+
+
+def anchors_match(original: str, back_translated: str, width: int = 3) -> bool:
+    """
+    True if both texts mention the same numbers, each followed by the same
+    words (up to `width` of them, stopping at the next number) - so scale
+    endpoints keep their anchor labels, e.g. "1 (never justifiable) to 10
+    (always justifiable)" does not match the reversed scale.
+    """
+    return _number_anchors(original, width) == _number_anchors(back_translated, width)
+
+
+def _number_anchors(text: str, width: int) -> Dict[str, Set[str]]:
+    tokens = _normalize(text).split()
+    anchors: Dict[str, Set[str]] = {}
+    for i, token in enumerate(tokens):
+        if not _NUMBER_PATTERN.fullmatch(token):
+            continue
+        label = anchors.setdefault(token, set())
+        for following in tokens[i + 1:i + 1 + width]:
+            if _NUMBER_PATTERN.fullmatch(following):
+                break
+            label.add(following)
+    return anchors
+
+
+def negations_match(original: str, back_translated: str) -> bool:
+    """True if both texts use the same negation words as often ("not entitled" vs "entitled")."""
+    def negations(text: str) -> Counter:
+        return Counter(token for token in _normalize(text.replace("n't", " not")).split()
+                       if token in _NEGATION_WORDS)
+    return negations(original) == negations(back_translated)
+
+
+def lexical_similarity(original: str, back_translated: str) -> float:
+    """
+    Similarity in [0, 1]: the mean of character-trigram and word-token Dice
+    overlap after normalisation.
+    """
+    a, b = _normalize(original), _normalize(back_translated)
+    char_score = _dice(_char_ngrams(a), _char_ngrams(b))
+    token_score = _dice(Counter(a.split()), Counter(b.split()))
+    return (char_score + token_score) / 2
+
+
+def precheck_score(original: str, back_translated: str,
+                   high_threshold: float, low_threshold: float) -> Tuple[Optional[int], float]:
+    """
+    Decide whether a back-translation needs the LLM judge.
+    Returns:
+        (score, similarity): score is AUTO_PASS_SCORE at or above
+        `high_threshold` (only when the numbers keep their anchor labels and
+        the negations match, since a flipped scale or a dropped "not" barely
+        moves the similarity), AUTO_FLAG_SCORE at or
+        below `low_threshold`, and None for the ambiguous band in between.
+    """
+    similarity = lexical_similarity(original, back_translated)
+    if (similarity >= high_threshold and anchors_match(original, back_translated)
+            and negations_match(original, back_translated)):
+        return AUTO_PASS_SCORE, similarity
+    if similarity <= low_threshold:
+        return AUTO_FLAG_SCORE, similarity
+    return None, similarity
@@ -0,0 +1,131 @@
+"""
+Survey metadata registry.
+
+Parses and validates each survey's questions.json once, indexes questions by
+question_id, and re-reads the file only when its modification time changes.
+Used by the survey pipeline and the dashboard alike, so it depends only on
+the standard library.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# data/<survey_id>/questions.json, relative to the project root
+DEFAULT_SURVEY_DIR = str(Path(__file__).resolve().parent.parent / "data")
+
+QUESTIONS_FILENAME = "questions.json"
+REQUIRED_QUESTION_FIELDS = ("question_id", "prompt_text", "scale_min", "scale_max")
+
+
+class SurveyDefinitionError(ValueError):
+    """A survey's questions.json is missing or malformed."""
+
+
+class SurveyDefinition:
+    """One parsed survey: its metadata block and questions indexed by ID."""
+
+    def __init__(self, survey_id: str, path: str, mtime: float, data: Dict):
+        self.survey_id = survey_id
+        self.path = path
+        self.mtime = mtime
+        self.survey = data.get("survey", {})
+        self.metadata = self.survey.get("metadata", {})
+        self.questions: List[Dict] = data["questions"]
+        self.by_id: Dict[str, Dict] = {q["question_id"]: q for q in self.questions}
+
+    @property
+    def info(self) -> Dict[str, str]:
+        """Display fields used by the dashboard footer."""
+        return {
+            "name": self.survey.get("name", ""),
+            "description": self.survey.get("description", ""),
+            "copyright": self.survey.get("copyright", "")
+        }
+
+
+def validate_survey_data(data: Dict, path: str) -> None:
+    """Raise SurveyDefinitionError unless `data` is a usable questions.json."""
+    if not isinstance(data, dict) or not isinstance(data.get("questions"), list):
+        raise SurveyDefinitionError(f"{path}: expected an object with a 'questions' list")
+    seen = set()
+    for index, q in enumerate(data["questions"]):
+        missing = [field for field in REQUIRED_QUESTION_FIELDS if field not in q]
+        if missing:
+            raise SurveyDefinitionError(f"{path}: question {index} is missing {', '.join(missing)}")
+        if q["question_id"] in seen:
+            raise SurveyDefinitionError(f"{path}: duplicate question_id {q['question_id']}")
+        seen.add(q["question_id"])
+        try:
+            scale_min, scale_max = float(q["scale_min"]), float(q["scale_max"])
+        except (TypeError, ValueError):
+            raise SurveyDefinitionError(f"{path}: {q['question_id']} has a non-numeric scale")
+        if scale_min >= scale_max:
+            raise SurveyDefinitionError(f"{path}: {q['question_id']} has scale_min >= scale_max")
+
+
+class SurveyRegistry:
+    """Cache of parsed surveys under a data directory, safe to share between threads."""
+
+    def __init__(self, survey_dir: str = DEFAULT_SURVEY_DIR):
+        self.survey_dir = survey_dir
+        self._lock = threading.Lock()
+        self._surveys: Dict[str, SurveyDefinition] = {}
+
+    def questions_path(self, survey_id: str) -> str:
+        return os.path.join(self.survey_dir, survey_id, QUESTIONS_FILENAME)
+
+    def list_surveys(self) -> List[str]:
+        """IDs of all surveys that have a questions.json, sorted."""
+        if not os.path.isdir(self.survey_dir):
+            return []
+        return sorted(
+            item for item in os.listdir(self.survey_dir)
+            if os.path.isfile(self.questions_path(item))
+        )
+
+    def get(self, survey_id: str) -> SurveyDefinition:
+        """
+        Parsed survey, re-read only if questions.json changed on disk.
+        Raises:
+            FileNotFoundError: If the survey has no questions.json
+            SurveyDefinitionError: If the file is malformed
+        """
+        path = self.questions_path(survey_id)
+        mtime = os.stat(path).st_mtime
+        with self._lock:
+            cached = self._surveys.get(survey_id)
+            if cached is not None and cached.mtime == mtime:
+                return cached
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise SurveyDefinitionError(f"{path}: invalid JSON ({e})") from e
+        validate_survey_data(data, path)
+        definition = SurveyDefinition(survey_id, path, mtime, data)
+        with self._lock:
+            self._surveys[survey_id] = definition
+        return definition
+
+    def questions(self, survey_id: str) -> List[Dict]:
+        """All question definitions of a survey, in file order."""
+        return self.get(survey_id).questions
+
+    def question(self, survey_id: str, question_id: str) -> Optional[Dict]:
+        """One question definition, or None if the survey has no such question."""
+        return self.get(survey_id).by_id.get(question_id)
+
+    def invalidate(self, survey_id: Optional[str] = None) -> None:
+        """Drop one cached survey, or all of them."""
+        with self._lock:
+            if survey_id is None:
+                self._surveys.clear()
+            else:
+                self._surveys.pop(survey_id, None)
+
+
+# Shared instance for the pipeline and dashboard
+registry = SurveyRegistry()
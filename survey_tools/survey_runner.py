@@ -1,17 +1,32 @@
 from openai import OpenAI
-import json
 import time
-import re
 import pandas as pd
 import config
-from .translator import translate_prompt
+from .translator import translate_prompt, translate_questions
+from .quality_gate import apply_quality_gate
+from .hedging import HedgePolicy
+from .telemetry import telemetry
+from .translation_memory import get_translation_memory
+from .response_parser import parse_response, settled_answer, PARSER_VERSION
+from .raw_store import write_raw_completions
+from .translation_bundle import bundle_translations
+from .survey_registry import registry as survey_registry
 import datetime
 import os
+import queue
+import threading
 
 # Set up OpenAI API key using the new client method
 client = OpenAI(api_key=config.API_KEY)
 
-def run_survey(survey_id, num_trials=None, languages=None, translation_settings=None, model=None):
+DEFAULT_TEMPERATURE = 0.7
+SYSTEM_PROMPT = "You are a respondent in a values survey. Answer the following question with just one number that best represents your view, according to the scale provided. Do not include any extra commentary."
+
+# Latency-optimised mode: stop at the first line break of the answer
+RESPONSE_STOP_SEQUENCES = ["\n"]
+
+def run_survey(survey_id, num_trials=None, languages=None, translation_settings=None, model=None,
+               translation_bundle=None):
     """
     Run a survey with the given ID.
     Args:
@@ -20,17 +35,17 @@ def run_survey(survey_id, num_trials=None, languages=None, translation_settings=
         languages: List of languages to run (overrides config)
         translation_settings: Translation settings (overrides config)
         model: OpenAI model to use (overrides config)
+        translation_bundle: Pre-built translation bundle; when given, no
+                            translation calls are made
     Returns:
         Path to the results file.
     """
-    survey_dir = f"api/surveys/{survey_id}"
-    questions_file = os.path.join(survey_dir, "questions.json")
+    survey_dir = f"data/{survey_id}"
     
-    # Load questions and survey config from the JSON file
-    with open(questions_file, "r") as f:
-        json_data = json.load(f)
-        questions = json_data["questions"]
-        survey_config = json_data["survey"]["metadata"]
+    # Load questions and survey config from the shared registry
+    survey = survey_registry.get(survey_id)
+    questions = survey.questions
+    survey_config = survey.metadata
     
     # Use provided values or defaults from survey config
     num_trials = num_trials or survey_config.get("recommended_trials", config.DEFAULT_NUM_TRIALS)
@@ -43,6 +58,12 @@ def run_survey(survey_id, num_trials=None, languages=None, translation_settings=
     num_languages = len(languages)
     num_questions = len(questions)
 
+    # Fail before any survey calls if the bundle doesn't cover this run
+    bundled = None
+    if translation_bundle is not None and use_translation:
+        bundled = bundle_translations(translation_bundle, questions, languages)
+        print(f"Using translation bundle from {translation_bundle['created']} ({len(bundled)} translations)")
+
     # Calculate and Display Total Trials
     total_api_calls = num_languages * num_questions * num_trials
     print(f"Configuration loaded:")
@@ -52,76 +73,223 @@ def run_survey(survey_id, num_trials=None, languages=None, translation_settings=
     print(f"  Model: {model}")
     print(f"--- Total Estimated API Calls for Responses: {total_api_calls} ---")
 
-    results = []
-    completed_api_calls = 0
+    hedge_policy = None
+    if config.HEDGE_REQUESTS:
+        hedge_policy = HedgePolicy(
+            percentile=config.HEDGE_PERCENTILE,
+            max_hedge_fraction=config.HEDGE_MAX_FRACTION,
+            min_samples=config.HEDGE_MIN_SAMPLES,
+            max_workers=2 * config.MAX_WORKERS
+        )
+        print(f"Hedging survey calls after p{config.HEDGE_PERCENTILE:g} latency "
+              f"(max {config.HEDGE_MAX_FRACTION:.0%} of calls)")
+    if config.RESPONSE_MODE == "latency":
+        print(f"Latency-optimised responses (capped tokens, stop sequences"
+              f"{', streaming' if config.STREAM_RESPONSES else ''})")
 
     print("\nStarting Survey Trials...")
+    print(f"Pipelined: translation feeds {config.MAX_WORKERS} survey workers "
+          f"(queue size {config.PIPELINE_QUEUE_SIZE})")
     print("=" * 80)
 
-    for language in languages:
-        print(f"\nLanguage: {language}")
-        print("-" * 80)
+    # Translation stage produces prompts onto a bounded queue; survey workers
+    # consume them as soon as they are ready, so trials overlap translation
+    work_queue = queue.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    num_items = num_languages * num_questions
+    question_results = [None] * num_items  # (rows, raw completions) per item, in run order
+    errors = []
+    stopped = threading.Event()  # Set on the first error: no new work is started
+    progress = {"completed": 0, "total": total_api_calls}
+    skipped_calls = {"count": 0}  # Survey calls not made for languages failing the quality gate
+    progress_lock = threading.Lock()
+    stage_started = time.monotonic()
+
+    def language_translations(language):
+        """All of a language's translations, from the bundle or the translator."""
+        if bundled is not None:
+            return {q["question_id"]: bundled[(language, q["question_id"])] for q in questions}
+        return translate_questions(questions, language)
+
+    def translation_stage():
+        try:
+            for lang_index, language in enumerate(languages):
+                if stopped.is_set():
+                    break
+                translate = language.lower() != "english" and use_translation
+                translations = None
+                # The quality gate needs every score of a language before its first
+                # survey call; batch mode and bundles also translate the language up front
+                if translate and (config.QUALITY_GATE != "off" or config.BATCH_TRANSLATION or bundled is not None):
+                    translations, passed = apply_quality_gate(
+                        language, questions, language_translations(language),
+                        allow_retranslate=bundled is None
+                    )
+                    if not passed:
+                        skipped = num_questions * num_trials
+                        with progress_lock:
+                            skipped_calls["count"] += skipped
+                            progress["total"] -= skipped
+                        telemetry.increment("quality_gate_skipped_calls", skipped)
+                        print(f"  Skipping {skipped} survey calls for {language}")
+                        continue
+
+                for q_index, q in enumerate(questions):
+                    if stopped.is_set():
+                        break
+                    if translate:
+                        if translations is not None:
+                            translated_prompt_for_api, back_translation_text, llm_verification_score_obj = \
+                                translations[q["question_id"]]
+                        else:
+                            translated_prompt_for_api, back_translation_text, llm_verification_score_obj = \
+                                translate_prompt(q["prompt_text"], language)
+                        llm_verification_score = str(llm_verification_score_obj) if llm_verification_score_obj is not None else "N/A"
+                    else:
+                        translated_prompt_for_api = q["prompt_text"]
+                        back_translation_text = "[N/A - English]"
+                        llm_verification_score = "N/A"
+                    work_queue.put((lang_index * num_questions + q_index, language, q_index, q,
+                                    translated_prompt_for_api, back_translation_text, llm_verification_score))
+            telemetry.record("translation_stage_s", time.monotonic() - stage_started)
+        except Exception as e:
+            errors.append(e)
+            stopped.set()
+        finally:
+            for _ in range(config.MAX_WORKERS):
+                work_queue.put(None)
+
+    def survey_worker():
+        while True:
+            item = work_queue.get()
+            if item is None:
+                return
+            if stopped.is_set():  # Drain the queue so the translation stage isn't blocked
+                continue
+            try:
+                question_results[item[0]] = run_question_trials(*item[1:])
+            except Exception as e:
+                errors.append(e)
+                stopped.set()
 
-        for q_index, q in enumerate(questions):
-            question_id = q["question_id"]
-            prompt_text = q["prompt_text"]
+    def run_question_trials(language, q_index, q, translated_prompt_for_api, back_translation_text, llm_verification_score):
+        question_id = q["question_id"]
+        rows, raw_rows = [], []
+        lines = [
+            f"\nLanguage: {language} | Question ID: {question_id} ({q_index + 1}/{num_questions})",
+            f"Prompt Sent ({language}): {translated_prompt_for_api}"
+        ]
 
-            translated_prompt_for_api = prompt_text
-            back_translation_text = ""
-            llm_verification_score = ""
+        current_question_responses = []
+        for trial in range(1, num_trials + 1):
+            response_number, raw_text, finish_reason = call_openai(
+                translated_prompt_for_api, model, hedge_policy=hedge_policy,
+                scale_min=q.get("scale_min"), scale_max=q.get("scale_max"),
+                return_raw=True
+            )
+            with progress_lock:
+                progress["completed"] += 1
+                completed_api_calls = progress["completed"]
+                planned_api_calls = progress["total"]
+            raw_rows.append({
+                "language": language,
+                "question_id": question_id,
+                "trial": trial,
+                "text": raw_text,
+                "finish_reason": finish_reason
+            })
 
-            if language.lower() != "english" and use_translation:
-                translated_prompt_for_api, back_translation_text, llm_verification_score_obj = \
-                    translate_prompt(prompt_text, language)
-                llm_verification_score = str(llm_verification_score_obj) if llm_verification_score_obj is not None else "N/A"
+            rows.append({
+                "Language": language,
+                "Question_ID": question_id,
+                "Trial_Number": trial,
+                "Original_Prompt": q["prompt_text"],
+                "Translated_Prompt": translated_prompt_for_api if language.lower() != "english" else "[N/A - English]",
+                "Back_Translation": back_translation_text,
+                "LLM_Verification_Score": llm_verification_score,
+                "Response": response_number,
+                "Parser_Version": PARSER_VERSION
+            })
+
+            current_question_responses.append(response_number)
+            response_str = str(response_number) if response_number is not None else 'N/A'
+
+            valid_responses_so_far = [r for r in current_question_responses if r is not None]
+            stats_str = ""
+            if valid_responses_so_far:
+                series_so_far = pd.Series(valid_responses_so_far)
+                mean_val = series_so_far.mean()
+                std_val = series_so_far.std() if len(valid_responses_so_far) > 1 else 0.0
+                stats_str = f"| Running Stats ({len(valid_responses_so_far)}/{trial}): Mean={mean_val:.2f}, Std={std_val:.2f}"
             else:
-                back_translation_text = "[N/A - English]"
-                llm_verification_score = "N/A"
-
-            print(f"\nQuestion ID: {question_id} ({q_index + 1}/{num_questions})")
-            print(f"Prompt Sent ({language}): {translated_prompt_for_api}")
-
-            current_question_responses = []
-            for trial in range(1, num_trials + 1):
-                response_number = call_openai(translated_prompt_for_api, model)
-                completed_api_calls += 1
-
-                results.append({
-                    "Language": language,
-                    "Question_ID": question_id,
-                    "Trial_Number": trial,
-                    "Original_Prompt": prompt_text,
-                    "Translated_Prompt": translated_prompt_for_api if language.lower() != "english" else "[N/A - English]",
-                    "Back_Translation": back_translation_text,
-                    "LLM_Verification_Score": llm_verification_score,
-                    "Response": response_number
-                })
-
-                current_question_responses.append(response_number)
-                response_str = str(response_number) if response_number is not None else 'N/A'
-
-                valid_responses_so_far = [r for r in current_question_responses if r is not None]
-                stats_str = ""
-                if valid_responses_so_far:
-                    series_so_far = pd.Series(valid_responses_so_far)
-                    mean_val = series_so_far.mean()
-                    std_val = series_so_far.std() if len(valid_responses_so_far) > 1 else 0.0
-                    stats_str = f"| Running Stats ({len(valid_responses_so_far)}/{trial}): Mean={mean_val:.2f}, Std={std_val:.2f}"
-                else:
-                    stats_str = f"| Running Stats (0/{trial}): No valid responses"
-
-                progress_percent = (completed_api_calls / total_api_calls) * 100 if total_api_calls > 0 else 0
-                print(f"  Trial {trial}/{num_trials} (Overall {completed_api_calls}/{total_api_calls} - {progress_percent:.1f}%): {response_str:<5} {stats_str}")
-
-                time.sleep(config.API_DELAY)
-
-            print("-" * 30)
+                stats_str = f"| Running Stats (0/{trial}): No valid responses"
+
+            progress_percent = (completed_api_calls / planned_api_calls) * 100 if planned_api_calls > 0 else 0
+            lines.append(f"  Trial {trial}/{num_trials} (Overall {completed_api_calls}/{planned_api_calls} - {progress_percent:.1f}%): {response_str:<5} {stats_str}")
+
+            time.sleep(config.API_DELAY)
+
+        # Print each question's trials as one block so concurrent workers don't interleave
+        lines.append("-" * 30)
+        with progress_lock:
+            print("\n".join(lines))
+        return rows, raw_rows
+
+    producer = threading.Thread(target=translation_stage, name="translation-stage", daemon=True)
+    producer.start()
+    workers = [
+        threading.Thread(target=survey_worker, name=f"survey-worker-{i}", daemon=True)
+        for i in range(config.MAX_WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+    producer.join()
+    for worker in workers:
+        worker.join()
+
+    results = []
+    raw_completions = []  # Raw text per results row, written to a sidecar
+    for item_results in question_results:
+        if item_results is None:  # Language excluded by the quality gate, or not run
+            continue
+        rows, raw_rows = item_results
+        results.extend(rows)
+        raw_completions.extend(raw_rows)
+
+    if errors:
+        # Keep the questions that finished before the failure, then re-raise
+        if hedge_policy is not None:
+            hedge_policy.shutdown()
+        if results:
+            output_filename = save_data_file(survey_dir, model, results, raw_completions)
+            print(f"Survey stopped on an error; saved {len(results)} completed trials to {output_filename}")
+        raise errors[0]
+    telemetry.record("pipeline_total_s", time.monotonic() - stage_started)
 
     print("\n" + "=" * 80)
     print("All Trials Completed.")
+    if skipped_calls["count"]:
+        print(f"Quality gate skipped {skipped_calls['count']} of {total_api_calls} survey calls "
+              f"(languages below verification threshold)")
     print("=" * 80)
 
-    # Save results in model-specific directory
+    if hedge_policy is not None:
+        hedge_policy.shutdown()
+    memory = get_translation_memory()
+    if memory is not None:
+        memory.save()
+    telemetry_lines = telemetry.summary()
+    if telemetry_lines:
+        print("Run telemetry:")
+        for line in telemetry_lines:
+            print(f"  {line}")
+
+    return save_data_file(survey_dir, model, results, raw_completions)
+
+def save_data_file(survey_dir, model, results, raw_completions):
+    """
+    Write a run's rows to data_<timestamp>.csv in the model-specific
+    directory, with the raw completions sidecar. Returns the CSV path.
+    """
     df = pd.DataFrame(results)
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     model_dir = f"data_{model}"  # Use the selected model name
@@ -131,40 +299,120 @@ def run_survey(survey_id, num_trials=None, languages=None, translation_settings=
     
     column_order = [
         "Language", "Question_ID", "Trial_Number", "Response",
-        "Original_Prompt", "Translated_Prompt", "Back_Translation", "LLM_Verification_Score"
+        "Original_Prompt", "Translated_Prompt", "Back_Translation", "LLM_Verification_Score",
+        "Parser_Version"
     ]
     actual_columns = [col for col in column_order if col in df.columns]
     df = df[actual_columns]
     df.to_csv(output_filename, index=False)
+    write_raw_completions(output_filename, raw_completions)
     
     return output_filename
 
-def call_openai(prompt, model=None):
+def response_token_cap(scale_min, scale_max):
+    """
+    Output token cap for a numeric answer on the given scale.
+    Allows the widest scale endpoint plus a sign and a decimal part, and
+    LATENCY_TOKEN_HEADROOM tokens for a short prefix ("Respuesta:") or a
+    restated scale.
+    """
+    if scale_min is None or scale_max is None:
+        return config.LATENCY_MAX_TOKENS
+    width = max(len(str(abs(int(scale_min)))), len(str(abs(int(scale_max)))))
+    return width + 2 + config.LATENCY_TOKEN_HEADROOM
+
+def _stream_answer(params, cancelled, scale_min=None, scale_max=None):
+    """
+    Stream a completion and close it as soon as its answer is settled (see
+    response_parser.settled_answer), so a restated scale such as "On a scale
+    of 1 to 10" is read past rather than cut at its first number. Returns
+    the text received so far, the finish reason ("early_stop" when the
+    stream was closed on an answer) and the number of content chunks
+    received (usage is only sent at the end of a stream).
+    """
+    stream = client.chat.completions.create(stream=True, **params)
+    text = ""
+    chunks = 0
+    finish_reason = None
+    try:
+        for chunk in stream:
+            if cancelled.is_set():
+                finish_reason = "cancelled"
+                break
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            if choice.delta.content:
+                chunks += 1
+                text += choice.delta.content
+                if settled_answer(text, scale_min, scale_max) is not None:
+                    finish_reason = "early_stop"
+                    break
+    finally:
+        stream.close()
+    return text.strip(), finish_reason, chunks
+
+def call_openai(prompt, model=None, hedge_policy=None, scale_min=None, scale_max=None,
+                return_raw=False, temperature=None, system_prompt=None):
     """
     Calls the OpenAI API with the provided prompt and extracts a numeric response.
     Args:
         prompt: The prompt to send to the API
         model: OpenAI model to use (overrides config)
+        hedge_policy: Optional HedgePolicy used to duplicate slow requests
+        scale_min: Lower end of the question's scale
+        scale_max: Upper end of the question's scale
+        return_raw: Also return the raw completion text and finish reason
+        temperature: Sampling temperature (defaults to DEFAULT_TEMPERATURE)
+        system_prompt: System prompt (defaults to SYSTEM_PROMPT)
+    Returns:
+        The parsed number (or None), or a (number, text, finish_reason)
+        tuple when return_raw is set.
     """
+    params = {
+        "model": model or config.MODEL_NAME,  # Use provided model or config default
+        "messages": [
+            {"role": "system", "content": system_prompt or SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature
+    }
+    latency_mode = config.RESPONSE_MODE == "latency"
+    if latency_mode:
+        params["max_tokens"] = response_token_cap(scale_min, scale_max)
+        params["stop"] = RESPONSE_STOP_SEQUENCES
+
+    streaming = latency_mode and config.STREAM_RESPONSES
+
+    def request(cancelled):
+        if streaming:
+            return _stream_answer(params, cancelled, scale_min, scale_max)
+        response = client.chat.completions.create(**params)
+        choice = response.choices[0]
+        tokens = response.usage.completion_tokens if response.usage else None
+        return choice.message.content.strip(), choice.finish_reason, tokens
+
+    number, text, finish_reason = None, None, None
     try:
-        response = client.chat.completions.create(
-            model=model or config.MODEL_NAME,  # Use provided model or config default
-            messages=[
-                {"role": "system", "content": "You are a respondent in a values survey. Answer the following question with just one number that best represents your view, according to the scale provided. Do not include any extra commentary."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
-        text = response.choices[0].message.content.strip()
-        match = re.search(r"[-+]?\d*\.\d+|\d+", text)
-        if match:
-            return float(match.group())
+        start = time.monotonic()
+        if hedge_policy is not None:
+            text, finish_reason, size = hedge_policy.run(request)
         else:
+            text, finish_reason, size = request(threading.Event())
+        telemetry.increment("survey_calls")
+        telemetry.record("survey_latency_s", time.monotonic() - start)
+        if size is not None:
+            telemetry.record("completion_chunks" if streaming else "completion_tokens", size)
+        number = parse_response(text, scale_min, scale_max)
+        if number is None:
             print("No numeric response found. Response was:", text)
-            return None
     except Exception as e:
         print("Error during API call:", e)
-        return None
+        finish_reason = "error"
+    if return_raw:
+        return number, text, finish_reason
+    return number
 
 if __name__ == "__main__":
     print("This module should be run through run_survey.py")
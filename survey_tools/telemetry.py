@@ -0,0 +1,58 @@
+"""
+Run telemetry for the survey tools.
+Collects call counters and latency samples so a run can report what it spent.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+
+class Telemetry:
+    """Thread-safe counters and timing samples for a survey run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add `amount` to the named counter."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def record(self, name: str, value: float) -> None:
+        """Record a single sample (e.g. a latency in seconds)."""
+        with self._lock:
+            self.samples[name].append(value)
+
+    def get(self, name: str) -> int:
+        """Current value of a counter."""
+        with self._lock:
+            return self.counters.get(name, 0)
+
+    def reset(self) -> None:
+        """Clear all counters and samples."""
+        with self._lock:
+            self.counters.clear()
+            self.samples.clear()
+
+    def summary(self) -> List[str]:
+        """Human-readable summary lines for printing at the end of a run."""
+        with self._lock:
+            lines = [f"{name}: {value}" for name, value in sorted(self.counters.items())]
+            for name, values in sorted(self.samples.items()):
+                if not values:
+                    continue
+                ordered = sorted(values)
+                median = ordered[len(ordered) // 2]
+                p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+                lines.append(
+                    f"{name}: n={len(ordered)}, mean={sum(ordered) / len(ordered):.3f}, "
+                    f"median={median:.3f}, p95={p95:.3f}, max={ordered[-1]:.3f}"
+                )
+            return lines
+
+
+# Shared instance used by the survey runner and translator
+telemetry = Telemetry()
@@ -0,0 +1,133 @@
+"""
+Translation bundles.
+
+A bundle holds the forward translation, back-translation and verification
+score of every (language, question) pair of a survey, produced ahead of time
+by the `translate` command. Survey runs given a bundle do no translation work,
+and the same bundle can be reviewed and shared across models and machines.
+
+Entries carry the hash of the English prompt they were made from, so a bundle
+built before a question was edited is rejected rather than silently reused.
+"""
+
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import config
+from .translator import (
+    translate_prompt, translate_questionnaire, active_instruction_version
+)
+from .translation_memory import get_translation_memory, source_hash
+from .telemetry import telemetry
+
+BUNDLE_VERSION = 1
+
+
+def build_translation_bundle(survey_id: str, questions: List[Dict], languages: List[str],
+                             max_workers: Optional[int] = None) -> Dict:
+    """
+    Translate, back-translate and verify every non-English (language, question)
+    pair concurrently with at most `max_workers` pairs in flight (one
+    language at a time per worker in batch mode).
+    Returns:
+        The bundle dict (see write_translation_bundle).
+    """
+    max_workers = max_workers or config.MAX_WORKERS
+    languages = [lang for lang in languages if lang.lower() != "english"]
+    translations = {lang: {} for lang in languages}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if config.BATCH_TRANSLATION:
+            futures = {executor.submit(translate_questionnaire, questions, lang): lang for lang in languages}
+        else:
+            futures = {
+                executor.submit(translate_prompt, q["prompt_text"], lang): (lang, q["question_id"])
+                for lang in languages for q in questions
+            }
+        for future in as_completed(futures):
+            if config.BATCH_TRANSLATION:
+                translations[futures[future]].update(future.result())
+            else:
+                lang, question_id = futures[future]
+                translations[lang][question_id] = future.result()
+
+    memory = get_translation_memory()
+    if memory is not None:
+        memory.save()
+
+    return {
+        "bundle_version": BUNDLE_VERSION,
+        "survey_id": survey_id,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "translator_model": config.MODEL_NAME,
+        "instruction_version": active_instruction_version(),
+        "languages": languages,
+        "translations": {
+            lang: {
+                q["question_id"]: {
+                    "source_hash": source_hash(q["prompt_text"]),
+                    "translated": translations[lang][q["question_id"]][0],
+                    "back_translation": translations[lang][q["question_id"]][1],
+                    "verification_score": translations[lang][q["question_id"]][2]
+                }
+                for q in questions
+            }
+            for lang in languages
+        }
+    }
+
+
+def write_translation_bundle(bundle: Dict, survey_dir: str) -> str:
+    """Write a bundle to <survey_dir>/translations/bundle_<timestamp>.json and return its path."""
+    output_dir = os.path.join(survey_dir, "translations")
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(output_dir, f"bundle_{timestamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_translation_bundle(path: str) -> Dict:
+    """Load a bundle file, checking its version."""
+    with open(path, "r", encoding="utf-8") as f:
+        bundle = json.load(f)
+    version = bundle.get("bundle_version")
+    if version != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported translation bundle version {version} in {path}")
+    return bundle
+
+
+def bundle_translations(bundle: Dict, questions: List[Dict],
+                        languages: List[str]) -> Dict[Tuple[str, str], Tuple[str, str, Optional[int]]]:
+    """
+    Look up every non-English (language, question) pair in a bundle.
+    Returns:
+        Dict mapping (language, question_id) to
+        (translated_text, back_translated_text, verification_score).
+    Raises:
+        ValueError: If any pair is missing or was translated from a different prompt.
+    """
+    found, problems = {}, []
+    for lang in languages:
+        if lang.lower() == "english":
+            continue
+        entries = bundle["translations"].get(lang, {})
+        for q in questions:
+            entry = entries.get(q["question_id"])
+            if entry is None:
+                problems.append(f"{lang}/{q['question_id']}: missing")
+            elif entry["source_hash"] != source_hash(q["prompt_text"]):
+                problems.append(f"{lang}/{q['question_id']}: prompt changed since the bundle was built")
+            else:
+                found[(lang, q["question_id"])] = (
+                    entry["translated"], entry["back_translation"], entry["verification_score"]
+                )
+    if problems:
+        shown = "; ".join(problems[:5]) + (f" (+{len(problems) - 5} more)" if len(problems) > 5 else "")
+        raise ValueError(f"Translation bundle does not cover this run: {shown}")
+    telemetry.increment("bundle_translations_used", len(found))
+    return found
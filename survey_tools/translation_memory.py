@@ -0,0 +1,124 @@
+"""
+Persistent translation memory.
+
+Stores forward translations, back-translations and verification scores keyed
+by (source text hash, target language, translator model, instruction version),
+so re-running an unchanged survey makes no translation calls. Editing a
+prompt changes its hash, so stale entries are never reused; `prune` and
+`invalidate` remove them from the file.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Union
+
+import config
+
+
+def source_hash(text: str) -> str:
+    """Stable hash of a source prompt."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """JSON-backed translation store, safe to share between threads."""
+
+    # Unsaved entries written before the file is flushed automatically
+    AUTOSAVE_EVERY = 25
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._unsaved = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f).get("entries", {})
+
+    @staticmethod
+    def _key(source: str, language: str, model: str, instruction_version: Union[int, str]) -> str:
+        return f"{source_hash(source)}|{language}|{model}|v{instruction_version}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, source: str, language: str, model: str, instruction_version: Union[int, str]) -> Optional[Dict]:
+        """Stored entry for this translation, or None."""
+        with self._lock:
+            return self._entries.get(self._key(source, language, model, instruction_version))
+
+    def put(self, source: str, language: str, model: str, instruction_version: Union[int, str],
+            translated: str, back_translation: str, verification_score: Optional[int]) -> None:
+        """Store a completed translation; flushes to disk every AUTOSAVE_EVERY writes."""
+        entry = {
+            "source_hash": source_hash(source),
+            "language": language,
+            "model": model,
+            "instruction_version": instruction_version,
+            "translated": translated,
+            "back_translation": back_translation,
+            "verification_score": verification_score,
+            "created": datetime.now().isoformat(timespec="seconds")
+        }
+        with self._lock:
+            self._entries[self._key(source, language, model, instruction_version)] = entry
+            self._unsaved += 1
+            autosave = self._unsaved >= self.AUTOSAVE_EVERY
+        if autosave:
+            self.save()
+
+    def invalidate(self, source: Optional[str] = None, language: Optional[str] = None) -> int:
+        """Remove entries matching a source text and/or language. Returns the count removed."""
+        digest = source_hash(source) if source is not None else None
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if (digest is None or entry["source_hash"] == digest)
+                and (language is None or entry["language"] == language)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._unsaved += len(stale)
+        return len(stale)
+
+    def prune(self, active_sources: Iterable[str]) -> int:
+        """Remove entries whose source text is no longer in use (e.g. edited prompts)."""
+        active = {source_hash(text) for text in active_sources}
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry["source_hash"] not in active]
+            for key in stale:
+                del self._entries[key]
+            self._unsaved += len(stale)
+        return len(stale)
+
+    def save(self) -> None:
+        """Write the memory to disk atomically."""
+        with self._lock:
+            if not self._unsaved:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Shared translation memory, or None when disabled in config."""
+    global _memory
+    if not config.USE_TRANSLATION_MEMORY:
+        return None
+    with _memory_lock:
+        if _memory is None or _memory.path != config.TRANSLATION_MEMORY_FILE:
+            _memory = TranslationMemory(config.TRANSLATION_MEMORY_FILE)
+        return _memory
@@ -1,11 +1,31 @@
 from openai import OpenAI
 import config
 import time
+import json
 import re # Import regex for parsing the score
+from .telemetry import telemetry
+from .translation_memory import get_translation_memory
+from .similarity import precheck_score
 
 # Set up OpenAI API key using the new client method
 client = OpenAI(api_key=config.API_KEY)
 
+# Bump when the translation instructions change so stored translations are not reused
+TRANSLATION_INSTRUCTION_VERSION = 1
+# Memory key for translations made by the batch (whole questionnaire) instructions
+BATCH_TRANSLATION_INSTRUCTION_VERSION = f"{TRANSLATION_INSTRUCTION_VERSION}-batch"
+# Memory key for retranslations made with the stricter instruction (quality gate)
+STRICT_TRANSLATION_INSTRUCTION_VERSION = f"{TRANSLATION_INSTRUCTION_VERSION}-strict"
+STRICT_TRANSLATION_INSTRUCTION = (
+    "Translate literally enough that a back-translation reproduces the original meaning. "
+    "Keep every number, scale endpoint and quoted answer label, and do not add, drop or soften any part of the question."
+)
+
+
+def active_instruction_version():
+    """Memory key of translations made by the active mode (batch or per-question)."""
+    return BATCH_TRANSLATION_INSTRUCTION_VERSION if config.BATCH_TRANSLATION else TRANSLATION_INSTRUCTION_VERSION
+
 # --- New Function for LLM Verification ---
 def verify_translation_meaning(original_text, back_translated_text):
     """
@@ -15,6 +35,16 @@ def verify_translation_meaning(original_text, back_translated_text):
     Returns:
         int: A similarity score (e.g., 1-5), or None if verification fails.
     """
+    if config.SIMILARITY_PRECHECK:
+        score, similarity = precheck_score(
+            original_text, back_translated_text,
+            config.SIMILARITY_HIGH_THRESHOLD, config.SIMILARITY_LOW_THRESHOLD
+        )
+        if score is not None:
+            telemetry.increment("verification_calls_saved")
+            telemetry.increment("verification_auto_pass" if score >= 5 else "verification_auto_flag")
+            print(f"  Lexical similarity {similarity:.2f}: verification score {score}/5 assigned without LLM call.")
+            return score
     print("  Running LLM verification of back-translation...")
     verification_prompt = f"""
 Compare the semantic meaning of the following two sentences.
@@ -31,6 +61,7 @@ On a scale of 1 to 5, how similar are Sentence A and Sentence B in meaning?
 Respond with only a single digit number (1, 2, 3, 4, or 5).
 """
     try:
+        telemetry.increment("translation_calls")
         response = client.chat.completions.create(
             model=config.MODEL_NAME, # Or potentially a cheaper/faster model if suitable
             messages=[
@@ -61,16 +92,100 @@ Respond with only a single digit number (1, 2, 3, 4, or 5).
         print(f"  LLM Verification error: {e}")
         return None # Verification failed
 
+# --- Fused back-translation and verification ---
+def back_translate_and_verify(original_text, translated_text, target_language):
+    """
+    Back-translate and rate the meaning in one structured call.
+
+    Returns:
+        tuple: (back_translated_text, verification_score); the score is None
+               if it is missing or out of range, and the text is
+               "[Back-translation failed]" if the call fails.
+    """
+    print(f"  Performing fused back-translation and verification ({target_language} -> English)...")
+    fused_prompt = f"""
+Step 1: Translate the following {target_language} text accurately back into English.
+Text: "{translated_text}"
+
+Step 2: Compare the meaning of your back-translation with this original English text:
+"{original_text}"
+
+Rate how similar they are in meaning on a scale of 1 to 5:
+1 = Completely different meaning or the back-translation is nonsensical.
+2 = Some overlap in meaning, but key points are different or lost.
+3 = Roughly similar meaning, but with noticeable differences in nuance or detail.
+4 = Very similar meaning, mostly interchangeable, minor differences possible.
+5 = Identical or virtually identical meaning.
+
+Respond with a JSON object: {{"back_translation": "<English text>", "score": <1-5>}}
+"""
+    try:
+        telemetry.increment("translation_calls")
+        response = client.chat.completions.create(
+            model=config.MODEL_NAME,
+            messages=[
+                {"role": "system", "content": f"You are an expert translator and evaluator. Translate from {target_language} back into English, then rate the semantic similarity to the original. Output only JSON."},
+                {"role": "user", "content": fused_prompt}
+            ],
+            temperature=0,
+            response_format={"type": "json_object"}
+        )
+        result = json.loads(response.choices[0].message.content)
+        time.sleep(config.API_DELAY)
+    except Exception as e:
+        print(f"  Fused back-translation error ({target_language} -> English): {e}")
+        return "[Back-translation failed]", None
+
+    back_translated_text = str(result.get("back_translation") or "").strip() or "[Back-translation failed]"
+    try:
+        score = int(result.get("score"))
+    except (TypeError, ValueError):
+        print(f"  LLM Verification Warning: Could not parse numeric score from response: '{result.get('score')}'")
+        return back_translated_text, None
+    if not 1 <= score <= 5:
+        print(f"  LLM Verification Warning: Score ({score}) out of range (1-5).")
+        return back_translated_text, None
+    print(f"  LLM Verification Score: {score}/5")
+    return back_translated_text, score
+
+def back_translate(translated_text, target_language):
+    """Translate `translated_text` from `target_language` back into English (raises on API errors)."""
+    telemetry.increment("translation_calls")
+    back_instruction = f"Translate the following {target_language} text accurately back into English:\n\n{translated_text}"
+    response_back = client.chat.completions.create(
+         model=config.MODEL_NAME,
+         messages=[
+             {"role": "system", "content": f"You are an expert translator. Translate the following text from {target_language} accurately back into English."},
+             {"role": "user", "content": back_instruction}
+         ],
+         temperature=0
+     )
+    time.sleep(config.API_DELAY)
+    return response_back.choices[0].message.content.strip()
+
 # --- Modified translate_prompt Function ---
-def translate_prompt(prompt, target_language):
+def translate_prompt(prompt, target_language, strict=False):
     """
     Translate the prompt, back-translate, verify using LLM, print results,
     and return the forward translation, back translation, and score.
+    With strict=True the forward translation uses a stricter instruction and
+    config.RETRANSLATION_MODEL (used to retry translations that failed the
+    quality gate).
 
     Returns:
         tuple: (translated_text, back_translated_text, verification_score)
                Values might be placeholders if steps failed/were skipped.
     """
+    instruction_version = STRICT_TRANSLATION_INSTRUCTION_VERSION if strict else TRANSLATION_INSTRUCTION_VERSION
+    translator_model = (config.RETRANSLATION_MODEL or config.MODEL_NAME) if strict else config.MODEL_NAME
+    memory = get_translation_memory()
+    if memory is not None:
+        cached = memory.get(prompt, target_language, translator_model, instruction_version)
+        if cached is not None:
+            telemetry.increment("translation_memory_hits")
+            print(f"  Using stored {target_language} translation (translation memory).")
+            return cached["translated"], cached["back_translation"], cached["verification_score"]
+
     print(f"  Translating to {target_language}...")
     original_prompt = prompt
     # Initialize return values with defaults/placeholders
@@ -80,9 +195,12 @@ def translate_prompt(prompt, target_language):
 
     # --- 1. Forward Translation ---
     try:
+        telemetry.increment("translation_calls")
         forward_instruction = f"Translate the following English text accurately into {target_language}, preserving the meaning and nuance of the original survey question and its response scale:\n\n{prompt}"
+        if strict:
+            forward_instruction = f"{STRICT_TRANSLATION_INSTRUCTION}\n\n{forward_instruction}"
         response_fwd = client.chat.completions.create(
-            model=config.MODEL_NAME,
+            model=translator_model,
             messages=[
                 {"role": "system", "content": f"You are an expert translator specializing in English to {target_language} translations for surveys. Ensure the core question and the response instructions are clear."},
                 {"role": "user", "content": forward_instruction}
@@ -94,22 +212,17 @@ def translate_prompt(prompt, target_language):
         time.sleep(config.API_DELAY)
 
         # --- 2. Back Translation (only if forward succeeded and is different) ---
-        if translated_text != original_prompt:
+        if translated_text != original_prompt and config.FUSED_VERIFICATION:
+            # --- 2+3. Back-translation and verification in one call ---
+            back_translated_text, verification_score = back_translate_and_verify(
+                original_prompt, translated_text, target_language
+            )
+        elif translated_text != original_prompt:
             print(f"  Performing back-translation ({target_language} -> English)...")
             back_translated_text = "[Back-translation failed]" # Update default for this block
             try:
-                back_instruction = f"Translate the following {target_language} text accurately back into English:\n\n{translated_text}"
-                response_back = client.chat.completions.create(
-                     model=config.MODEL_NAME,
-                     messages=[
-                         {"role": "system", "content": f"You are an expert translator. Translate the following text from {target_language} accurately back into English."},
-                         {"role": "user", "content": back_instruction}
-                     ],
-                     temperature=0
-                 )
-                back_translated_text = response_back.choices[0].message.content.strip()
+                back_translated_text = back_translate(translated_text, target_language)
                 print(f"  Back-translation (English) successful.")
-                time.sleep(config.API_DELAY)
 
                 # --- 3. LLM Verification Step ---
                 verification_score = verify_translation_meaning(original_prompt, back_translated_text)
@@ -141,5 +254,149 @@ def translate_prompt(prompt, target_language):
     print(f"LLM Verification Score: {score_display}/5")
     print("="*60 + "\n")
 
-    # --- 5. Return all results ---
+    # --- 5. Store complete results and return ---
+    if memory is not None and verification_score is not None:
+        memory.put(original_prompt, target_language, translator_model, instruction_version,
+                   translated_text, back_translated_text, verification_score)
     return translated_text, back_translated_text, verification_score
+
+# --- Batch translation of a whole questionnaire ---
+def _batch_translate(items, system_message, instruction):
+    """
+    Translate a list of {"id", "text"} items in one structured request.
+
+    Returns:
+        dict: id -> translated text, for the returned items whose ID was
+              requested and whose text is non-empty. Missing, unknown,
+              duplicated or empty items are left out, so only they need
+              translating again.
+    Raises:
+        ValueError: If the response is not valid JSON or has no item list.
+    """
+    payload = json.dumps({"items": items}, ensure_ascii=False)
+    telemetry.increment("translation_calls")
+    response = client.chat.completions.create(
+        model=config.MODEL_NAME,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": f"{instruction}\n\n{payload}"}
+        ],
+        temperature=0,
+        response_format={"type": "json_object"}
+    )
+    time.sleep(config.API_DELAY)
+    returned = json.loads(response.choices[0].message.content).get("items")
+    if not isinstance(returned, list):
+        raise ValueError("no item list in the response")
+    requested = {str(item["id"]) for item in items}
+    texts, seen = {}, set()
+    for received in returned:
+        if not isinstance(received, dict):
+            continue
+        item_id = str(received.get("id"))
+        text = received.get("text")
+        if item_id in seen:
+            texts.pop(item_id, None)  # Conflicting answers for one ID: trust neither
+            continue
+        seen.add(item_id)
+        if item_id in requested and isinstance(text, str) and text.strip():
+            texts[item_id] = text.strip()
+    return texts
+
+def _batch_translate_or_none(items, system_message, instruction):
+    """_batch_translate, or an empty dict (every item missing) if the response is unusable."""
+    try:
+        return _batch_translate(items, system_message, instruction)
+    except Exception as e:
+        print(f"  Batch translation failed ({e}).")
+        return {}
+
+def translate_questionnaire(questions, target_language):
+    """
+    Translate all of a language's questions with one forward and one back
+    translation request (JSON array in, JSON array out), then verify each
+    item. Items a batch response leaves out or gets wrong are translated
+    again one by one; the rest of the batch is kept.
+
+    Returns:
+        dict: question_id -> (translated_text, back_translated_text, verification_score)
+    """
+    results = {}
+    memory = get_translation_memory()
+    pending = []
+    for q in questions:
+        cached = None
+        if memory is not None:
+            cached = memory.get(q["prompt_text"], target_language, config.MODEL_NAME,
+                                BATCH_TRANSLATION_INSTRUCTION_VERSION)
+        if cached is not None:
+            telemetry.increment("translation_memory_hits")
+            results[q["question_id"]] = (cached["translated"], cached["back_translation"], cached["verification_score"])
+        else:
+            pending.append(q)
+    if not pending:
+        print(f"  Using stored {target_language} translations for all questions (translation memory).")
+        return results
+
+    print(f"  Batch translating {len(pending)} questions to {target_language}...")
+    forward_by_id = _batch_translate_or_none(
+        [{"id": q["question_id"], "text": q["prompt_text"]} for q in pending],
+        f"You are an expert translator specializing in English to {target_language} translations for surveys. Ensure the core question and the response instructions are clear.",
+        f"Translate the \"text\" of each item below accurately into {target_language}, preserving the meaning and nuance of the original survey question and its response scale. "
+        f"Return a JSON object {{\"items\": [{{\"id\": ..., \"text\": ...}}]}} with exactly the same ids in the same order."
+    )
+    retranslate = [q for q in pending if str(q["question_id"]) not in forward_by_id]
+    if retranslate:
+        print(f"  {len(retranslate)} of {len(pending)} batch translations missing or mismatched; "
+              f"translating them one by one.")
+        telemetry.increment("batch_translation_fallbacks", len(retranslate))
+        for q in retranslate:
+            results[q["question_id"]] = translate_prompt(q["prompt_text"], target_language)
+    batched = [(q, forward_by_id[str(q["question_id"])]) for q in pending if str(q["question_id"]) in forward_by_id]
+
+    to_back_translate = [(q, text) for q, text in batched if text != q["prompt_text"]]
+    back_by_id = {}
+    if to_back_translate:
+        back_by_id = _batch_translate_or_none(
+            [{"id": q["question_id"], "text": text} for q, text in to_back_translate],
+            f"You are an expert translator. Translate the following text from {target_language} accurately back into English.",
+            f"Translate the \"text\" of each item below from {target_language} accurately back into English. "
+            f"Return a JSON object {{\"items\": [{{\"id\": ..., \"text\": ...}}]}} with exactly the same ids in the same order."
+        )
+
+    for q, translated_text in batched:
+        question_id = q["question_id"]
+        if translated_text == q["prompt_text"]:
+            print(f"  {question_id}: forward translation returned the original prompt; skipping verification.")
+            results[question_id] = (translated_text, "[Back-translation skipped]", None)
+            continue
+        back_translated_text = back_by_id.get(str(question_id))
+        if back_translated_text is None:
+            print(f"  {question_id}: batch back-translation missing or mismatched; back-translating it alone.")
+            telemetry.increment("batch_translation_fallbacks")
+            try:
+                back_translated_text = back_translate(translated_text, target_language)
+            except Exception as e:
+                print(f"  Back-translation error ({target_language} -> English): {e}")
+                results[question_id] = (translated_text, "[Back-translation failed]", None)
+                continue
+        verification_score = verify_translation_meaning(q["prompt_text"], back_translated_text)
+        results[question_id] = (translated_text, back_translated_text, verification_score)
+        if memory is not None and verification_score is not None:
+            memory.put(q["prompt_text"], target_language, config.MODEL_NAME, BATCH_TRANSLATION_INSTRUCTION_VERSION,
+                       translated_text, back_translated_text, verification_score)
+    return results
+
+def translate_questions(questions, target_language):
+    """
+    Translate every question for one language, in batch mode when enabled.
+
+    Returns:
+        dict: question_id -> (translated_text, back_translated_text, verification_score)
+    """
+    if config.BATCH_TRANSLATION:
+        return translate_questionnaire(questions, target_language)
+    return {
+        q["question_id"]: translate_prompt(q["prompt_text"], target_language)
+        for q in questions
+    }
@@ -0,0 +1,58 @@
+"""Tests for the mergeable per-cell accumulators."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from survey_tools.accumulators import CellAccumulator, accumulate_csv
+
+SCALE_MINS = {"Q1": 1, "Q2": 1}
+
+
+@pytest.fixture
+def data_csv(tmp_path):
+    rng = np.random.default_rng(7)
+    rows = 600
+    df = pd.DataFrame({
+        "Language": rng.choice(["English", "French", "Chinese"], rows),
+        "Question_ID": rng.choice(["Q1", "Q2"], rows),
+        "Response": rng.integers(1, 11, rows).astype(float),
+        "LLM_Verification_Score": 5
+    })
+    path = tmp_path / "data_20250101_000000.csv"
+    df.to_csv(path, index=False)
+    return str(path), df
+
+
+def _in_memory_stds(df):
+    return df.groupby(["Language", "Question_ID"])["Response"].agg(lambda s: s.std())
+
+
+def test_single_chunk_std_matches_series_std_exactly(data_csv):
+    path, df = data_csv
+    stats = accumulate_csv(path, SCALE_MINS).cell_stats()
+    expected = _in_memory_stds(df)
+    assert stats["std"].sort_index().tolist() == expected.sort_index().tolist()
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 100])
+def test_chunked_std_matches_to_rounding(data_csv, chunk_rows):
+    path, df = data_csv
+    stats = accumulate_csv(path, SCALE_MINS, chunk_rows=chunk_rows).cell_stats().sort_index()
+    expected = _in_memory_stds(df).sort_index()
+    np.testing.assert_allclose(stats["std"], expected, rtol=1e-14, atol=0)
+    assert stats["mean"].tolist() == df.groupby(["Language", "Question_ID"])["Response"].agg(
+        lambda s: s.mean()).sort_index().tolist()
+
+
+def test_merge_keeps_cells_seen_on_one_side():
+    left, right = CellAccumulator(SCALE_MINS), CellAccumulator(SCALE_MINS)
+    left.add_chunk(pd.DataFrame({"Language": ["English"] * 3, "Question_ID": ["Q1"] * 3,
+                                 "Response": [1, 2, 4], "LLM_Verification_Score": [5, 5, 5]}))
+    right.add_chunk(pd.DataFrame({"Language": ["French"] * 2, "Question_ID": ["Q2"] * 2,
+                                  "Response": [3, 0], "LLM_Verification_Score": [4, 4]}))
+    stats = left.merge(right).cell_stats()
+    assert stats.loc[("English", "Q1"), "std"] == pd.Series([1.0, 2.0, 4.0]).std()
+    # 0 is below scale_min, so French Q2 has a single valid response
+    assert stats.loc[("French", "Q2"), "count"] == 1
+    assert np.isnan(stats.loc[("French", "Q2"), "std"])
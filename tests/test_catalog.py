@@ -0,0 +1,54 @@
+"""Tests for the survey catalog."""
+
+import json
+import os
+
+from survey_tools.catalog import build_catalog, catalog_path, update_catalog
+
+RESULTS = [{
+    "question_id": "Q1",
+    "language_stats": {"English": {"count": 10, "mean": 5.0, "std": 1.0}}
+}]
+
+
+def _write_results(data_dir, name="results_20250101_000000.json", results=RESULTS):
+    model_dir = os.path.join(data_dir, "Survey", "data_gpt-4o")
+    os.makedirs(model_dir, exist_ok=True)
+    path = os.path.join(model_dir, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+    return path
+
+
+def test_touched_files_do_not_rewrite_the_catalog(tmp_path):
+    data_dir = str(tmp_path)
+    path = _write_results(data_dir)
+    update_catalog(data_dir)
+    written = os.path.getmtime(catalog_path(data_dir))
+
+    # A fresh checkout or copy changes mtimes but not contents
+    os.utime(path, (written + 100, written + 100))
+    os.utime(catalog_path(data_dir), (written - 100, written - 100))
+    update_catalog(data_dir)
+    assert os.path.getmtime(catalog_path(data_dir)) == written - 100
+
+
+def test_changed_contents_are_re_read(tmp_path):
+    data_dir = str(tmp_path)
+    path = _write_results(data_dir)
+    update_catalog(data_dir)
+    _write_results(data_dir, results=RESULTS + [dict(RESULTS[0], question_id="Q2")])
+    update_catalog(data_dir)
+    with open(catalog_path(data_dir), encoding="utf-8") as f:
+        entry = json.load(f)["surveys"][0]["models"][0]["results"][0]
+    assert entry["questions"] == 2
+    assert entry["size"] == os.path.getsize(path)
+    assert "mtime" not in entry
+
+
+def test_unfingerprinted_catalog_skips_hashing(tmp_path):
+    data_dir = str(tmp_path)
+    _write_results(data_dir)
+    entry = build_catalog(data_dir, fingerprint=False)["surveys"][0]["models"][0]["results"][0]
+    assert entry["sha256"] is None
+    assert entry["questions"] == 1
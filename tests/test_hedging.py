@@ -0,0 +1,120 @@
+"""Tests for hedged survey requests against a stand-in server that injects latency."""
+
+import threading
+import time
+
+from survey_tools.hedging import HedgePolicy
+
+FAST = 0.01
+SLOW = 1.0
+
+
+class StandInServer:
+    """Answers each request with its call number after an injected latency."""
+
+    def __init__(self, latencies):
+        self.latencies = list(latencies)
+        self.started = []
+        self.cancelled = []
+        self._lock = threading.Lock()
+
+    def request(self, cancelled: threading.Event) -> int:
+        with self._lock:
+            call = len(self.started)
+            self.started.append(time.monotonic())
+        latency = self.latencies[call] if call < len(self.latencies) else FAST
+        if cancelled.wait(latency):
+            self.cancelled.append(call)
+        return call
+
+
+def _warm_up(policy, server, calls):
+    for _ in range(calls):
+        policy.run(server.request)
+
+
+def test_no_hedge_before_enough_samples():
+    server = StandInServer([FAST] * 5 + [0.2])
+    policy = HedgePolicy(min_samples=20)
+    try:
+        _warm_up(policy, server, 5)
+        assert policy.run(server.request) == 5
+        assert len(server.started) == 6
+    finally:
+        policy.shutdown()
+
+
+def test_slow_request_is_hedged_after_p95_and_first_reply_wins():
+    warm_up = 20
+    server = StandInServer([FAST] * warm_up + [SLOW])
+    policy = HedgePolicy(min_samples=warm_up)
+    try:
+        _warm_up(policy, server, warm_up)
+        delay = policy.hedge_delay()
+        assert delay is not None and delay < SLOW
+
+        started = time.monotonic()
+        result = policy.run(server.request)
+        elapsed = time.monotonic() - started
+
+        # The hedge (call 21) answers first; the slow primary (call 20) loses
+        assert result == warm_up + 1
+        assert elapsed < SLOW / 2
+        # The hedge was only sent once the primary outlived the p95 delay
+        primary_start, hedge_start = server.started[warm_up], server.started[warm_up + 1]
+        assert hedge_start - primary_start >= delay
+        # The losing primary is signalled to stop rather than left to finish
+        time.sleep(FAST * 5)
+        assert warm_up in server.cancelled
+    finally:
+        policy.shutdown()
+
+
+def test_fast_request_is_not_hedged():
+    warm_up = 20
+    server = StandInServer([FAST] * warm_up + [0.0])
+    policy = HedgePolicy(min_samples=warm_up)
+    try:
+        _warm_up(policy, server, warm_up)
+        assert policy.run(server.request) == warm_up
+        assert len(server.started) == warm_up + 1
+    finally:
+        policy.shutdown()
+
+
+def test_hedges_do_not_queue_behind_busy_primaries():
+    # Non-streaming requests ignore the cancel event, so every slow primary
+    # keeps its pool thread while the concurrent callers' hedges run
+    callers = 4
+    policy = HedgePolicy(min_samples=20, max_hedge_fraction=1.0, max_workers=2 * callers)
+    try:
+        _warm_up(policy, StandInServer([]), 20)
+
+        def uncancellable_request():
+            attempts = []
+
+            def request(cancelled):
+                attempts.append(None)
+                time.sleep(SLOW if len(attempts) == 1 else FAST)
+                return len(attempts)
+            return request
+
+        elapsed = [None] * callers
+        results = [None] * callers
+
+        def caller(index):
+            started = time.monotonic()
+            results[index] = policy.run(uncancellable_request())
+            elapsed[index] = time.monotonic() - started
+
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every caller is answered by its hedge, not its busy primary
+        assert results == [2] * callers
+        assert max(elapsed) < SLOW / 2
+    finally:
+        policy.shutdown()
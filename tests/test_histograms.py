@@ -0,0 +1,61 @@
+"""Tests for per-cell response histograms and the statistics taken from them."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.utils.calculations import histogram_distribution, merge_cell_stats
+from survey_tools.result_processor import histogram_lists
+
+QUESTIONS = {"Q1": {"scale_min": 1, "scale_max": 4}}
+
+
+def _value_counts(values):
+    df = pd.DataFrame({"Question_ID": "Q1", "Language": "Chinese", "Response": values})
+    return df.groupby(["Question_ID", "Language", "Response"], sort=False).size()
+
+
+def test_non_integer_responses_are_counted_as_unbinned():
+    histograms, unbinned = histogram_lists(_value_counts([1.0, 2.0, 2.0, 5.5, 2.5]), QUESTIONS)
+    assert histograms[("Q1", "Chinese")] == [1, 2, 0, 0]
+    assert unbinned[("Q1", "Chinese")] == 2
+
+
+def test_cells_without_off_scale_responses_have_no_unbinned_entry():
+    _, unbinned = histogram_lists(_value_counts([1.0, 4.0]), QUESTIONS)
+    assert unbinned == {}
+
+
+def test_distribution_reports_unbinned_responses():
+    distribution = histogram_distribution([1, 2, 0, 0], 1, unbinned=2)
+    assert distribution["count"] == 3
+    assert distribution["unbinned"] == 2
+    assert distribution["mode"] == 2
+    assert distribution["median"] == 2.0
+
+
+def test_merge_adds_unbinned_counts():
+    first = {"count": 3, "sum": 6.5, "sum_sq": 17.25, "histogram": [1, 1, 0, 0], "unbinned": 1}
+    second = {"count": 2, "sum": 7.0, "sum_sq": 25.0, "histogram": [0, 0, 1, 1], "unbinned": 0}
+    merged = merge_cell_stats([first, second])
+    assert merged["histogram"] == [1, 1, 1, 1]
+    assert merged["unbinned"] == 1
+    # Entries from results files without unbinned counts leave it unknown
+    assert merge_cell_stats([first, {k: v for k, v in second.items() if k != "unbinned"}])["unbinned"] is None
+
+
+def _stats(values):
+    values = np.asarray(values, dtype=float)
+    return {"count": len(values), "mean": values.mean(), "std": values.std(ddof=1),
+            "sum": values.sum(), "sum_sq": (values ** 2).sum()}
+
+
+def test_merge_keeps_the_std_of_tightly_clustered_cells():
+    first, second = [1e8 + 0.1, 1e8 + 0.2, 1e8 + 0.3], [1e8 + 0.2, 1e8 + 0.4]
+    merged = merge_cell_stats([_stats(first), _stats(second)])
+    assert merged["std"] == pytest.approx(np.std(first + second, ddof=1), rel=1e-6)
+
+
+def test_merged_std_is_never_negative():
+    merged = merge_cell_stats([_stats([1e8] * 3), _stats([1e8] * 2)])
+    assert merged["std"] == 0.0
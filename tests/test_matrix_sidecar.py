@@ -0,0 +1,67 @@
+"""Tests for dense matrix sidecars and the MatrixData built from them."""
+
+import json
+import os
+
+import numpy as np
+
+from api.data_processing.matrix_processor import load_and_process_file, process_result_file
+from survey_tools.matrix_sidecar import load_matrix_sidecar, sidecar_path, write_matrix_sidecar
+
+
+def _stats(mean):
+    return {"mean": mean, "std": 0.5, "count": 10}
+
+
+RESULTS = [
+    {"question_id": "Q1", "title": "First", "scale_min": 1, "scale_max": 10,
+     "language_stats": {"Swahili": _stats(4.0), "English": _stats(6.0), "Arabic": _stats(5.0)}},
+    {"question_id": "Q2", "title": "Second", "scale_min": 1, "scale_max": 4,
+     "language_stats": {"English": _stats(2.0), "Chinese": _stats(3.0)}},
+]
+
+
+def _write(path, results=RESULTS):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"results": results, "quality_metrics": {}}, f)
+    write_matrix_sidecar(path, results)
+
+
+def test_sidecar_matrix_matches_the_json_matrix(tmp_path):
+    path = str(tmp_path / "results_20250101_000000.json")
+    _write(path)
+    from_sidecar, error = load_and_process_file(path)
+    assert error is None and from_sidecar._dense is not None
+    from_json = process_result_file(RESULTS, os.path.basename(path))
+
+    assert from_sidecar.languages == from_json.languages == ["Swahili", "English", "Arabic", "Chinese"]
+    q_ids, languages, matrix = from_sidecar.get_matrix()
+    assert np.array_equal(matrix, from_json.get_matrix()[2])
+    assert from_sidecar.values == from_json.values
+    assert from_sidecar.sources == from_json.sources
+
+
+def test_selected_languages_build_only_their_values(tmp_path):
+    path = str(tmp_path / "results_20250101_000000.json")
+    _write(path)
+    matrix, _ = load_and_process_file(path)
+    selected = matrix.select_languages(["Chinese", "English"])
+    assert matrix._values is None and selected._values is None
+    assert selected.get_matrix()[1] == ["Chinese", "English"]
+    assert selected.values == {"Chinese": {"Q2": 3.0}, "English": {"Q1": 6.0, "Q2": 2.0}}
+
+
+def test_sidecar_of_other_contents_is_not_used(tmp_path):
+    path = str(tmp_path / "results_20250101_000000.json")
+    _write(path)
+    sidecar_mtime = os.path.getmtime(sidecar_path(path))
+    # A restored results file with different means but an older mtime than the sidecar
+    changed = json.loads(json.dumps(RESULTS))
+    changed[0]["language_stats"]["English"]["mean"] = 7.0
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"results": changed, "quality_metrics": {}}, f)
+    os.utime(path, (sidecar_mtime - 100, sidecar_mtime - 100))
+
+    assert load_matrix_sidecar(path) is None
+    matrix, _ = load_and_process_file(path)
+    assert matrix.values["English"]["Q1"] == 7.0
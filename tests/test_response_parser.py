@@ -0,0 +1,101 @@
+"""Tests for numeric response parsing."""
+
+import pytest
+
+from survey_tools.response_parser import parse_response, settled_answer
+
+
+def _stream(text, scale_min, scale_max):
+    """The prefix a latency-mode stream is closed at, as survey_runner._stream_answer does."""
+    for end in range(1, len(text) + 1):
+        if settled_answer(text[:end], scale_min, scale_max) is not None:
+            return text[:end]
+    return text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("7", 7.0),
+    ("On a scale of 1 to 10, I'd say 7", 7.0),
+    ("On a scale of 1-10: 8. It matters to me.", 8.0),
+    ("Respuesta: 7", 7.0),
+    ("7.5 maybe", 7.5),
+    ("1 out of 10.", 1.0),
+    ("8 out of 10", 8.0),
+    ("1", 1.0),
+])
+def test_streamed_prefix_parses_like_the_full_completion(text, expected):
+    assert parse_response(text, 1, 10) == expected
+    assert parse_response(_stream(text, 1, 10), 1, 10) == expected
+
+
+def test_stream_is_not_closed_on_a_restated_scale():
+    assert settled_answer("On a scale of 1 ", 1, 10) is None
+    assert settled_answer("On a scale of 1 to 10, ", 1, 10) is None
+    assert settled_answer("On a scale of 1 to 10, I'd say 7 ", 1, 10) == 7.0
+
+
+def test_trailing_number_is_not_settled():
+    assert settled_answer("7", 1, 10) is None
+    assert settled_answer("7.", 1, 10) is None
+    assert settled_answer("7.5", 1, 10) is None
+    assert settled_answer("7.5 ", 1, 10) == 7.5
+
+
+# Per-language corpus: (language, completion, scale_min, scale_max, expected answer)
+CORPUS = [
+    ("English", "7", 1, 10, 7.0),
+    ("English", "On a scale of 1 to 10, I'd say 7.", 1, 10, 7.0),
+    ("English", "I'd rate it 8 out of 10.", 1, 10, 8.0),
+    ("English", "1. Never justifiable... I pick 3", 1, 10, 3.0),
+    ("English", "10 = always justifiable. My answer: 6", 1, 10, 6.0),
+    ("English", "1 (never justifiable)", 1, 10, 1.0),
+    ("English", "7. It matters a great deal to me.", 1, 10, 7.0),
+    ("English", "3/4", 1, 4, 3.0),
+    ("English", "No answer.", 1, 10, None),
+    ("French", "Je choisirais 6 sur 10.", 1, 10, 6.0),
+    ("French", "Sur une échelle de 1 à 10, je dirais 4.", 1, 10, 4.0),
+    ("German", "Ich würde 5 von 10 wählen.", 1, 10, 5.0),
+    ("Spanish", "Respuesta: 7", 1, 10, 7.0),
+    ("Spanish", "Diría 9 de 10.", 1, 10, 9.0),
+    ("Spanish", "Elijo 3 desde10", 1, 10, 3.0),
+    ("Italian", "Direi 8 su 10.", 1, 10, 8.0),
+    ("Dutch", "Ik kies 6 op 10.", 1, 10, 6.0),
+    ("Russian", "Я бы поставил 7 из 10.", 1, 10, 7.0),
+    ("Indonesian", "Saya memilih 4 dari 10.", 1, 10, 4.0),
+    ("Vietnamese", "Tôi chọn 5 trên 10.", 1, 10, 5.0),
+    ("Arabic", "٧", 1, 10, 7.0),
+    ("Arabic", "٨ من ١٠", 1, 10, 8.0),
+    ("Persian", "۶", 1, 10, 6.0),
+    ("Hindi", "मेरा उत्तर ५ है", 1, 10, 5.0),
+    ("Bengali", "৩", 1, 4, 3.0),
+    ("Thai", "๗", 1, 10, 7.0),
+    ("Japanese", "７", 1, 10, 7.0),
+    ("Japanese", "七です。", 1, 10, 7.0),
+    ("Chinese", "我选择七。", 1, 10, 7.0),
+    ("Chinese", "我给十分。", 1, 10, 10.0),
+    ("Chinese", "十分同意", 1, 4, None),
+    ("Chinese", "我十分同意，选三。", 1, 4, 3.0),
+    ("Chinese", "一般来说，我选二。", 1, 4, 2.0),
+    ("Chinese", "十二", 1, 10, None),
+    ("Korean", "제 답은 6입니다.", 1, 10, 6.0),
+]
+
+
+@pytest.mark.parametrize("language, text, scale_min, scale_max, expected", CORPUS,
+                         ids=[f"{row[0]}-{i}" for i, row in enumerate(CORPUS)])
+def test_corpus(language, text, scale_min, scale_max, expected):
+    assert parse_response(text, scale_min, scale_max) == expected
+
+
+def test_out_of_range_ascii_answer_is_kept_for_result_processing():
+    assert parse_response("11", 1, 10) == 11.0
+
+
+def test_v1_is_kept_for_reparsing():
+    assert parse_response("On a scale of 1 to 10, I'd say 7", 1, 10, version=1) == 1.0
+
+
+def test_stream_waits_past_a_labelled_endpoint():
+    text = "1. Never justifiable... I pick 3"
+    assert settled_answer("1. Never justifiable", 1, 10) is None
+    assert parse_response(_stream(text, 1, 10), 1, 10) == 3.0
@@ -0,0 +1,50 @@
+"""Tests for the lexical back-translation pre-check."""
+
+from survey_tools.similarity import (
+    AUTO_PASS_SCORE, anchors_match, lexical_similarity, negations_match, precheck_score
+)
+
+HIGH, LOW = 0.9, 0.2
+
+ENTITLED = ("Please tell me whether you think the following statement is true: "
+            "people who are unemployed are not entitled to receive government benefits. "
+            "Reply with just a number.")
+JUSTIFIABLE = ("Please tell me whether you think claiming government benefits to which you "
+               "are not entitled can always be justified, never be justified, or something "
+               "in between, on a scale from 1 (never justifiable) to 10 (always justifiable). "
+               "Reply with just a number.")
+
+
+def test_identical_back_translation_passes():
+    score, similarity = precheck_score(JUSTIFIABLE, JUSTIFIABLE, HIGH, LOW)
+    assert score == AUTO_PASS_SCORE
+    assert similarity == 1.0
+
+
+def test_dropped_negation_is_not_auto_passed():
+    flipped = ENTITLED.replace("are not entitled", "are entitled")
+    assert lexical_similarity(ENTITLED, flipped) >= HIGH
+    assert not negations_match(ENTITLED, flipped)
+    score, _ = precheck_score(ENTITLED, flipped, HIGH, LOW)
+    assert score is None
+
+
+def test_contracted_negation_counts_as_negation():
+    assert negations_match("They are not entitled.", "They aren't entitled.")
+    assert not negations_match("They aren't entitled.", "They are entitled.")
+
+
+def test_reversed_scale_anchors_are_not_auto_passed():
+    reversed_scale = JUSTIFIABLE.replace(
+        "1 (never justifiable) to 10 (always justifiable)",
+        "1 (always justifiable) to 10 (never justifiable)"
+    )
+    assert lexical_similarity(JUSTIFIABLE, reversed_scale) >= HIGH
+    assert not anchors_match(JUSTIFIABLE, reversed_scale)
+    score, _ = precheck_score(JUSTIFIABLE, reversed_scale, HIGH, LOW)
+    assert score is None
+
+
+def test_anchors_match_ignores_punctuation():
+    assert anchors_match("from 1 (never) to 10 (always)", "from 1 - never - to 10: always")
+    assert not anchors_match("from 1 to 10", "from 1 to 5")
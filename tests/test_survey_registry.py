@@ -0,0 +1,25 @@
+"""Tests for questions.json validation."""
+
+import pytest
+
+from survey_tools.survey_registry import SurveyDefinitionError, validate_survey_data
+
+
+def _survey(**question):
+    q = {"question_id": "Q1", "prompt_text": "How much?", "scale_min": 1, "scale_max": 10}
+    q.update(question)
+    return {"questions": [q]}
+
+
+def test_valid_survey_passes():
+    validate_survey_data(_survey(), "questions.json")
+
+
+def test_reversed_scale_is_reported_as_such():
+    with pytest.raises(SurveyDefinitionError, match="scale_min >= scale_max"):
+        validate_survey_data(_survey(scale_min=10, scale_max=1), "questions.json")
+
+
+def test_non_numeric_scale_is_reported_as_such():
+    with pytest.raises(SurveyDefinitionError, match="non-numeric scale"):
+        validate_survey_data(_survey(scale_max="ten"), "questions.json")